@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据集格式压测：JSONL vs Parquet (zstd)
+
+用 mock 服务器的合成仓库 + README 构造数据集（记录格式同 build_repo_record），对比：
+- 文件大小
+- 只读 id / created_at（merge_created_at 的用法）和读取全部字段（分类器的用法）的耗时
+- JSONL -> Parquet -> JSONL 往返后的记录与原始记录一致
+- README 内容寻址存储（readme_store）对模板克隆 README 的去重率，以及按 readme_hash 取回的正文与原文规范化后一致
+
+用法：
+    cd 01_crawling/benchmarks
+    python bench_dataset_store.py
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from dataset_store import jsonl_to_parquet, parquet_to_jsonl, load_dataset
+from readme_store import ReadmeStore, normalize_readme
+from record_sink import RecordSink
+from repo_item import RepoItem
+from vibe_coding_crawler import build_repo_record
+from mock_github_server import generate_repos, readme_text
+
+# ========== 压测配置 ==========
+BENCH_DAYS = 20            # 合成天数
+BENCH_REPOS_PER_DAY = 500  # 每天的合成仓库数
+BENCH_REPEAT = 3           # 每项读取取最快的一次
+
+
+def build_dataset(path: str) -> int:
+    start = datetime.now().date() - timedelta(days=BENCH_DAYS)
+    count = 0
+    with RecordSink(path) as sink:
+        for i in range(BENCH_DAYS):
+            day = (start + timedelta(days=i)).strftime("%Y-%m-%d")
+            for repo in generate_repos(day, BENCH_REPOS_PER_DAY):
+                sink.write(build_repo_record(RepoItem.from_search(repo), "silent", readme_text(repo)))
+                count += 1
+    return count
+
+
+def check_readme_store(jsonl: str, path: str) -> bool:
+    """把数据集中的 README 写入 README 存储，报告去重率并检查取回的正文"""
+    records = load_dataset(jsonl, ["readme_content"])
+    store = ReadmeStore(path)
+    start = time.perf_counter()
+    digests = [store.put(r["readme_content"]) for r in records]
+    put_time = time.perf_counter() - start
+    same = all(store.get(d) == normalize_readme(r["readme_content"])
+               for d, r in zip(digests, records) if d)
+    print(f"\nREADME 存储: {store.report()} | 写入 {put_time:.2f}s")
+    store.close()
+    return same
+
+
+def best_of(fn) -> float:
+    times = []
+    for _ in range(BENCH_REPEAT):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="bench_dataset_")
+    jsonl = os.path.join(workdir, "dataset.jsonl")
+    parquet = os.path.join(workdir, "dataset.parquet")
+    roundtrip = os.path.join(workdir, "roundtrip.jsonl")
+
+    records = build_dataset(jsonl)
+    start = time.perf_counter()
+    jsonl_to_parquet(jsonl, parquet)
+    convert_time = time.perf_counter() - start
+
+    print("=" * 70)
+    print("[Benchmark] 数据集格式: JSONL vs Parquet (zstd)")
+    print("=" * 70)
+    jsonl_mb = os.path.getsize(jsonl) / 1024 / 1024
+    parquet_mb = os.path.getsize(parquet) / 1024 / 1024
+    print(f"记录: {records} | JSONL {jsonl_mb:.1f}MB | Parquet {parquet_mb:.1f}MB "
+          f"({jsonl_mb / parquet_mb:.1f}x) | 转换 {convert_time:.2f}s")
+
+    cases = [
+        ("id + created_at", ["id", "created_at"]),
+        ("全部字段", None),
+    ]
+    print(f"\n {'JSONL(s)':>8} {'Parquet(s)':>11}  加速比  读取")
+    for label, columns in cases:
+        t_jsonl = best_of(lambda: load_dataset(jsonl, columns))
+        t_parquet = best_of(lambda: load_dataset(parquet, columns))
+        print(f"{t_jsonl:9.3f} {t_parquet:11.3f} {t_jsonl / t_parquet:6.1f}x  {label}")
+
+    parquet_to_jsonl(parquet, roundtrip)
+    with open(jsonl, encoding="utf-8") as a, open(roundtrip, encoding="utf-8") as b:
+        same = [json.loads(line) for line in a] == [json.loads(line) for line in b]
+    print(f"\n往返一致: {'是' if same else '否'}")
+
+    readme_same = check_readme_store(jsonl, os.path.join(workdir, "readmes.sqlite"))
+    print(f"README 取回一致: {'是' if readme_same else '否'}")
+    print("=" * 70)
+    shutil.rmtree(workdir, ignore_errors=True)
+    if not (same and readme_same):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量刷新压测：全量爬取一遍后，mock 服务器上一部分仓库有新提交，再用增量模式刷新两轮
+
+对比全量爬取与每轮增量刷新的用时、请求数（其中 304 不计配额），并检查刷新后的数据集：
+- 有新提交的已保存仓库，stars / pushed_at / README 与服务器一致
+- 每个仓库只有一行，记录顺序与全量爬取时相同
+
+全量爬取使用 README_FETCH_MODE=rest，README 的 ETag 进入条件请求缓存。
+
+用法：
+    cd 01_crawling/benchmarks
+    python bench_delta_crawl.py
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import vibe_coding_crawler as vcc
+from dataset_store import load_dataset
+from delta_crawl import DeltaCrawler
+from readme_store import normalize_readme
+from vibe_coding_crawler import VibeCodingCrawler, iso_time
+from mock_github_server import MockGitHub, MockGitHubServer, readme_text
+
+# ========== 压测配置 ==========
+BENCH_DAYS = 10            # 爬取天数
+BENCH_REPOS_PER_DAY = 300  # 每天的合成仓库数
+BENCH_LATENCY = 0.05       # mock 服务器每个请求的延迟(秒)
+BENCH_PUSH_FRACTION = 0.1  # 每轮有新提交的仓库比例
+BENCH_ROUNDS = 2           # 增量刷新轮数
+BENCH_SEED = "bench-42"   # 抽样种子
+
+
+def run_crawler(crawler_cls, server: MockGitHubServer) -> dict:
+    before = dict(server.mock.request_counts)
+    crawler = crawler_cls("mock-token")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        crawler.run()
+    elapsed = time.perf_counter() - start
+    crawler.close()
+    counts = {k: v - before.get(k, 0) for k, v in server.mock.request_counts.items()}
+    not_modified = counts.pop("not_modified", 0)
+    return {"elapsed": elapsed, "requests": counts, "not_modified": not_modified,
+            "delta": getattr(crawler, "delta_stats", None)}
+
+
+def check_dataset(server: MockGitHubServer, order: list) -> bool:
+    """数据集与服务器一致、无重复行、顺序不变"""
+    records = load_dataset(vcc.OUTPUT_FILE, readme_store=vcc.README_STORE_FILE)
+    ids = [r["id"] for r in records]
+    ok = ids == order
+    # 合成仓库的 full_name 可能重名，按 id 对应
+    by_id = {r["id"]: r for repos in server.mock.days.values() for r in repos}
+    for record in records:
+        repo = by_id[record["id"]]
+        ok &= record["stars"] == repo["stargazers_count"]
+        ok &= record["pushed_at"] == iso_time(repo["pushed_at"])
+        # 重名时 mock 的 /repos/{full_name}/readme 只返回其中一个仓库的 README
+        if repo["has_readme"] and server.mock.by_name[repo["full_name"]] is repo:
+            ok &= record["readme_content"] == normalize_readme(readme_text(repo))
+    return ok
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="bench_delta_")
+    vcc.OUTPUT_FILE = os.path.join(workdir, "dataset.jsonl")
+    vcc.CHECKPOINT_FILE = os.path.join(workdir, "checkpoint.sqlite")
+    vcc.README_STORE_FILE = os.path.join(workdir, "readmes.sqlite")
+    vcc.HTTP_CACHE_FILE = os.path.join(workdir, "http_cache.sqlite")
+    vcc.TELEMETRY_FILE = ""
+    vcc.README_FETCH_MODE = "rest"
+    vcc.TARGET_TOTAL = 10**9
+    vcc.SAMPLE_SEED = BENCH_SEED
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    vcc.START_DATE = today - timedelta(days=BENCH_DAYS - 1)
+
+    server = MockGitHubServer(MockGitHub(BENCH_REPOS_PER_DAY, BENCH_LATENCY)).start()
+    vcc.GITHUB_API_URL = server.url
+
+    print("=" * 70)
+    print("[Benchmark] 增量刷新 vs 全量爬取 (本地 mock GitHub)")
+    print("=" * 70)
+    print(f"天数: {BENCH_DAYS} | 每天仓库: {BENCH_REPOS_PER_DAY} | 请求延迟: {BENCH_LATENCY*1000:.0f}ms | "
+          f"每轮新提交: {BENCH_PUSH_FRACTION*100:.0f}%")
+
+    full = run_crawler(VibeCodingCrawler, server)
+    order = [r["id"] for r in load_dataset(vcc.OUTPUT_FILE, ["id"])]
+    full_total = sum(full["requests"].values())
+    print(f"\n{'':8} {'用时(s)':>8} {'请求':>6} {'304':>5} {'计入配额':>8}  更新")
+    print(f"{'全量':8} {full['elapsed']:8.2f} {full_total:6} {full['not_modified']:5} "
+          f"{full_total - full['not_modified']:8}  保存 {len(order)}")
+
+    ok = True
+    for i in range(BENCH_ROUNDS):
+        time.sleep(1.1)  # pushed:> 的精度为秒，新提交要晚于上一轮的开始时间
+        server.mock.push(BENCH_PUSH_FRACTION, seed=i)
+        r = run_crawler(DeltaCrawler, server)
+        total = sum(r["requests"].values())
+        d = r["delta"]
+        print(f"{f'增量 #{i + 1}':8} {r['elapsed']:8.2f} {total:6} {r['not_modified']:5} "
+              f"{total - r['not_modified']:8}  候选 {d['candidates']} | 更新 {d['refreshed']} | "
+              f"README 变化 {d['readme_changed']} | 压缩 {d['compacted']}")
+        ok &= check_dataset(server, order)
+
+    server.stop()
+    print(f"\n刷新后与服务器一致、无重复、顺序不变: {'是' if ok else '否'}")
+    print("=" * 70)
+    shutil.rmtree(workdir, ignore_errors=True)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
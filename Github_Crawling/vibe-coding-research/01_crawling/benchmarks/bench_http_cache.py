@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+条件请求缓存压测：同一批天数爬两遍（第二遍换新的输出和断点，模拟重跑 / 补爬）
+
+两遍共用一个 HTTP 缓存文件，对比每一遍：
+- 服务器收到的请求数与其中返回 304 的次数（304 不计入 GitHub 速率限制）
+- 缓存的命中 / 未命中报告
+
+同步引擎使用 README_FETCH_MODE=rest，README 也走可缓存的 GET。
+
+用法：
+    cd 01_crawling/benchmarks
+    python bench_http_cache.py
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import vibe_coding_crawler as vcc
+from vibe_coding_crawler import VibeCodingCrawler
+from async_crawl_engine import AsyncVibeCodingCrawler
+from mock_github_server import MockGitHub, MockGitHubServer
+
+# ========== 压测配置 ==========
+BENCH_DAYS = 2             # 爬取天数
+BENCH_REPOS_PER_DAY = 200  # 每天的合成仓库数
+BENCH_LATENCY = 0.02       # mock 服务器每个请求的延迟(秒)
+BENCH_SEED = "bench-42"   # 抽样种子（按 id 哈希，各次运行选中的仓库一致）
+
+
+def crawl_once(crawler_cls, server: MockGitHubServer, cache_file: str) -> dict:
+    """全新输出和断点、共用缓存文件，爬一遍"""
+    workdir = tempfile.mkdtemp(prefix="bench_cache_")
+    vcc.OUTPUT_FILE = os.path.join(workdir, "dataset.jsonl")
+    vcc.CHECKPOINT_FILE = os.path.join(workdir, "checkpoint.sqlite")
+    vcc.README_STORE_FILE = os.path.join(workdir, "readmes.sqlite")
+    vcc.HTTP_CACHE_FILE = cache_file
+    vcc.TELEMETRY_FILE = ""
+
+    before = dict(server.mock.request_counts)
+    vcc.SAMPLE_SEED = BENCH_SEED
+    crawler = crawler_cls("mock-token")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        crawler.run()
+    elapsed = time.perf_counter() - start
+    report = crawler.http_cache.report()
+    saved = crawler.total_saved
+    crawler.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    counts = {k: v - before.get(k, 0) for k, v in server.mock.request_counts.items()}
+    not_modified = counts.pop("not_modified", 0)
+    return {"elapsed": elapsed, "saved": saved, "requests": counts,
+            "not_modified": not_modified, "report": report}
+
+
+def main():
+    print("=" * 70)
+    print("[Benchmark] 条件请求缓存：首次爬取 vs 重跑")
+    print("=" * 70)
+    print(f"天数: {BENCH_DAYS} | 每天仓库: {BENCH_REPOS_PER_DAY} | 请求延迟: {BENCH_LATENCY*1000:.0f}ms")
+
+    vcc.README_FETCH_MODE = "rest"
+    vcc.TARGET_TOTAL = 10**9
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    vcc.START_DATE = today - timedelta(days=BENCH_DAYS - 1)
+
+    failed = False
+    for label, crawler_cls in [("sync (requests)", VibeCodingCrawler),
+                               ("async (aiohttp)", AsyncVibeCodingCrawler)]:
+        server = MockGitHubServer(MockGitHub(BENCH_REPOS_PER_DAY, BENCH_LATENCY)).start()
+        vcc.GITHUB_API_URL = server.url
+        cache_dir = tempfile.mkdtemp(prefix="bench_cache_db_")
+        cache_file = os.path.join(cache_dir, "http_cache.sqlite")
+
+        print(f"\n{label}:")
+        runs = []
+        for run_label in ("首次", "重跑"):
+            r = crawl_once(crawler_cls, server, cache_file)
+            runs.append(r)
+            total = sum(r["requests"].values())
+            requests_str = ", ".join(f"{k}={v}" for k, v in sorted(r["requests"].items()))
+            print(f"  {run_label}: {r['elapsed']:6.2f}s | 保存 {r['saved']} | 请求 {total} ({requests_str}) | "
+                  f"304: {r['not_modified']} | 计入配额: {total - r['not_modified']}")
+            print(f"        缓存: {r['report']}")
+
+        server.stop()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        # 两遍保存的仓库数应一致（缓存不改变结果）
+        failed |= runs[0]["saved"] != runs[1]["saved"]
+
+    print("=" * 70)
+    if failed:
+        print("[错误] 重跑保存数量与首次不一致")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+噪音过滤微基准：逐关键词循环的原实现 vs 预编译引擎 (noise_filter.NoiseFilter)
+
+在 BENCH_RECORDS 条合成仓库记录上分别运行两种实现，对比：
+- 耗时与每秒处理条数
+- 逐条结果（是否噪音 + 原因）与 filtered_by 统计是否完全一致
+
+用法：
+    cd 01_crawling/benchmarks
+    python bench_noise_filter.py
+"""
+
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from vibe_coding_crawler import VibeCodingCrawler, NOISE_FILTERS
+
+# ========== 基准配置 ==========
+BENCH_RECORDS = 300_000   # 合成记录数
+BENCH_SEED = 42
+NOISE_RATE = 0.15         # 描述/项目名中混入噪音关键词的概率
+
+NORMAL_WORDS = [
+    "app", "tool", "web", "ai", "agent", "chat", "bot", "tracker", "planner", "budget",
+    "recipe", "fitness", "habit", "note", "music", "photo", "editor", "dashboard", "game",
+    "simple", "fast", "local", "cli", "desktop", "mobile", "assistant", "daily",
+    "built", "with", "for", "my", "the", "a", "and", "using", "react", "python", "rust",
+]
+NORMAL_TOPICS = ["ai", "llm", "productivity", "react", "python", "nextjs", "cli", "game"]
+
+
+def legacy_check_noise(stats: dict, owner: str, name: str, description, topics: list,
+                       fork: bool, size: int) -> tuple:
+    """原 VibeCodingCrawler.check_noise 的逐关键词实现（对照组）"""
+    owner = (owner or "").lower()
+    name = name.lower()
+    desc = (description or "").lower()
+    topics = [t.lower() for t in topics]
+
+    if fork:
+        stats["fork"] += 1
+        return True, "fork"
+    if size == 0:
+        stats["empty_repo"] += 1
+        return True, "empty_repo"
+    if owner in NOISE_FILTERS["owner_blacklist"]:
+        stats["owner_blacklist"] += 1
+        return True, f"owner_blacklist:{owner}"
+    for pattern in NOISE_FILTERS["name_patterns"]:
+        if re.search(pattern, name, re.IGNORECASE):
+            stats["name_pattern"] += 1
+            return True, f"name_pattern:{pattern}"
+    for stat_key, filter_key in [("education", "education_keywords"), ("algorithm", "algorithm_keywords"),
+                                 ("config", "config_keywords"), ("awesome", "awesome_keywords"),
+                                 ("tutorial", "tutorial_keywords")]:
+        for keyword in NOISE_FILTERS[filter_key]:
+            if keyword in desc or keyword in name:
+                stats[stat_key] += 1
+                return True, f"{stat_key}:{keyword}"
+    for keyword in NOISE_FILTERS["desc_keywords"]:
+        if keyword in desc:
+            stats["desc_keyword"] += 1
+            return True, f"desc:{keyword}"
+    for topic in topics:
+        if topic in NOISE_FILTERS["topic_blacklist"]:
+            stats["topic_blacklist"] += 1
+            return True, f"topic:{topic}"
+    return False, ""
+
+
+def generate_records(count: int, seed: int) -> list:
+    """生成合成仓库记录 (owner, name, description, topics, fork, size)"""
+    rng = random.Random(seed)
+    noise_words = [k for key, words in NOISE_FILTERS.items()
+                   if key.endswith("_keywords") for k in words]
+    suffixes = ["lib", "sdk", "api", "core", "plugin", "utils", "helper", "toolkit"]
+    records = []
+    for i in range(count):
+        words = rng.choices(NORMAL_WORDS, k=rng.randint(4, 16))
+        if rng.random() < NOISE_RATE:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(noise_words))
+        description = " ".join(words).capitalize() if rng.random() > 0.1 else None
+
+        name = "-".join(rng.choices(NORMAL_WORDS, k=rng.randint(1, 3)))
+        r = rng.random()
+        if r < 0.03:
+            name = f"{name}-{rng.choice(suffixes)}"
+        elif r < 0.05:
+            name = f"{rng.choice(noise_words).replace(' ', '-')}-{name}"
+
+        owner = rng.choice(NOISE_FILTERS["owner_blacklist"]) if rng.random() < 0.01 else f"user{i % 5000}"
+        topics = rng.sample(NORMAL_TOPICS, k=rng.randint(0, 3))
+        if rng.random() < 0.03:
+            topics.append(rng.choice(NOISE_FILTERS["topic_blacklist"]).upper())
+        records.append((owner, name.title(), description, topics,
+                        rng.random() < 0.05, 0 if rng.random() < 0.02 else rng.randint(50, 80000)))
+    return records
+
+
+def run(label: str, check, records: list) -> tuple:
+    start = time.perf_counter()
+    results = [check(*r) for r in records]
+    elapsed = time.perf_counter() - start
+    print(f"{label:22} {elapsed:8.2f}s {len(records) / elapsed:12,.0f} 条/s")
+    return results, elapsed
+
+
+def main():
+    print("=" * 70)
+    print("[Benchmark] 噪音过滤：逐关键词循环 vs 预编译引擎")
+    print("=" * 70)
+    records = generate_records(BENCH_RECORDS, BENCH_SEED)
+    print(f"合成记录: {len(records):,}\n")
+
+    legacy_stats = Counter()
+    legacy_results, legacy_time = run("原实现 (逐关键词)", lambda *r: legacy_check_noise(legacy_stats, *r), records)
+
+    # 直接调用 VibeCodingCrawler.check_noise，只替换 self.stats，避免初始化客户端和断点文件
+    holder = SimpleNamespace(stats={"filtered_by": Counter()})
+    engine_results, engine_time = run("预编译引擎", lambda *r: VibeCodingCrawler.check_noise(holder, *r), records)
+    engine_stats = holder.stats["filtered_by"]
+
+    mismatches = sum(1 for a, b in zip(legacy_results, engine_results) if a != b)
+    print(f"\n加速比: {legacy_time / engine_time:.1f}x")
+    print(f"逐条结果不一致: {mismatches}")
+    print(f"filtered_by 一致: {legacy_stats == engine_stats}")
+    print("\nfiltered_by:")
+    for key, count in sorted(engine_stats.items(), key=lambda x: -x[1]):
+        print(f"  - {key}: {count}")
+    print("=" * 70)
+    if mismatches or legacy_stats != engine_stats:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
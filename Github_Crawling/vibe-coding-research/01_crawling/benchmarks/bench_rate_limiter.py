@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+限速压测：mock 服务器按 token 模拟主速率限制（短窗口配额）与次级速率限制（每秒请求上限）
+
+两个场景（只有配额 / 配额 + 次级限流），同步流水线引擎与异步引擎各跑两种发送方式：
+- 突发：PACE_THRESHOLD=0、SPACING_START=0，余量用完才等待重置，次级限流后不调整发送间隔
+- 限速：默认配置，余量不足时把剩余配额均匀分布到重置前的窗口，次级限流后按 AIMD 调整该 token 的发送间隔
+
+统计用时、服务器返回的 403（主 / 次级限流）、推迟发送与整池等待次数，并检查两种方式保存的仓库一致。
+README 使用 README_FETCH_MODE=rest，每个仓库一次 core 请求。
+
+用法：
+    cd 01_crawling/benchmarks
+    python bench_rate_limiter.py
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import github_client
+import vibe_coding_crawler as vcc
+from vibe_coding_crawler import VibeCodingCrawler
+from async_crawl_engine import AsyncVibeCodingCrawler
+from mock_github_server import MockGitHub, MockGitHubServer
+
+# ========== 压测配置 ==========
+BENCH_DAYS = 8             # 爬取天数
+BENCH_REPOS_PER_DAY = 300  # 每天的合成仓库数
+BENCH_LATENCY = 0.02       # mock 服务器每个请求的延迟(秒)
+BENCH_QUOTAS = {"search": 10, "core": 30}  # 每个 token 每个窗口的请求数
+BENCH_WINDOW = 3.0         # 配额窗口(秒)，按比例缩短 GitHub 的 1 分钟 / 1 小时
+BENCH_SCENARIOS = {"配额": 0, "配额+次级限流": 8}  # 每个 token 每秒的请求上限（0 = 不模拟次级限流）
+BENCH_TOKENS = 2
+# 两种发送方式对 github_client 配置的覆盖
+BENCH_MODES = {"突发": {"PACE_THRESHOLD": 0.0, "SPACING_START": 0.0}, "限速": {}}
+BENCH_SEED = "bench-42"   # 抽样种子
+
+
+def run_once(crawler_cls, burst_limit: int) -> dict:
+    mock = MockGitHub(BENCH_REPOS_PER_DAY, BENCH_LATENCY, quotas=BENCH_QUOTAS,
+                      quota_window=BENCH_WINDOW, burst_limit=burst_limit)
+    server = MockGitHubServer(mock).start()
+    workdir = tempfile.mkdtemp(prefix="bench_limiter_")
+    vcc.GITHUB_API_URL = server.url
+    vcc.OUTPUT_FILE = os.path.join(workdir, "dataset.jsonl")
+    vcc.CHECKPOINT_FILE = os.path.join(workdir, "checkpoint.sqlite")
+    vcc.README_STORE_FILE = os.path.join(workdir, "readmes.sqlite")
+    vcc.HTTP_CACHE_FILE = ""
+    vcc.TELEMETRY_FILE = ""
+
+    crawler = crawler_cls([f"mock-token-{i}" for i in range(BENCH_TOKENS)])
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        crawler.run()
+    elapsed = time.perf_counter() - start
+    crawler.close()
+    with open(vcc.OUTPUT_FILE, "rb") as f:
+        saved = sum(1 for _ in f)
+    server.stop()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    counts = mock.request_counts
+    return {
+        "elapsed": elapsed,
+        "saved": saved,
+        "requests": sum(v for k, v in counts.items() if k not in ("rate_limited", "secondary_limited")),
+        "rate_limited": counts.get("rate_limited", 0),
+        "secondary_limited": counts.get("secondary_limited", 0),
+        "pool": dict(crawler.client.pool.stats),
+    }
+
+
+def main():
+    print("=" * 70)
+    print("[Benchmark] 配额池限速：突发 vs 限速 (本地 mock GitHub，模拟限流)")
+    print("=" * 70)
+    print(f"天数: {BENCH_DAYS} | 每天仓库: {BENCH_REPOS_PER_DAY} | token: {BENCH_TOKENS} | "
+          f"每 {BENCH_WINDOW:.0f}s 配额: {BENCH_QUOTAS}")
+
+    vcc.README_FETCH_MODE = "rest"
+    vcc.TARGET_TOTAL = 10**9
+    vcc.SAMPLE_SEED = BENCH_SEED
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    vcc.START_DATE = today - timedelta(days=BENCH_DAYS - 1)
+    defaults = {name: getattr(github_client, name) for mode in BENCH_MODES.values() for name in mode}
+
+    ok = True
+    for scenario, burst_limit in BENCH_SCENARIOS.items():
+        print(f"\n场景: {scenario}" + (f"（每个 token 每秒至多 {burst_limit} 个请求）" if burst_limit else ""))
+        print(f"{'引擎':16} {'方式':6} {'用时(s)':>8} {'保存':>5} {'请求':>5} {'403主':>6} {'403次级':>7} "
+              f"{'推迟发送':>8} {'整池等待':>8}")
+        for label, crawler_cls in [("sync (requests)", VibeCodingCrawler),
+                                   ("async (aiohttp)", AsyncVibeCodingCrawler)]:
+            saved = []
+            for mode, overrides in BENCH_MODES.items():
+                for name, value in {**defaults, **overrides}.items():
+                    setattr(github_client, name, value)
+                r = run_once(crawler_cls, burst_limit)
+                saved.append(r["saved"])
+                pool = r["pool"]
+                print(f"{label:16} {mode:6} {r['elapsed']:8.2f} {r['saved']:5} {r['requests']:5} "
+                      f"{r['rate_limited']:6} {r['secondary_limited']:7} "
+                      f"{pool['paced']:8} {pool['pool_waits']:8}")
+            ok &= len(set(saved)) == 1
+    for name, value in defaults.items():
+        setattr(github_client, name, value)
+
+    print(f"\n两种方式保存数量一致: {'是' if ok else '否'}")
+    print("=" * 70)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
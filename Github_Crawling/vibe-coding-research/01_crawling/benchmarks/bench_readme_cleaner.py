@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+README 清理基准：原来的逐轮 re.sub vs 共用清理器 (readme_cleaner.ReadmeCleaner)
+
+1. 一致性：语料中每篇 README 在三套规则（crawler_vibe_coders / 配置文件筛选 ModeB / quick_modeB）下
+   两种实现的输出逐字相同；另外用 BENCH_FUZZ 条随机标记字符串覆盖未闭合、嵌套等边界情况
+2. 吞吐：crawler_vibe_coders 规则下清理整个语料的用时（交替测 BENCH_ROUNDS 轮取最小值）
+3. 大 README：正常 markdown、未闭合的 `<`、未闭合的 `[` 三种文本随长度增长的用时（原实现后两种为平方时间）
+
+语料：命令行给出的 crawler_vibe_coders 输出 CSV（readme_raw 列）或 README 存储（.sqlite，见 readme_store）；
+不给时用 BENCH_DOCS 篇合成 README（其中一部分在随机位置截断，模拟 readme_raw 的截断）。
+
+用法：
+    cd 01_crawling/benchmarks
+    python bench_readme_cleaner.py [vibe_coders_all_*.csv | vibe_coding_readmes.sqlite ...]
+"""
+
+import csv
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from readme_cleaner import ReadmeCleaner
+
+# ========== 基准配置 ==========
+BENCH_DOCS = 3000          # 合成 README 篇数（没有给出语料文件时）
+BENCH_FUZZ = 50_000        # 随机标记字符串条数
+BENCH_SEED = 42
+BENCH_SIZES = [10_000, 20_000, 40_000]  # 大 README 的字符数
+BENCH_ROUNDS = 5           # 语料吞吐交替测量的轮数（取最小值）
+
+csv.field_size_limit(sys.maxsize)
+
+
+def legacy_vibe(cleaned: str) -> str:
+    """原 VibeCodersCrawler.build_readme 的清理（对照组）"""
+    cleaned = re.sub(r'```[\s\S]*?```', '\n[CODE_BLOCK]\n', cleaned)
+    cleaned = re.sub(r'`[^`]+`', '[code]', cleaned)
+    cleaned = re.sub(r'!\[([^\]]*)\]\([^)]+\)', '', cleaned)
+    cleaned = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', cleaned)
+    cleaned = re.sub(r'<[^>]+>', '', cleaned)
+    cleaned = re.sub(r'\*\*([^*]+)\*\*', r'\1', cleaned)
+    cleaned = re.sub(r'\*([^*]+)\*', r'\1', cleaned)
+    cleaned = re.sub(r'\s+', ' ', cleaned)
+    return cleaned.strip()
+
+
+def legacy_mode_b(content: str, italic: bool = True) -> str:
+    """原 ModeBCrawler.get_readme（italic=False 为 quick_modeB）的清理（对照组）"""
+    content = re.sub(r'```[\s\S]*?```', ' [code] ', content)
+    content = re.sub(r'`[^`]+`', ' [code] ', content)
+    content = re.sub(r'!\[([^\]]*)\]\([^)]+\)', '', content)
+    content = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', content)
+    content = re.sub(r'<[^>]+>', '', content)
+    content = re.sub(r'^#+\s*', '', content, flags=re.MULTILINE)
+    content = re.sub(r'\*\*([^*]+)\*\*', r'\1', content)
+    if italic:
+        content = re.sub(r'\*([^*]+)\*', r'\1', content)
+    content = re.sub(r'\s+', ' ', content)
+    return content.strip()
+
+
+# (名称, 原实现, 共用清理器)
+RULES = [
+    ("crawler_vibe_coders", legacy_vibe, ReadmeCleaner()),
+    ("ModeB", legacy_mode_b, ReadmeCleaner(" [code] ", " [code] ", strip_headings=True)),
+    ("quick_modeB", lambda t: legacy_mode_b(t, italic=False),
+     ReadmeCleaner(" [code] ", " [code] ", strip_headings=True, strip_italic=False)),
+]
+
+WORDS = ["app", "simple", "tracker", "budget", "local", "daily", "built", "with", "for", "my", "the",
+         "a", "and", "using", "react", "python", "you", "can", "run", "this", "to", "your", "data"]
+
+
+def synthetic_readme(rng: random.Random) -> str:
+    """按常见 README 结构拼一篇 markdown：标题、徽章、链接、代码、HTML、粗斜体、列表、表格"""
+
+    def sentence() -> str:
+        words = rng.choices(WORDS, k=rng.randint(5, 18))
+        for _ in range(rng.randint(0, 3)):
+            i = rng.randrange(len(words))
+            words[i] = rng.choice([
+                f"**{words[i]}**", f"*{words[i]}*", f"`{words[i]}()`", f"[{words[i]}](https://x.dev/{i})",
+                f"<kbd>{words[i]}</kbd>", f"{words[i]} (see docs)", f"{words[i]} < 10", "->",
+            ])
+        return " ".join(words).capitalize() + rng.choice([".", "!", ":", ""])
+
+    parts = [f"# {sentence()}\n"]
+    if rng.random() < 0.6:
+        parts.append(" ".join(f"[![{w}](https://img.shields.io/{w}.svg)](https://x.dev/{w})"
+                              for w in rng.sample(WORDS, rng.randint(1, 4))) + "\n")
+    if rng.random() < 0.3:
+        parts.append('<p align="center"><img src="logo.png" width="200"></p>\n')
+    for _ in range(rng.randint(2, 8)):
+        parts.append(f"\n{'#' * rng.randint(2, 3)} {rng.choice(['✨ Features', 'Installation', 'Usage', 'Tech Stack'])}\n")
+        kind = rng.random()
+        if kind < 0.3:
+            parts.append("\n".join(f"{rng.choice('-*')} {sentence()}" for _ in range(rng.randint(2, 6))))
+        elif kind < 0.55:
+            parts.append(f"```{rng.choice(['bash', 'python', ''])}\n" +
+                         "\n".join(f"run --{w} <file> [*]" for w in rng.sample(WORDS, 3)) + "\n```")
+        elif kind < 0.65:
+            parts.append("| Name | Value |\n|---|---|\n" +
+                         "\n".join(f"| `{w}` | **{rng.randint(1, 99)}** |" for w in rng.sample(WORDS, 3)))
+        else:
+            parts.append(" ".join(sentence() for _ in range(rng.randint(2, 6))))
+        parts.append("\n")
+    text = "\n".join(parts)
+    if rng.random() < 0.3:
+        # readme_raw 按长度截断，可能留下未闭合的代码块 / 链接 / 标签
+        text = text[:rng.randint(1, len(text))]
+    return text
+
+
+def load_corpus(paths: list) -> list:
+    """从 CSV（readme_raw 列）或 README 存储（.sqlite）读取 README 原文"""
+    docs = []
+    for path in paths:
+        if path.endswith(".sqlite"):
+            conn = sqlite3.connect(path)
+            docs += [zlib.decompress(body).decode("utf-8") for (body,) in conn.execute("SELECT body FROM readmes")]
+            conn.close()
+        else:
+            with open(path, encoding="utf-8") as f:
+                docs += [row["readme_raw"] for row in csv.DictReader(f) if row.get("readme_raw")]
+    return docs
+
+
+def fuzz_strings(count: int, rng: random.Random) -> list:
+    alphabet = "![]()<>#*` \n\nab"
+    return ["".join(rng.choices(alphabet, k=rng.randint(0, 40))) for _ in range(count)]
+
+
+def timed(fn, docs: list) -> float:
+    start = time.perf_counter()
+    for doc in docs:
+        fn(doc)
+    return time.perf_counter() - start
+
+
+def best_of(fns: list, docs: list, rounds: int) -> list:
+    """各实现交替运行 rounds 轮，取每个实现的最短用时（减少机器负载波动的影响）"""
+    best = [float("inf")] * len(fns)
+    for _ in range(rounds):
+        for k, fn in enumerate(fns):
+            best[k] = min(best[k], timed(fn, docs))
+    return best
+
+
+def main():
+    print("=" * 70)
+    print("[Benchmark] README 清理：逐轮 re.sub vs 共用清理器")
+    print("=" * 70)
+    rng = random.Random(BENCH_SEED)
+    if len(sys.argv) > 1:
+        docs = load_corpus(sys.argv[1:])
+        source = ", ".join(os.path.basename(p) for p in sys.argv[1:])
+    else:
+        docs = [synthetic_readme(rng) for _ in range(BENCH_DOCS)]
+        source = "合成"
+    size = sum(len(d) for d in docs)
+    print(f"语料: {len(docs)} 篇 ({source}), {size / 1e6:.1f}M 字符 | 随机标记串: {BENCH_FUZZ:,}")
+
+    # 1. 一致性
+    fuzz = fuzz_strings(BENCH_FUZZ, rng)
+    print(f"\n{'规则':22} {'语料不一致':>10} {'随机串不一致':>12}")
+    mismatches = 0
+    for name, legacy, cleaner in RULES:
+        bad_docs = sum(1 for d in docs if legacy(d) != cleaner.clean(d))
+        bad_fuzz = sum(1 for d in fuzz if legacy(d) != cleaner.clean(d))
+        mismatches += bad_docs + bad_fuzz
+        print(f"{name:22} {bad_docs:10} {bad_fuzz:12}")
+
+    # 2. 语料吞吐
+    cleaner = RULES[0][2]
+    legacy_time, cleaner_time = best_of([legacy_vibe, cleaner.clean], docs, BENCH_ROUNDS)
+    print(f"\n{'实现':22} {'用时(s)':>8} {'篇/s':>10} {'MB/s':>8}")
+    for label, elapsed in (("原实现 (逐轮 re.sub)", legacy_time), ("共用清理器", cleaner_time)):
+        print(f"{label:22} {elapsed:8.3f} {len(docs) / elapsed:10,.0f} {size / 1e6 / elapsed:8.1f}")
+    print(f"加速比: {legacy_time / cleaner_time:.2f}x")
+
+    # 3. 大 README
+    print(f"\n{'大 README':18} {'字符数':>8} {'原实现(s)':>10} {'清理器(s)':>10} {'加速比':>8}")
+    normal = "\n".join(synthetic_readme(random.Random(i)) for i in range(200))
+    kinds = [("正常 markdown", normal), ("未闭合的 <", "if a < b then\n"), ("未闭合的 [", "[x ")]
+    for label, unit in kinds:
+        for n in BENCH_SIZES:
+            text = (unit * (n // len(unit) + 1))[:n]
+            legacy_t, cleaner_t = timed(legacy_vibe, [text]), timed(cleaner.clean, [text])
+            mismatches += legacy_vibe(text) != cleaner.clean(text)
+            print(f"{label:18} {n:8} {legacy_t:10.4f} {cleaner_t:10.4f} {legacy_t / cleaner_t:7.1f}x")
+
+    print(f"\n输出与原实现完全一致: {'是' if not mismatches else f'否（{mismatches} 处不一致）'}")
+    print("=" * 70)
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
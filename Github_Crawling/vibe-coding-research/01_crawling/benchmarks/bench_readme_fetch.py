@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+crawler_vibe_coders README 下载压测：逐个新建连接 vs keep-alive 连接池 + 多线程
+
+对 BENCH_REPOS 个仓库只运行 README 阶段（不搜索），对比：
+- 无连接复用、1 线程（每个请求 Connection: close，相当于每次调用 requests.get）
+- 连接池、1 / 8 / 32 线程（README_WORKERS）
+rest 模式每个仓库一次请求；graphql 模式按批。检查各方式取到的 README 完全一致。
+本地 mock 走明文 HTTP，没有 TLS 握手，真实 GitHub 上连接复用省下的时间更多。
+
+用法：
+    cd 01_crawling/benchmarks
+    python bench_readme_fetch.py
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import crawler_vibe_coders as cvc
+from crawler_vibe_coders import VibeCodersCrawler
+from mock_github_server import MockGitHub, MockGitHubServer, _public
+
+# ========== 压测配置 ==========
+BENCH_REPOS = 1000         # 下载 README 的仓库数
+BENCH_LATENCY = 0.05       # 每个请求的延迟(秒)
+# (README 方式, 标签, 线程数, 连接复用)
+BENCH_RUNS = [
+    ("rest", "无连接复用, 1 线程", 1, False),
+    ("rest", "连接池, 1 线程", 1, True),
+    ("rest", "连接池, 8 线程", 8, True),
+    ("rest", "连接池, 32 线程", 32, True),
+    ("graphql", "连接池, 1 线程", 1, True),
+    ("graphql", "连接池, 8 线程", 8, True),
+]
+
+
+def run_once(mock: MockGitHub, repos: list, mode: str, workers: int, keep_alive: bool) -> dict:
+    cvc.README_FETCH_MODE = mode
+    cvc.README_WORKERS = workers
+    crawler = VibeCodersCrawler("mock-token")
+    if not keep_alive:
+        crawler.client.session.headers["Connection"] = "close"
+    records = [crawler.make_record(_public(repo), "bench") for repo in repos]
+    crawler.seen = dict.fromkeys(r["repo_id"] for r in records)
+    before = sum(mock.request_counts.values())
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        crawler.pipeline.run(records)
+    elapsed = time.perf_counter() - start
+    crawler.close()
+    return {
+        "elapsed": elapsed,
+        "requests": sum(mock.request_counts.values()) - before,
+        "readmes": [(r["repo_id"], r["readme_raw"]) for r in records],
+    }
+
+
+def main():
+    print("=" * 70)
+    print("[Benchmark] README 下载：逐个新建连接 vs 连接池 + 多线程 (本地 mock GitHub)")
+    print("=" * 70)
+    cvc.HTTP_CACHE_FILE = ""
+    mock = MockGitHub(BENCH_REPOS // 4, BENCH_LATENCY)
+    server = MockGitHubServer(mock).start()
+    cvc.GITHUB_API_URL = server.url
+    today = datetime.now().date()
+    repos = [r for i in range(4) for r in mock.repos_for_day((today - timedelta(days=i)).strftime("%Y-%m-%d"))]
+    print(f"仓库: {len(repos)} | 延迟 {BENCH_LATENCY * 1000:.0f}ms")
+
+    print(f"\n{'方式':8} {'连接 / 线程':20} {'用时(s)':>8} {'请求':>5} {'仓库/s':>8} {'加速比':>6}")
+    baseline, ok = {}, True
+    for mode, label, workers, keep_alive in BENCH_RUNS:
+        r = run_once(mock, repos, mode, workers, keep_alive)
+        base = baseline.setdefault(mode, r)
+        ok &= r["readmes"] == base["readmes"]
+        print(f"{mode:8} {label:20} {r['elapsed']:8.2f} {r['requests']:5} {len(repos) / r['elapsed']:8.1f} "
+              f"{base['elapsed'] / r['elapsed']:5.1f}x")
+    server.stop()
+
+    print(f"\n各方式 README 一致: {'是' if ok else '否'}")
+    print("=" * 70)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
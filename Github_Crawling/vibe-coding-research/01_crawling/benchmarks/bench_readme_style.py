@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+README 风格打分基准：原 detect_readme_style vs readme_style（预编译正则 + 精简关键词组）
+
+1. 一致性：每篇 README 的 is_ai_like / confidence / signals / word_count 与原实现完全相同，
+   score_readmes 的每一行与逐篇结果相同；另外用 BENCH_FUZZ 条随机短文本覆盖标题、列表、换行、
+   Unicode 空白和 emoji 的边界情况
+2. 吞吐：原实现逐篇循环、detect_readme_style 逐篇循环、score_readmes 整理成 DataFrame 的用时
+   （交替测 BENCH_ROUNDS 轮取最小值）
+
+语料：命令行给出的 crawler_vibe_coders 输出 CSV（readme_raw 列）或 README 存储（.sqlite，见 readme_store）；
+不给时用 BENCH_DOCS 篇合成 README。
+
+用法：
+    cd 01_crawling/benchmarks
+    python bench_readme_style.py [vibe_coders_all_*.csv | vibe_coding_readmes.sqlite ...]
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from bench_readme_cleaner import load_corpus, synthetic_readme
+from readme_style import SIGNAL_WEIGHTS, detect_readme_style, score_readmes
+
+# ========== 基准配置 ==========
+BENCH_DOCS = 20_000        # 合成 README 篇数（没有给出语料文件时）
+BENCH_FUZZ = 50_000        # 随机短文本条数
+BENCH_SEED = 42
+BENCH_ROUNDS = 3           # 交替测量的轮数（取最小值）
+
+
+def legacy_detect(readme: str) -> dict:
+    """原 VibeCodersCrawler.detect_readme_style（对照组）"""
+    if not readme or len(readme) < 50:
+        return {"is_ai_like": False, "confidence": 0}
+
+    text_lower = readme.lower()
+    signals = []
+    score = 0
+    if re.search(r'##\s+(features|installation|getting started|tech stack)', text_lower):
+        signals.append("structured")
+        score += 15
+    ai_words = ["leverage", "seamlessly", "robust", "empower", "utilize"]
+    if any(w in text_lower for w in ai_words):
+        signals.append("ai_words")
+        score += 10
+    if re.search(r'^##?\s+[\U0001F300-\U0001F9FF]', readme, re.MULTILINE):
+        signals.append("emoji_headers")
+        score += 10
+    if re.search(r'##\s+\w+\s*\n+(?:-\s+.+\n+){3,}', readme):
+        signals.append("perfect_list")
+        score += 10
+    if "shields.io" in readme or ("![" in readme and "github.com" in readme):
+        signals.append("badges")
+        score += 8
+    ai_tools = ["cursor", "claude", "copilot", "gpt", "chatgpt", "ai generated", "cursorrules"]
+    if any(t in text_lower for t in ai_tools):
+        signals.append("mentions_ai")
+        score += 30
+    word_count = len(readme.split())
+    if 150 < word_count < 1000:
+        score += 10
+    is_ai_like = score >= 35
+    confidence = min(score / 60, 1.0)
+    return {
+        "is_ai_like": is_ai_like,
+        "confidence": round(confidence, 2),
+        "signals": signals,
+        "word_count": word_count
+    }
+
+
+PHRASES = ["Leverage", "seamlessly", "ROBUST", "built with Cursor", "ChatGPT", "Claude", "AI generated",
+           "https://img.shields.io/badge/x", "![demo](https://github.com/a/b.png)", "İstanbul", "ΣΑΣ"]
+
+
+def ai_style_readme(rng: random.Random) -> str:
+    """合成 README 中混入 AI 风格的标题、列表、emoji 和措辞"""
+    text = synthetic_readme(rng)
+    extra = []
+    if rng.random() < 0.4:
+        extra.append(f"\n## {rng.choice(['🚀', '✨', '📦'])} {rng.choice(['Features', 'Getting Started'])}\n")
+    if rng.random() < 0.4:
+        extra.append("## Features\n\n" + "".join(f"- {rng.choice(PHRASES)} item {i}\n" for i in range(rng.randint(2, 5))))
+    if rng.random() < 0.5:
+        extra.append(" ".join(rng.sample(PHRASES, rng.randint(1, 3))))
+    return text + "\n".join(extra) * rng.randint(1, 3)
+
+
+def fuzz_strings(count: int, rng: random.Random) -> list:
+    """短文本：多数不足 50 字符，标题 / 列表 / 换行 / Unicode 空白 / emoji 随机组合"""
+    tokens = ["#", "## ", "- ", "\n", "\n\n", " ", "　", "\xa0", "\x1c", "🚀", "✨", "gpt", "Robust",
+              "shields.io", "![", "github.com", "features", "İ", "a", "word "]
+    return ["".join(rng.choices(tokens, k=rng.randint(0, 60))) for _ in range(count)]
+
+
+def frame_matches(frame, styles: list) -> int:
+    """score_readmes 的行与逐篇结果不一致的篇数"""
+    bad = 0
+    for row, style in zip(frame.itertuples(index=False), styles):
+        signals = [name for name in SIGNAL_WEIGHTS if getattr(row, name)]
+        bad += (row.is_ai_like != style["is_ai_like"] or row.confidence != style["confidence"]
+                or signals != style.get("signals", []) or row.word_count != style.get("word_count", 0))
+    return bad
+
+
+def best_of(fns: list, docs: list, rounds: int) -> list:
+    """各实现交替运行 rounds 轮，取每个实现的最短用时"""
+    best = [float("inf")] * len(fns)
+    for _ in range(rounds):
+        for k, fn in enumerate(fns):
+            start = time.perf_counter()
+            fn(docs)
+            best[k] = min(best[k], time.perf_counter() - start)
+    return best
+
+
+def main():
+    print("=" * 70)
+    print("[Benchmark] README 风格打分：原实现 vs readme_style")
+    print("=" * 70)
+    rng = random.Random(BENCH_SEED)
+    if len(sys.argv) > 1:
+        docs = load_corpus(sys.argv[1:])
+        source = ", ".join(os.path.basename(p) for p in sys.argv[1:])
+    else:
+        docs = [ai_style_readme(rng) for _ in range(BENCH_DOCS)]
+        source = "合成"
+    size = sum(len(d) for d in docs)
+    print(f"语料: {len(docs)} 篇 ({source}), {size / 1e6:.1f}M 字符 | 随机短文本: {BENCH_FUZZ:,}")
+
+    # 1. 一致性
+    fuzz = fuzz_strings(BENCH_FUZZ, rng)
+    mismatches = 0
+    print(f"\n{'数据':12} {'篇数':>8} {'逐篇不一致':>10} {'DataFrame 不一致':>16}")
+    for label, texts in (("语料", docs), ("随机短文本", fuzz)):
+        styles = [detect_readme_style(t) for t in texts]
+        bad = sum(a != b for a, b in zip(map(legacy_detect, texts), styles))
+        bad_frame = frame_matches(score_readmes(texts), styles)
+        mismatches += bad + bad_frame
+        print(f"{label:12} {len(texts):8} {bad:10} {bad_frame:16}")
+
+    # 2. 吞吐
+    runs = [
+        ("原实现 (逐篇)", lambda d: [legacy_detect(r) for r in d]),
+        ("detect_readme_style", lambda d: [detect_readme_style(r) for r in d]),
+        ("score_readmes", score_readmes),
+    ]
+    times = best_of([fn for _, fn in runs], docs, BENCH_ROUNDS)
+    print(f"\n{'实现':22} {'用时(s)':>8} {'篇/s':>10} {'MB/s':>8} {'加速比':>7}")
+    for (label, _), elapsed in zip(runs, times):
+        print(f"{label:22} {elapsed:8.3f} {len(docs) / elapsed:10,.0f} {size / 1e6 / elapsed:8.1f} "
+              f"{times[0] / elapsed:6.2f}x")
+
+    frame = score_readmes(docs)
+    print(f"\nAI 风格: {int(frame['is_ai_like'].sum())} / {len(frame)} 篇 | "
+          + " ".join(f"{name}={int(frame[name].sum())}" for name in frame.columns[:7]))
+    print(f"\n结果与原实现完全一致: {'是' if not mismatches else f'否（{mismatches} 篇不一致）'}")
+    print("=" * 70)
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
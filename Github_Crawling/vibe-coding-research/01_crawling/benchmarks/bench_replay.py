@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+录制 / 回放压测：离线回归测试爬虫引擎的吞吐与重试 / 限流处理
+
+1. 录制：同步与异步引擎依次经录制代理爬取 mock GitHub（代表真实 API），录到同一盘磁带
+   （两个引擎获取 README 的接口不同：GraphQL 批量 / REST），两次的落盘记录作为基准，须一致
+2. 回放：在磁带上按几种故障注入场景（无故障 / 5xx / 主+次级限流 403）分别运行同步与异步引擎，
+   统计用时、注入的故障数、客户端重试 / 放弃次数与磁带未命中数，并检查落盘记录与录制时完全一致
+
+用法：
+    cd 01_crawling/benchmarks
+    python bench_replay.py
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import vibe_coding_crawler as vcc
+from vibe_coding_crawler import VibeCodingCrawler
+from async_crawl_engine import AsyncVibeCodingCrawler
+from mock_github_server import Faults, MockGitHub, MockGitHubServer
+from github_replay import Recorder, RecordingProxyHandler, ReplayGitHub, ReplayHandler
+
+# ========== 压测配置 ==========
+BENCH_DAYS = 5             # 爬取天数
+BENCH_REPOS_PER_DAY = 200  # 每天的合成仓库数
+BENCH_LATENCY = 0.03       # 录制上游与回放服务器每个请求的延迟(秒)
+BENCH_TOKENS = 2
+BENCH_SEED = "bench-42"   # 抽样种子
+ENGINES = [("sync (requests)", VibeCodingCrawler), ("async (aiohttp)", AsyncVibeCodingCrawler)]
+# 回放场景：Faults 参数（概率）
+BENCH_SCENARIOS = {
+    "无故障": {},
+    "5xx 3%": {"server_error": 0.03},
+    "403 主3%+次级3%": {"rate_limit": 0.03, "secondary_limit": 0.03},
+}
+
+
+def run_crawler(crawler_cls, api_url: str, workdir: str) -> dict:
+    """在 api_url 上运行一次爬虫，返回用时、落盘记录与客户端统计"""
+    vcc.GITHUB_API_URL = api_url
+    vcc.OUTPUT_FILE = os.path.join(workdir, "dataset.jsonl")
+    vcc.CHECKPOINT_FILE = os.path.join(workdir, "checkpoint.sqlite")
+    vcc.README_STORE_FILE = os.path.join(workdir, "readmes.sqlite")
+    vcc.HTTP_CACHE_FILE = ""
+    vcc.TELEMETRY_FILE = ""
+    crawler = crawler_cls([f"mock-token-{i}" for i in range(BENCH_TOKENS)])
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        crawler.run()
+    elapsed = time.perf_counter() - start
+    crawler.close()
+    with open(vcc.OUTPUT_FILE, encoding="utf-8") as f:
+        records = sorted(f)
+    endpoints = crawler.telemetry.snapshot()["endpoints"].values()
+    return {
+        "elapsed": elapsed,
+        "records": records,
+        "retries": sum(m["retries"] for m in endpoints),
+        "failed": sum(m["failed"] for m in endpoints),
+    }
+
+
+def main():
+    print("=" * 70)
+    print("[Benchmark] 录制 / 回放：故障注入下的引擎吞吐与结果一致性")
+    print("=" * 70)
+    vcc.TARGET_TOTAL = 10**9
+    vcc.SAMPLE_SEED = BENCH_SEED
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    vcc.START_DATE = today - timedelta(days=BENCH_DAYS - 1)
+    workdir = tempfile.mkdtemp(prefix="bench_replay_")
+    tape = os.path.join(workdir, "github_tape.jsonl")
+
+    # 录制
+    upstream = MockGitHubServer(MockGitHub(BENCH_REPOS_PER_DAY, BENCH_LATENCY)).start()
+    recorder = Recorder(tape, upstream.url)
+    proxy = MockGitHubServer(recorder, handler=RecordingProxyHandler).start()
+    recorded = [run_crawler(crawler_cls, proxy.url, tempfile.mkdtemp(dir=workdir)) for _, crawler_cls in ENGINES]
+    proxy.stop()
+    recorder.close()
+    upstream.stop()
+    baseline = recorded[0]
+    ok = all(r["records"] == baseline["records"] for r in recorded)
+    print(f"录制: {len(baseline['records'])} 条记录 | 磁带 {recorder.request_counts.get('recorded', 0)} 个响应, "
+          f"{os.path.getsize(tape) / 1024 / 1024:.1f}MB | 用时 " +
+          " / ".join(f"{label} {r['elapsed']:.2f}s" for (label, _), r in zip(ENGINES, recorded)))
+
+    print(f"\n{'场景':16} {'引擎':16} {'用时(s)':>8} {'注入':>5} {'重试':>5} {'放弃':>5} {'未命中':>6} {'GraphQL拼接':>11} {'一致':>4}")
+    for scenario, faults in BENCH_SCENARIOS.items():
+        for label, crawler_cls in ENGINES:
+            mock = ReplayGitHub(tape, BENCH_LATENCY, faults=Faults(**faults, seed=42))
+            server = MockGitHubServer(mock, handler=ReplayHandler).start()
+            rundir = tempfile.mkdtemp(dir=workdir)
+            r = run_crawler(crawler_cls, server.url, rundir)
+            server.stop()
+            counts = mock.request_counts
+            injected = sum(v for k, v in counts.items() if k.startswith("injected_"))
+            same = r["records"] == baseline["records"]
+            ok &= same
+            print(f"{scenario:16} {label:16} {r['elapsed']:8.2f} {injected:5} {r['retries']:5} {r['failed']:5} "
+                  f"{counts.get('replay_miss', 0):6} {counts.get('graphql_composed', 0):11} "
+                  f"{'是' if same else '否':>4}")
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n回放结果与录制一致: {'是' if ok else '否'}")
+    print("=" * 70)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+在途仓库表示压测：搜索结果原始 dict vs RepoItem（__slots__ 紧凑记录）
+
+先从本地 mock 服务器录制 BENCH_PAGES 页搜索结果（响应体与 GitHub 一致，每个仓库约 80 个字段），
+再在录制的响应体上回放爬虫对每个仓库的本地处理（解析 -> 噪音过滤 -> 构造落盘记录），对比：
+- 每个在途仓库占用的内存（整页解析后只保留仓库本身，相当于流水线队列中的仓库）
+- 每个仓库的 CPU 时间（含 / 不含两者相同的 JSON 解析）
+- 两种表示构造出的落盘记录是否完全一致
+
+原始 dict 的处理沿用改造前的字段读取方式（legacy_*，对照组）。
+
+用法：
+    cd 01_crawling/benchmarks
+    python bench_repo_item.py
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from repo_item import RepoItem
+from vibe_coding_crawler import VibeCodingCrawler, build_repo_record, iso_time
+from mock_github_server import MockGitHub, MockGitHubServer
+
+# ========== 压测配置 ==========
+BENCH_DAYS = 10            # 录制的天数
+BENCH_REPOS_PER_DAY = 500  # 每天的合成仓库数
+BENCH_PER_PAGE = 100       # 每页仓库数（与爬虫一致）
+BENCH_REPEAT = 5           # CPU 计时取最快的一次
+
+
+def legacy_is_noise(crawler, item: dict) -> tuple:
+    """改造前的 is_noise：从原始 JSON 读取字段（对照组）"""
+    owner = item.get("owner") or {}
+    return crawler.check_noise(
+        owner=owner.get("login", ""),
+        name=item["name"],
+        description=item.get("description"),
+        topics=item.get("topics", []),
+        fork=item.get("fork", False),
+        size=item.get("size", 0),
+    )
+
+
+def legacy_build_repo_record(item: dict, tier: str, readme_content) -> dict:
+    """改造前的 build_repo_record（对照组）"""
+    owner = item.get("owner") or {}
+    return {
+        "id": item["id"],
+        "repo_name": item["full_name"],
+        "repo_url": item["html_url"],
+        "stars": item.get("stargazers_count", 0),
+        "description": item.get("description"),
+        "language": item.get("language"),
+        "topics": item.get("topics", []),
+        "created_at": iso_time(item.get("created_at")),
+        "pushed_at": iso_time(item.get("pushed_at")),
+        "tier": tier,
+        "size_kb": item.get("size", 0),
+        "forks_count": item.get("forks_count", 0),
+        "open_issues": item.get("open_issues_count", 0),
+        "owner_login": owner.get("login"),
+        "owner_type": owner.get("type"),
+        "readme_content": readme_content,
+    }
+
+
+def record_payloads() -> list:
+    """从 mock 服务器录制搜索响应体（bytes）"""
+    server = MockGitHubServer(MockGitHub(BENCH_REPOS_PER_DAY, latency=0)).start()
+    start = datetime.now().date() - timedelta(days=BENCH_DAYS)
+    payloads = []
+    with requests.Session() as session:
+        for i in range(BENCH_DAYS):
+            day = (start + timedelta(days=i)).strftime("%Y-%m-%d")
+            for page in range(1, BENCH_REPOS_PER_DAY // BENCH_PER_PAGE + 1):
+                resp = session.get(f"{server.url}/search/repositories",
+                                   params={"q": f"created:{day}", "per_page": BENCH_PER_PAGE, "page": page})
+                payloads.append(resp.content)
+    server.stop()
+    return payloads
+
+
+def hold_in_flight(payloads: list, convert) -> tuple:
+    """解析所有页，只保留仓库（页 dict 释放），返回 (仓库数, 占用字节)"""
+    gc.collect()
+    tracemalloc.start()
+    held = []
+    for payload in payloads:
+        held.extend(convert(item) for item in json.loads(payload)["items"])
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return len(held), size
+
+
+def process(payloads: list, convert, is_noise, build) -> tuple:
+    """回放：解析 -> 过滤 -> 构造记录，返回 (最快用时, 记录列表)"""
+    best = float("inf")
+    records = []
+    for _ in range(BENCH_REPEAT):
+        records = []
+        start = time.perf_counter()
+        for payload in payloads:
+            for raw in json.loads(payload)["items"]:
+                item = convert(raw)
+                is_noise(item)
+                records.append(build(item, "silent", None))
+        best = min(best, time.perf_counter() - start)
+    return best, records
+
+
+def parse_only(payloads: list) -> float:
+    """只解析 JSON 的最快用时（两种表示相同的部分）"""
+    best = float("inf")
+    for _ in range(BENCH_REPEAT):
+        start = time.perf_counter()
+        for payload in payloads:
+            json.loads(payload)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print("=" * 70)
+    print("[Benchmark] 在途仓库表示：原始 dict vs RepoItem")
+    print("=" * 70)
+    payloads = record_payloads()
+    total_bytes = sum(len(p) for p in payloads)
+    print(f"录制: {len(payloads)} 页 | {total_bytes / 1024 / 1024:.1f}MB | "
+          f"每个仓库 {total_bytes / (len(payloads) * BENCH_PER_PAGE) / 1024:.1f}KB JSON")
+
+    # 直接调用 VibeCodingCrawler 的方法，只替换 self，避免初始化客户端和断点文件
+    crawler = SimpleNamespace(stats={"filtered_by": Counter()})
+    crawler.check_noise = lambda **fields: VibeCodingCrawler.check_noise(crawler, **fields)
+
+    variants = [
+        ("原始 dict", lambda raw: raw, lambda item: legacy_is_noise(crawler, item), legacy_build_repo_record),
+        ("RepoItem", RepoItem.from_search, lambda item: VibeCodingCrawler.is_noise(crawler, item),
+         build_repo_record),
+    ]
+    parse_us = parse_only(payloads) / (len(payloads) * BENCH_PER_PAGE) * 1e6
+    results = []
+    for label, convert, is_noise, build in variants:
+        count, size = hold_in_flight(payloads, convert)
+        elapsed, records = process(payloads, convert, is_noise, build)
+        results.append({"label": label, "bytes": size / count, "us": elapsed / count * 1e6, "records": records})
+
+    print(f"\n{'表示':12} {'内存/仓库':>10} {'CPU/仓库':>10} {'不含解析':>10}")
+    for r in results:
+        print(f"{r['label']:12} {r['bytes'] / 1024:8.2f}KB {r['us']:8.1f}us {r['us'] - parse_us:8.1f}us")
+    base, compact = results
+    print(f"\nJSON 解析: {parse_us:.1f}us/仓库")
+    print(f"内存: {base['bytes'] / compact['bytes']:.1f}x 更少 | CPU: {base['us'] / compact['us']:.2f}x"
+          f"（不含解析 {(base['us'] - parse_us) / (compact['us'] - parse_us):.2f}x）")
+
+    same = base["records"] == compact["records"]
+    print(f"落盘记录一致: {'是' if same else '否'}")
+    print("=" * 70)
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关键词搜索扇出压测：crawler_vibe_coders 的全部关键词 + 技术栈查询，串行 vs 并发
+
+mock 服务器按 token 模拟搜索配额（BENCH_QUOTA 次 / BENCH_WINDOW 秒，按比例缩短 GitHub 的 30 次/分钟），
+每个请求固定延迟 BENCH_LATENCY（搜索 API 比其他接口慢）。对比：
+- 用时与配额下限（请求数按配额窗口计算的最短用时）、服务器返回的 403
+- 90% 去重后仓库到手的时间（首次运行没有产出记录；第二次按上次产出调度，高产出查询先发）
+- 各并发度的去重结果（顺序与 source_keyword）与串行完全一致
+
+用法：
+    cd 01_crawling/benchmarks
+    python bench_search_fanout.py
+"""
+
+import contextlib
+import io
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import crawler_vibe_coders as cvc
+from crawler_vibe_coders import VibeCodersCrawler
+from mock_github_server import MockGitHub, MockGitHubServer
+
+# ========== 压测配置 ==========
+BENCH_REPOS_PER_DAY = 600   # 每天的合成仓库数（关键词在合成词表中的查询才有结果）
+BENCH_LATENCY = 0.3         # 每个搜索请求的延迟(秒)
+BENCH_QUOTA = 30            # 每个窗口的搜索配额
+BENCH_WINDOW = 2.0          # 配额窗口(秒)
+BENCH_RUNS = [("串行", 1, False), ("并发 4", 4, False), ("并发 8", 8, False), ("并发 8 + 产出调度", 8, True)]
+
+
+def run_once(concurrency: int, yield_file: str) -> dict:
+    mock = MockGitHub(BENCH_REPOS_PER_DAY, BENCH_LATENCY, quotas={"search": BENCH_QUOTA}, quota_window=BENCH_WINDOW)
+    server = MockGitHubServer(mock).start()
+    cvc.GITHUB_API_URL = server.url
+    cvc.SEARCH_CONCURRENCY = concurrency
+    cvc.YIELD_FILE = yield_file
+    crawler = VibeCodersCrawler("mock-token")
+    start_date = (datetime.now() - timedelta(days=cvc.DAYS_BACK)).strftime("%Y-%m-%d")
+    queries = crawler.keyword_queries(start_date) + crawler.tech_queries(start_date)
+
+    # 记录每个仓库第一次到手的时刻
+    first_seen = {}
+
+    def make_record(repo, source):
+        first_seen.setdefault(repo["id"], time.perf_counter())
+        return VibeCodersCrawler.make_record(crawler, repo, source)
+
+    crawler.make_record = make_record
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        unique = crawler.search(queries)
+    elapsed = time.perf_counter() - start
+    crawler.close()
+    server.stop()
+
+    arrivals = sorted(t - start for t in first_seen.values())
+    counts = mock.request_counts
+    return {
+        "elapsed": elapsed,
+        "requests": counts.get("search", 0),
+        "rate_limited": counts.get("rate_limited", 0),
+        "t90": arrivals[int(len(arrivals) * 0.9) - 1] if arrivals else 0.0,
+        "unique": [(r["repo_id"], r["source_keyword"]) for r in unique],
+    }
+
+
+def main():
+    print("=" * 70)
+    print("[Benchmark] 关键词搜索：串行 vs 并发扇出 (本地 mock GitHub，模拟搜索配额)")
+    print("=" * 70)
+    print(f"查询: {len(cvc.PROJECT_KEYWORDS)} 关键词(≤2 页) + {len(cvc.TECH_COMBINATIONS)} 技术栈(1 页) | "
+          f"配额 {BENCH_QUOTA} 次/{BENCH_WINDOW:.0f}s | 延迟 {BENCH_LATENCY * 1000:.0f}ms")
+    cvc.HTTP_CACHE_FILE = ""
+    workdir = tempfile.mkdtemp(prefix="bench_fanout_")
+
+    results = []
+    for label, concurrency, with_history in BENCH_RUNS:
+        yield_file = os.path.join(workdir, f"yield_{concurrency}.json")
+        if with_history:
+            # 先完整跑一遍留下产出记录
+            run_once(concurrency, yield_file)
+        results.append((label, run_once(concurrency, yield_file)))
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    requests = results[0][1]["requests"]
+    floor = (math.ceil(requests / BENCH_QUOTA) - 1) * BENCH_WINDOW
+    print(f"\n{'方式':18} {'用时(s)':>8} {'请求':>5} {'403':>4} {'90%到手(s)':>10} {'去重后':>6} {'一致':>4}")
+    base = results[0][1]
+    ok = True
+    for label, r in results:
+        same = r["unique"] == base["unique"]
+        ok &= same
+        print(f"{label:18} {r['elapsed']:8.2f} {r['requests']:5} {r['rate_limited']:4} {r['t90']:10.2f} "
+              f"{len(r['unique']):6} {'是' if same else '否':>4}")
+    print(f"\n配额下限: {floor:.1f}s（{requests} 个请求 / 每 {BENCH_WINDOW:.0f}s {BENCH_QUOTA} 次）")
+    print(f"加速比: {base['elapsed'] / results[2][1]['elapsed']:.1f}x（并发 8 vs 串行）")
+    print(f"去重结果与串行一致: {'是' if ok else '否'}")
+    print("=" * 70)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
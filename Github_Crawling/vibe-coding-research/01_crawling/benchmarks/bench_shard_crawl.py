@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分片爬取压测：1 / 2 / 4 个分片进程（每个分片一个 token）回填同一段日期
+
+对比每种分片数的用时、加速比，并检查合并后的数据集与单分片完全一致（抽样按 id 哈希，结果与分片方式无关）。
+
+用法：
+    cd 01_crawling/benchmarks
+    python bench_shard_crawl.py
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import shard_crawl
+import vibe_coding_crawler as vcc
+from mock_github_server import MockGitHub, MockGitHubServer
+
+# ========== 压测配置 ==========
+BENCH_DAYS = 16            # 回填天数
+BENCH_REPOS_PER_DAY = 300  # 每天的合成仓库数
+BENCH_LATENCY = 0.2        # mock 服务器每个请求的延迟(秒)
+BENCH_SHARDS = [1, 2, 4]   # 分片数（= token 数）
+BENCH_SEED = "bench-42"   # 抽样种子
+
+
+def crawl_sharded(server: MockGitHubServer, shards: int) -> dict:
+    workdir = tempfile.mkdtemp(prefix="bench_shard_")
+    shard_crawl.SHARD_DIR = os.path.join(workdir, "shards")
+    shard_crawl.SHARD_COUNT = shards
+    vcc.OUTPUT_FILE = os.path.join(workdir, "dataset.jsonl")
+    vcc.CHECKPOINT_FILE = os.path.join(workdir, "checkpoint.sqlite")
+    vcc.README_STORE_FILE = os.path.join(workdir, "readmes.sqlite")
+
+    before = sum(server.mock.request_counts.values())
+    tokens = [f"mock-token-{i}" for i in range(shards)]
+    result = shard_crawl.run_sharded(tokens, end_date=vcc.START_DATE + timedelta(days=BENCH_DAYS - 1))
+    with open(vcc.OUTPUT_FILE, "rb") as f:
+        ids = [json.loads(line)["id"] for line in f]
+    shutil.rmtree(workdir, ignore_errors=True)
+    result["ids"] = ids
+    result["requests"] = sum(server.mock.request_counts.values()) - before
+    return result
+
+
+def main():
+    vcc.TARGET_TOTAL = 10**9
+    vcc.HTTP_CACHE_FILE = ""
+    vcc.SAMPLE_SEED = BENCH_SEED
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    vcc.START_DATE = today - timedelta(days=BENCH_DAYS - 1)
+
+    server = MockGitHubServer(MockGitHub(BENCH_REPOS_PER_DAY, BENCH_LATENCY)).start()
+    vcc.GITHUB_API_URL = server.url
+
+    rows = [(shards, crawl_sharded(server, shards)) for shards in BENCH_SHARDS]
+    server.stop()
+
+    print("\n" + "=" * 70)
+    print("[Benchmark] 分片爬取 (本地 mock GitHub)")
+    print("=" * 70)
+    print(f"天数: {BENCH_DAYS} | 每天仓库: {BENCH_REPOS_PER_DAY} | 请求延迟: {BENCH_LATENCY*1000:.0f}ms")
+    print(f"{'分片':>4} {'用时(s)':>8} {'加速比':>6} {'保存':>6} {'请求':>6}  合并")
+    base = rows[0][1]
+    failed = False
+    for shards, r in rows:
+        m = r["merge"]
+        print(f"{shards:>4} {r['elapsed']:8.2f} {base['elapsed'] / r['elapsed']:6.2f} {len(r['ids']):6} {r['requests']:6}  "
+              f"新增 {m['merged']} 重复 {m['duplicates']}")
+        failed |= len(r["ids"]) != len(set(r["ids"])) or set(r["ids"]) != set(base["ids"])
+    print("=" * 70)
+    if failed:
+        print("[错误] 合并结果与单分片不一致")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+crawler_vibe_coders 搜索 + README 压测：分阶段（全部搜索去重后再取 README）vs 流式（新仓库一出现就取 README）
+
+mock 服务器按 token 模拟搜索配额（BENCH_QUOTA 次 / BENCH_WINDOW 秒），README 不限配额。
+两种 README 获取方式（graphql 批量 / rest 逐个）各跑一遍，对比用时，并检查两种方式最终记录完全一致。
+
+用法：
+    cd 01_crawling/benchmarks
+    python bench_vibe_coders_stream.py
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import crawler_vibe_coders as cvc
+from crawler_vibe_coders import VibeCodersCrawler
+from mock_github_server import MockGitHub, MockGitHubServer
+
+# ========== 压测配置 ==========
+BENCH_REPOS_PER_DAY = 600  # 每天的合成仓库数
+BENCH_LATENCY = 0.05       # 每个请求的延迟(秒)
+BENCH_QUOTA = 30           # 每个窗口的搜索配额
+BENCH_WINDOW = 2.0         # 配额窗口(秒)
+
+
+def run_once(streaming: bool) -> dict:
+    mock = MockGitHub(BENCH_REPOS_PER_DAY, BENCH_LATENCY, quotas={"search": BENCH_QUOTA}, quota_window=BENCH_WINDOW)
+    server = MockGitHubServer(mock).start()
+    cvc.GITHUB_API_URL = server.url
+    crawler = VibeCodersCrawler("mock-token")
+    start_date = (datetime.now() - timedelta(days=cvc.DAYS_BACK)).strftime("%Y-%m-%d")
+    queries = crawler.keyword_queries(start_date) + crawler.tech_queries(start_date)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if streaming:
+            records = crawler.search_and_fetch(queries)
+        else:
+            crawler.pipeline.run(crawler.search(queries))
+            records = crawler.merged()
+    elapsed = time.perf_counter() - start
+    crawler.close()
+    server.stop()
+    return {"elapsed": elapsed, "records": records, "readmes": crawler.readme_stats["success"],
+            "requests": dict(mock.request_counts)}
+
+
+def main():
+    print("=" * 70)
+    print("[Benchmark] crawler_vibe_coders：分阶段 vs 流式去重 + README (本地 mock GitHub)")
+    print("=" * 70)
+    cvc.HTTP_CACHE_FILE = ""
+    cvc.YIELD_FILE = ""
+
+    ok = True
+    print(f"\n{'README 方式':12} {'流程':8} {'用时(s)':>8} {'去重后':>6} {'README':>6} {'请求':>5}")
+    for mode in ("graphql", "rest"):
+        cvc.README_FETCH_MODE = mode
+        results = [("分阶段", run_once(False)), ("流式", run_once(True))]
+        for label, r in results:
+            print(f"{mode:12} {label:8} {r['elapsed']:8.2f} {len(r['records']):6} {r['readmes']:6} "
+                  f"{sum(r['requests'].values()):5}")
+        ok &= results[0][1]["records"] == results[1][1]["records"]
+        print(f"{'':12} 节省 {results[0][1]['elapsed'] - results[1][1]['elapsed']:.2f}s")
+
+    print(f"\n两种流程的最终记录一致: {'是' if ok else '否'}")
+    print("=" * 70)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
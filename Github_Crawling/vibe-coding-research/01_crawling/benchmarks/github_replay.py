@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GitHub API 录制 / 回放 - 不访问 GitHub 也能回归测试和压测爬虫
+
+- 录制：本地代理把请求原样转发到上游（默认 https://api.github.com，也可以是 mock 服务器），
+  响应返回给爬虫的同时追加到磁带文件（JSONL，每行一个请求/响应对）。爬虫把 GITHUB_API_URL 指向代理即可。
+  转发时去掉 If-None-Match（保证录到完整正文）；磁带不保存 Authorization，
+  也不保存限流 403 与 5xx（回放时由故障注入模拟）
+- 回放：按 (方法, 路径 + 排序后的查询参数, Accept, 请求体哈希) 查磁带返回录制的响应；
+  同一请求录了多次时按录制顺序依次返回，最后一个重复使用；
+  GraphQL nodes(ids:) 的分批与录制时不同（并发引擎的分批顺序不固定）时，按节点 id 拼出响应。
+  回放处理器继承 mock 服务器：延迟、按 token 的配额 / 次级限流模拟、故障注入（Faults）、ETag / 304 都与之一致；
+  磁带中没有的请求返回 404（计入 replay_miss）
+
+用法：
+    python github_replay.py record github_tape.jsonl [上游地址]   # 监听 127.0.0.1:8766
+    python github_replay.py replay github_tape.jsonl
+    # 另一个终端：GITHUB_API_URL=http://127.0.0.1:8766 python vibe_coding_crawler.py
+    # 回放的延迟与故障注入（概率）：REPLAY_LATENCY / REPLAY_RATE_LIMIT / REPLAY_SECONDARY_LIMIT / REPLAY_SERVER_ERROR
+"""
+
+import base64
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+import requests
+
+from mock_github_server import Faults, MockGitHub, MockGitHubHandler, MockGitHubServer
+
+DEFAULT_PORT = 8766
+DEFAULT_UPSTREAM = "https://api.github.com"
+UPSTREAM_TIMEOUT = 30      # 转发到上游的超时(秒)
+FORWARDED_HEADERS = ["Authorization", "Accept", "Content-Type", "User-Agent"]
+RELAYED_HEADERS = ["Content-Type", "ETag", "Link", "Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining",
+                   "X-RateLimit-Reset", "X-RateLimit-Used", "X-RateLimit-Resource"]
+BASE_PLACEHOLDER = "{base}"  # 磁带中 Link 头里的上游地址，回放时换成回放服务器地址
+
+
+def request_key(method: str, path: str, accept: str, body: bytes = b"") -> str:
+    """磁带索引键：查询参数排序，JSON 请求体按键排序后取哈希"""
+    url = urlparse(path)
+    query = urlencode(sorted(parse_qsl(url.query, keep_blank_values=True)))
+    digest = ""
+    if body:
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True).encode("utf-8")
+        except ValueError:
+            pass
+        digest = hashlib.sha1(body).hexdigest()[:16]
+    return f"{method} {url.path.rstrip('/')}?{query} {accept} {digest}"
+
+
+def resource_of(path: str) -> str:
+    """按路径判断配额资源（与 mock 服务器一致）"""
+    if path.startswith("/search/"):
+        return "search"
+    if path == "/graphql":
+        return "graphql"
+    return "core"
+
+
+def entry_body(entry: Dict[str, Any]) -> bytes:
+    if "body_base64" in entry:
+        return base64.b64decode(entry["body_base64"])
+    return entry["body"].encode("utf-8")
+
+
+class Cassette:
+    """磁带：JSONL 文件，每行一个请求/响应对（线程安全，录制时逐行追加）"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.responses: Dict[str, List[Dict[str, Any]]] = {}
+        self.nodes: Dict[str, Any] = {}      # GraphQL 节点 id -> 录制的节点
+        self.cursor: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self._file = None
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.responses.values())
+
+    def _index(self, entry: Dict[str, Any]) -> None:
+        self.responses.setdefault(entry["key"], []).append(entry)
+        ids = ((entry.get("request") or {}).get("variables") or {}).get("ids")
+        if ids and entry["status"] == 200:
+            data = json.loads(entry_body(entry)).get("data") or {}
+            self.nodes.update(zip(ids, data.get("nodes") or []))
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        with self.lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+            self._index(entry)
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """按录制顺序返回该请求的下一个响应（用完后重复最后一个）；没有录制返回 None"""
+        with self.lock:
+            entries = self.responses.get(key)
+            if not entries:
+                return None
+            index = self.cursor.get(key, 0)
+            self.cursor[key] = index + 1
+            return entries[min(index, len(entries) - 1)]
+
+    def graphql_nodes(self, ids: List[str]) -> Optional[List[Any]]:
+        """按节点 id 拼出 nodes；任一 id 没有录制时返回 None"""
+        with self.lock:
+            if all(node_id in self.nodes for node_id in ids):
+                return [self.nodes[node_id] for node_id in ids]
+        return None
+
+    def close(self) -> None:
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class Recorder:
+    """录制代理的状态：上游地址、转发会话、磁带与请求计数"""
+
+    def __init__(self, cassette_path: str, upstream: str = DEFAULT_UPSTREAM):
+        self.cassette = Cassette(cassette_path)
+        self.upstream = upstream.rstrip("/")
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=64)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.request_counts: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.request_counts[name] = self.request_counts.get(name, 0) + 1
+
+    def close(self) -> None:
+        self.cassette.close()
+        self.session.close()
+
+
+class RecordingProxyHandler(BaseHTTPRequestHandler):
+    server_version = "GitHubRecorder/1.0"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    @property
+    def recorder(self) -> Recorder:
+        return self.server.mock
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._forward()
+
+    def do_POST(self):
+        self._forward()
+
+    def _forward(self) -> None:
+        recorder = self.recorder
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        headers = {key: self.headers[key] for key in FORWARDED_HEADERS if key in self.headers}
+        try:
+            resp = recorder.session.request(self.command, recorder.upstream + self.path, data=body or None,
+                                            headers=headers, timeout=UPSTREAM_TIMEOUT)
+        except requests.RequestException:
+            recorder.count("upstream_errors")
+            return self._reply(502, {"Content-Type": "application/json"}, b'{"message": "Upstream unreachable"}')
+
+        relayed = {key: resp.headers[key] for key in RELAYED_HEADERS if key in resp.headers}
+        link = relayed.get("Link")
+        if link:
+            relayed["Link"] = link.replace(recorder.upstream, f"http://{self.headers.get('Host')}")
+        limited = resp.status_code in (403, 429) and (
+            resp.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in resp.headers
+            or "rate limit" in resp.text.lower())
+        if resp.status_code >= 500 or limited:
+            recorder.count("not_recorded")
+        else:
+            recorder.count("recorded")
+            recorder.cassette.append(self._entry(resp, body, link))
+        self._reply(resp.status_code, relayed, resp.content)
+
+    def _entry(self, resp: requests.Response, body: bytes, link: Optional[str]) -> Dict[str, Any]:
+        path = urlparse(self.path).path.rstrip("/")
+        entry = {
+            "key": request_key(self.command, self.path, self.headers.get("Accept", ""), body),
+            "method": self.command,
+            "path": self.path,
+            "status": resp.status_code,
+            "resource": resp.headers.get("X-RateLimit-Resource") or resource_of(path),
+            "content_type": resp.headers.get("Content-Type", "application/json"),
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        if body:
+            try:
+                entry["request"] = json.loads(body)
+            except ValueError:
+                pass
+        if link:
+            entry["link"] = link.replace(self.recorder.upstream, BASE_PLACEHOLDER)
+        try:
+            entry["body"] = resp.content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_base64"] = base64.b64encode(resp.content).decode("ascii")
+        return entry
+
+    def _reply(self, status: int, headers: Dict[str, str], payload: bytes) -> None:
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class ReplayGitHub(MockGitHub):
+    """回放服务器状态：磁带 + mock 服务器的延迟 / 配额模拟 / 故障注入"""
+
+    def __init__(self, cassette, latency: float = 0.0, quotas: Optional[Dict[str, int]] = None,
+                 quota_window: float = 3600, burst_limit: int = 0, faults: Optional[Faults] = None):
+        super().__init__(0, latency, quotas, quota_window, burst_limit, faults)
+        self.cassette = cassette if isinstance(cassette, Cassette) else Cassette(cassette)
+
+
+class ReplayHandler(MockGitHubHandler):
+    server_version = "GitHubReplay/1.0"
+
+    def do_GET(self):
+        if urlparse(self.path).path.rstrip("/") == "/rate_limit":
+            return super().do_GET()
+        self._replay(b"")
+
+    def do_POST(self):
+        self._replay(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+
+    def _replay(self, body: bytes) -> None:
+        time.sleep(self.mock.latency)
+        path = urlparse(self.path).path.rstrip("/")
+        resource = resource_of(path)
+        self.quota_headers = None
+        if self._limited(resource):
+            return
+        entry = self.mock.cassette.lookup(request_key(self.command, self.path, self.headers.get("Accept", ""), body))
+        if entry is None and path == "/graphql":
+            entry = self._compose_graphql(body)
+        if entry is None:
+            self.mock.count("replay_miss")
+            return self._send(404, {"message": "Not Found (not recorded)"}, resource)
+        self.mock.count("replayed")
+        extra = None
+        if entry.get("link"):
+            extra = {"Link": entry["link"].replace(BASE_PLACEHOLDER, f"http://{self.headers.get('Host')}")}
+        self._send(entry["status"], entry_body(entry), entry["resource"], entry["content_type"], extra)
+
+    def _compose_graphql(self, body: bytes) -> Optional[Dict[str, Any]]:
+        """分批与录制时不同的 nodes(ids:) 查询：按节点 id 拼出响应"""
+        try:
+            ids = (json.loads(body).get("variables") or {}).get("ids")
+        except (ValueError, AttributeError):
+            return None
+        nodes = self.mock.cassette.graphql_nodes(ids) if ids else None
+        if nodes is None:
+            return None
+        self.mock.count("graphql_composed")
+        reset_at = datetime.utcfromtimestamp(time.time() + 3600).strftime("%Y-%m-%dT%H:%M:%SZ")
+        data = {"nodes": nodes, "rateLimit": {"cost": 1, "remaining": 4999, "resetAt": reset_at}}
+        return {"status": 200, "resource": "graphql", "content_type": "application/json",
+                "body": json.dumps({"data": data})}
+
+
+def main():
+    sys.stdout.reconfigure(encoding='utf-8')
+    if len(sys.argv) < 3 or sys.argv[1] not in ("record", "replay"):
+        print("用法: python github_replay.py record <磁带.jsonl> [上游地址]")
+        print("      python github_replay.py replay <磁带.jsonl>")
+        return
+    command, tape = sys.argv[1], sys.argv[2]
+    if command == "record":
+        upstream = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_UPSTREAM
+        backend = Recorder(tape, upstream)
+        server = MockGitHubServer(backend, port=DEFAULT_PORT, handler=RecordingProxyHandler)
+        print(f"[录制] {server.url} -> {upstream} | 磁带 {tape}（已有 {len(backend.cassette)} 条）")
+    else:
+        faults = Faults(rate_limit=float(os.getenv("REPLAY_RATE_LIMIT", "0")),
+                        secondary_limit=float(os.getenv("REPLAY_SECONDARY_LIMIT", "0")),
+                        server_error=float(os.getenv("REPLAY_SERVER_ERROR", "0")))
+        backend = ReplayGitHub(tape, float(os.getenv("REPLAY_LATENCY", "0")), faults=faults)
+        server = MockGitHubServer(backend, port=DEFAULT_PORT, handler=ReplayHandler)
+        print(f"[回放] {server.url} | 磁带 {tape}（{len(backend.cassette)} 条）| 延迟 {backend.latency}s | "
+              f"注入: 主限流 {faults.rate_limit:.0%} 次级限流 {faults.secondary_limit:.0%} "
+              f"5xx {faults.server_error:.0%}")
+    print(f"爬虫设置 GITHUB_API_URL={server.url} 后运行，Ctrl+C 停止")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        if isinstance(backend, Recorder):
+            backend.close()
+        print(f"\n请求计数: {backend.request_counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,609 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地 mock GitHub API 服务器 - 用于离线压测爬虫引擎
+
+覆盖爬虫用到的接口：
+- GET /search/repositories   按 q 中的 created 日期生成确定性的合成仓库（created:A..B 可跨多天，created:>A 到今天），
+                               支持 created:A..B / size:lo..hi / stars:lo..hi / pushed:>时间戳 过滤，
+                               fork:false / archived:false / -user: / -org: / NOT 关键词排除，
+                               以及不带限定词的关键词（全部命中 name / description / topics），带 Link 分页头
+- GET /repos/{owner}/{name}/readme   支持 JSON(base64) 与 application/vnd.github.raw
+- GET /repos/{owner}/{name}/topics
+- GET /repos/{owner}/{name}          PyGithub 懒加载补全时使用
+- GET /users/{login}
+- GET /rate_limit
+- POST /graphql                      nodes(ids:) 批量补全（README 按 graphql_enricher 的 readme0 别名返回）
+
+每个请求固定注入 latency 秒延迟以模拟网络往返，响应头默认带充足的 X-RateLimit-* 配额。
+传入 quotas 时按 token 模拟主速率限制（每个窗口 quota_window 秒内各资源的请求数，超出返回 403 + Remaining 0），
+传入 burst_limit 时模拟次级速率限制（同一 token 每秒超过 burst_limit 个请求返回 403 + Retry-After）。
+传入 faults（Faults）时按概率注入主限流 403、次级限流 403 与 5xx，用于压测爬虫的重试与限流处理。
+GET 200 响应带 ETag（正文哈希），请求的 If-None-Match 一致时返回 304（计入 not_modified）。
+MockGitHub.push() 模拟一部分仓库有新提交（pushed_at、stars、README 变化），用于压测增量刷新。
+
+用法：
+    python mock_github_server.py            # 监听 127.0.0.1:8765
+"""
+
+import base64
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs, urlencode
+
+DEFAULT_PORT = 8765
+DEFAULT_REPOS_PER_DAY = 300
+DEFAULT_LATENCY = 0.05     # 每个请求的模拟网络延迟(秒)
+README_RATIO = 0.9         # 有 README 的仓库比例
+TEMPLATE_README_RATIO = 0.3  # README 原样沿用脚手架模板的仓库比例（模板克隆）
+UNLIMITED_HEADERS = {"X-RateLimit-Limit": "1000000", "X-RateLimit-Remaining": "999999"}
+SECONDARY_RETRY_AFTER = 1  # 次级限流返回的 Retry-After(秒)
+FAULT_RESET_AFTER = 1.0    # 注入的主限流 403 在多少秒后重置
+
+_WORDS = [
+    "habit", "tracker", "budget", "recipe", "chat", "agent", "notes", "timer",
+    "weather", "portfolio", "game", "quiz", "music", "photo", "todo", "crm",
+    "invoice", "shop", "blog", "journal", "workout", "study", "course", "config",
+    "awesome", "leetcode", "sdk", "api", "dashboard", "planner", "bot", "vault",
+]
+_BIG_OWNERS = ["microsoft", "google", "openai", "vercel"]  # 少量大公司仓库（前三个在黑名单中）
+_LANGUAGES = ["Python", "TypeScript", "JavaScript", "Go", "Rust", None]
+_TOPICS = ["ai", "nextjs", "react", "python", "llm", "tutorial", "cli", "automation", "homework"]
+# 脚手架默认 README（create-next-app / Vite）
+_TEMPLATE_READMES = [
+    "\n".join([
+        "This is a [Next.js](https://nextjs.org) project bootstrapped with "
+        "[`create-next-app`](https://nextjs.org/docs/app/api-reference/cli/create-next-app).",
+        "", "## Getting Started", "", "First, run the development server:", "",
+        "```bash", "npm run dev", "# or", "yarn dev", "# or", "pnpm dev", "```", "",
+        "Open [http://localhost:3000](http://localhost:3000) with your browser to see the result.", "",
+        "## Learn More", "", "To learn more about Next.js, take a look at the following resources:",
+    ]),
+    "\n".join([
+        "# React + TypeScript + Vite", "",
+        "This template provides a minimal setup to get React working in Vite with HMR and some ESLint rules.", "",
+        "Currently, two official plugins are available:", "",
+        "- [@vitejs/plugin-react](https://github.com/vitejs/vite-plugin-react) uses Babel for Fast Refresh",
+        "- [@vitejs/plugin-react-swc](https://github.com/vitejs/vite-plugin-react-swc) uses SWC for Fast Refresh",
+    ]),
+]
+
+
+def _day_seed(day: str) -> int:
+    return int(day.replace("-", ""))
+
+
+def generate_repos(day: str, count: int) -> List[Dict[str, Any]]:
+    """为某一天生成确定性的合成仓库列表（字段与搜索 API 返回一致）"""
+    rng = random.Random(_day_seed(day))
+    repos = []
+    for i in range(count):
+        repo_id = _day_seed(day) * 100000 + i
+        owner_login = f"user{rng.randint(1, 5000)}"
+        if rng.random() < 0.01:
+            owner_login = rng.choice(_BIG_OWNERS)
+        name = "-".join(rng.sample(_WORDS, rng.randint(1, 3)))
+        hour = rng.randint(0, 23)
+        created = f"{day}T{hour:02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}Z"
+        stars = int(rng.paretovariate(1.2)) - 1
+        repos.append({
+            "id": repo_id,
+            "node_id": f"R_mock{repo_id}",
+            "name": name,
+            "full_name": f"{owner_login}/{name}",
+            "owner": {
+                "login": owner_login,
+                "id": rng.randint(1, 10**7),
+                "node_id": f"U_mock{owner_login}",
+                "type": "Organization" if rng.random() < 0.08 else "User",
+            },
+            "private": False,
+            "html_url": f"https://github.com/{owner_login}/{name}",
+            "description": " ".join(rng.sample(_WORDS, rng.randint(2, 6))) if rng.random() < 0.8 else None,
+            "fork": rng.random() < 0.03,
+            "created_at": created,
+            "updated_at": created,
+            "pushed_at": created,
+            "size": rng.randint(0, 50000),
+            "stargazers_count": stars,
+            "watchers_count": stars,
+            "language": rng.choice(_LANGUAGES),
+            "forks_count": rng.randint(0, 5),
+            "open_issues_count": rng.randint(0, 3),
+            "topics": rng.sample(_TOPICS, rng.randint(0, 3)),
+            "archived": rng.random() < 0.02,
+            "default_branch": "main",
+            "has_readme": rng.random() < README_RATIO,
+        })
+    return repos
+
+
+def readme_text(repo: Dict[str, Any]) -> str:
+    """生成仓库的合成 README（部分仓库沿用模板，换行/行尾空白随机不同）"""
+    pick = random.Random(f"template-{repo['id']}")
+    if pick.random() < TEMPLATE_README_RATIO:
+        text = pick.choice(_TEMPLATE_READMES)
+        if pick.random() < 0.5:
+            text = text.replace("\n", "  \r\n") + "\r\n"
+    else:
+        rng = random.Random(repo["id"])
+        lines = [f"# {repo['name']}", "", repo.get("description") or "", "", "## Features", ""]
+        lines += [f"- {' '.join(rng.sample(_WORDS, 4))}" for _ in range(rng.randint(3, 12))]
+        lines += ["", "## Installation", "", "```bash", "npm install", "npm run dev", "```", ""]
+        lines += [" ".join(rng.choices(_WORDS, k=20)) for _ in range(rng.randint(2, 30))]
+        text = "\n".join(lines)
+    if repo.get("readme_rev"):
+        text += f"\n\n## Changelog\n\n- v0.{repo['readme_rev']}"
+    return text
+
+
+class Faults:
+    """
+    故障注入：每个请求抽一次签，按概率返回主速率限制 403（Remaining 0，reset_after 秒后重置）、
+    次级速率限制 403（Retry-After）或 502 / 503；同一 seed 的抽签序列可复现
+    """
+
+    def __init__(self, rate_limit: float = 0.0, secondary_limit: float = 0.0, server_error: float = 0.0,
+                 reset_after: float = FAULT_RESET_AFTER, seed: int = 0):
+        self.rate_limit = rate_limit
+        self.secondary_limit = secondary_limit
+        self.server_error = server_error
+        self.reset_after = reset_after
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def draw(self) -> Optional[Tuple[str, int, Dict[str, str], Dict[str, str]]]:
+        """抽签，返回 (计数名, 状态码, 响应头, 响应体)；不注入故障时返回 None"""
+        with self.lock:
+            roll = self.rng.random()
+        now = time.time()
+        if roll < self.rate_limit:
+            headers = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "0",
+                       "X-RateLimit-Reset": f"{now + self.reset_after:.3f}"}
+            return "injected_rate_limited", 403, headers, {"message": "API rate limit exceeded."}
+        roll -= self.rate_limit
+        headers = {**UNLIMITED_HEADERS, "X-RateLimit-Reset": str(int(now) + 3600)}
+        if roll < self.secondary_limit:
+            return ("injected_secondary_limited", 403, {**headers, "Retry-After": str(SECONDARY_RETRY_AFTER)},
+                    {"message": "You have exceeded a secondary rate limit."})
+        roll -= self.secondary_limit
+        if roll < self.server_error:
+            status = 502 if roll < self.server_error / 2 else 503
+            return "injected_server_error", status, headers, {"message": "Server Error"}
+        return None
+
+
+class MockGitHub:
+    """mock 服务器状态：合成数据 + 请求计数"""
+
+    def __init__(self, repos_per_day: int = DEFAULT_REPOS_PER_DAY, latency: float = DEFAULT_LATENCY,
+                 quotas: Optional[Dict[str, int]] = None, quota_window: float = 3600,
+                 burst_limit: int = 0, faults: Optional[Faults] = None):
+        self.repos_per_day = repos_per_day
+        self.latency = latency
+        self.faults = faults
+        self.quotas = quotas or {}          # resource -> 每个 token 每个窗口的请求数（未列出的资源不限）
+        self.quota_window = quota_window
+        self.burst_limit = burst_limit      # 同一 token 每秒的请求上限（0 = 不限）
+        self._windows: Dict[Tuple[str, str], List[float]] = {}  # (token, resource) -> [窗口结束时刻, 已用]
+        self._recent: Dict[str, deque] = {}                      # token -> 最近一秒内的请求时刻
+        self.days: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_name: Dict[str, Dict[str, Any]] = {}
+        self.by_node_id: Dict[str, Dict[str, Any]] = {}
+        self.request_counts: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def repos_for_day(self, day: str) -> List[Dict[str, Any]]:
+        with self.lock:
+            if day not in self.days:
+                repos = generate_repos(day, self.repos_per_day)
+                self.days[day] = repos
+                for repo in repos:
+                    self.by_name[repo["full_name"]] = repo
+                    self.by_node_id[repo["node_id"]] = repo
+            return self.days[day]
+
+    def push(self, fraction: float, seed: int = 0, readme_fraction: float = 0.5) -> int:
+        """
+        模拟新提交：已生成的仓库中随机 fraction 比例 pushed_at 改为现在、stars 增加，
+        其中 readme_fraction 比例的 README 也改变
+        返回: 有新提交的仓库数
+        """
+        rng = random.Random(seed)
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        with self.lock:
+            repos = [r for day in sorted(self.days) for r in self.days[day]]
+            pushed = rng.sample(repos, int(len(repos) * fraction))
+            for repo in pushed:
+                repo["pushed_at"] = repo["updated_at"] = now
+                repo["stargazers_count"] += rng.randint(1, 30)
+                repo["watchers_count"] = repo["stargazers_count"]
+                if rng.random() < readme_fraction:
+                    repo["readme_rev"] = repo.get("readme_rev", 0) + 1
+        return len(pushed)
+
+    def take(self, token: str, resource: str) -> Tuple[int, Dict[str, str]]:
+        """
+        按 token 扣一次配额（先检查主速率限制，再检查次级速率限制）
+        返回: (200 放行 / 403 限流, X-RateLimit-* 与 Retry-After 响应头)
+        """
+        now = time.time()
+        with self.lock:
+            limit = self.quotas.get(resource)
+            window = None
+            if limit is None:
+                headers = {**UNLIMITED_HEADERS, "X-RateLimit-Reset": str(int(now) + 3600)}
+            else:
+                window = self._windows.get((token, resource))
+                if window is None or window[0] <= now:
+                    window = self._windows[(token, resource)] = [now + self.quota_window, 0]
+                headers = {"X-RateLimit-Limit": str(limit), "X-RateLimit-Remaining": str(limit - window[1]),
+                           "X-RateLimit-Reset": f"{window[0]:.3f}"}
+                if window[1] >= limit:
+                    return 403, headers
+            if self.burst_limit:
+                recent = self._recent.setdefault(token, deque())
+                while recent and recent[0] <= now - 1:
+                    recent.popleft()
+                if len(recent) >= self.burst_limit:
+                    return 403, {**headers, "Retry-After": str(SECONDARY_RETRY_AFTER)}
+                recent.append(now)
+            if window is not None:
+                window[1] += 1
+                headers["X-RateLimit-Remaining"] = str(limit - window[1])
+            return 200, headers
+
+    def count(self, endpoint: str) -> None:
+        with self.lock:
+            self.request_counts[endpoint] = self.request_counts.get(endpoint, 0) + 1
+
+
+# 真实搜索结果中每个仓库 / owner 附带的 API URL 字段（爬虫不使用，只为让响应体积与 GitHub 一致）
+_REPO_URL_FIELDS = [
+    ("forks_url", "/forks"), ("keys_url", "/keys{/key_id}"), ("collaborators_url", "/collaborators{/collaborator}"),
+    ("teams_url", "/teams"), ("hooks_url", "/hooks"), ("issue_events_url", "/issues/events{/number}"),
+    ("events_url", "/events"), ("assignees_url", "/assignees{/user}"), ("branches_url", "/branches{/branch}"),
+    ("tags_url", "/tags"), ("blobs_url", "/git/blobs{/sha}"), ("git_tags_url", "/git/tags{/sha}"),
+    ("git_refs_url", "/git/refs{/sha}"), ("trees_url", "/git/trees{/sha}"), ("statuses_url", "/statuses/{sha}"),
+    ("languages_url", "/languages"), ("stargazers_url", "/stargazers"), ("contributors_url", "/contributors"),
+    ("subscribers_url", "/subscribers"), ("subscription_url", "/subscription"), ("commits_url", "/commits{/sha}"),
+    ("git_commits_url", "/git/commits{/sha}"), ("comments_url", "/comments{/number}"),
+    ("issue_comment_url", "/issues/comments{/number}"), ("contents_url", "/contents/{+path}"),
+    ("compare_url", "/compare/{base}...{head}"), ("merges_url", "/merges"), ("archive_url", "/{archive_format}{/ref}"),
+    ("downloads_url", "/downloads"), ("issues_url", "/issues{/number}"), ("pulls_url", "/pulls{/number}"),
+    ("milestones_url", "/milestones{/number}"), ("notifications_url", "/notifications{?since,all,participating}"),
+    ("labels_url", "/labels{/name}"), ("releases_url", "/releases{/id}"), ("deployments_url", "/deployments"),
+]
+_OWNER_URL_FIELDS = [
+    ("followers_url", "/followers"), ("following_url", "/following{/other_user}"), ("gists_url", "/gists{/gist_id}"),
+    ("starred_url", "/starred{/owner}{/repo}"), ("subscriptions_url", "/subscriptions"),
+    ("organizations_url", "/orgs"), ("repos_url", "/repos"), ("events_url", "/events{/privacy}"),
+    ("received_events_url", "/received_events"),
+]
+
+
+def _public(repo: Dict[str, Any]) -> Dict[str, Any]:
+    """API 响应中的仓库 JSON：去掉内部字段，补上 GitHub 搜索结果中的其他字段"""
+    body = {k: v for k, v in repo.items() if k not in ("has_readme", "readme_rev")}
+    api = f"https://api.github.com/repos/{repo['full_name']}"
+    user_api = f"https://api.github.com/users/{repo['owner']['login']}"
+    body["owner"] = {
+        **repo["owner"],
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{repo['owner']['id']}?v=4",
+        "gravatar_id": "", "url": user_api, "html_url": f"https://github.com/{repo['owner']['login']}",
+        **{key: user_api + suffix for key, suffix in _OWNER_URL_FIELDS},
+        "user_view_type": "public", "site_admin": False,
+    }
+    body["url"] = api
+    body.update((key, api + suffix) for key, suffix in _REPO_URL_FIELDS)
+    body.update({
+        "git_url": f"git://github.com/{repo['full_name']}.git",
+        "ssh_url": f"git@github.com:{repo['full_name']}.git",
+        "clone_url": f"{repo['html_url']}.git", "svn_url": repo["html_url"], "homepage": None,
+        "has_issues": True, "has_projects": True, "has_downloads": True, "has_wiki": True,
+        "has_pages": False, "has_discussions": False, "mirror_url": None, "disabled": False, "license": None,
+        "allow_forking": True, "is_template": False, "web_commit_signoff_required": False,
+        "visibility": "public", "forks": repo["forks_count"], "open_issues": repo["open_issues_count"],
+        "watchers": repo["watchers_count"], "score": 1.0,
+    })
+    return body
+
+
+_WORDS_CACHE: Dict[int, str] = {}
+
+
+def _words(repo: Dict[str, Any]) -> str:
+    """name / description / topics 的小写词序列（前后补空格，按词匹配用；name / description / topics 不会变，按 id 缓存）"""
+    words = _WORDS_CACHE.get(repo["id"])
+    if words is None:
+        words = _WORDS_CACHE[repo["id"]] = " " + " ".join(re.findall(r"[a-z0-9]+", " ".join(
+            [repo["name"], repo["description"] or ""] + repo["topics"]).lower())) + " "
+    return words
+
+
+def _query_filter(query: str):
+    """
+    解析 q，返回仓库过滤函数（每个请求解析一次）：
+    按 created / size / stars 限定词过滤，再应用 fork / archived / owner / NOT 排除与关键词
+    """
+    created = re.search(r"created:(\S+)\.\.(\S+)", query)
+    after = re.search(r"created:>(\d{4}-\d{2}-\d{2})(?:\s|$)", query)
+    # 只按完整时间戳过滤 pushed（增量刷新）；按天的 pushed:>YYYY-MM-DD 忽略，合成仓库没有提交历史
+    pushed = re.search(r"pushed:>(\d{4}-\d{2}-\d{2}T\S+)", query)
+    bounds = []
+    for qualifier, field in (("size", "size"), ("stars", "stargazers_count")):
+        match = re.search(rf"\b{qualifier}:(\d+)\.\.(\d+)", query)
+        if match:
+            bounds.append((field, int(match.group(1)), int(match.group(2))))
+    no_forks = "fork:false" in query
+    no_archived = "archived:false" in query
+    excluded_owners = {o.lower() for o in re.findall(r"-(?:user|org):(\S+)", query)}
+    # 关键词按词匹配 name / description / topics（与 GitHub 默认搜索范围一致）：NOT 排除，其余全部命中
+    not_pattern = r'\bNOT\s+(?:"([^"]+)"|(\S+))'
+    excluded_words = [f" {(phrase or word).lower()} " for phrase, word in re.findall(not_pattern, query)]
+    keywords = [f" {t.lower()} " for t in re.sub(not_pattern, " ", query).split()
+                if ":" not in t and not t.startswith("-")]
+
+    def matches(repo: Dict[str, Any]) -> bool:
+        if created and not (created.group(1) <= repo["created_at"] <= created.group(2)):
+            return False
+        if after and not repo["created_at"][:10] > after.group(1):
+            return False
+        if pushed and not repo["pushed_at"] > pushed.group(1):
+            return False
+        for field, lo, hi in bounds:
+            if not lo <= repo[field] <= hi:
+                return False
+        if (no_forks and repo["fork"]) or (no_archived and repo["archived"]):
+            return False
+        if repo["owner"]["login"].lower() in excluded_owners:
+            return False
+        if excluded_words or keywords:
+            words = _words(repo)
+            if any(word in words for word in excluded_words):
+                return False
+            if not all(word in words for word in keywords):
+                return False
+        return True
+
+    return matches
+
+
+class MockGitHubHandler(BaseHTTPRequestHandler):
+    server_version = "MockGitHub/1.0"
+    protocol_version = "HTTP/1.1"
+    # 响应头和正文分两次写出，keep-alive 连接上 Nagle + 延迟 ACK 会让每个请求多等约 40ms
+    disable_nagle_algorithm = True
+
+    @property
+    def mock(self) -> MockGitHub:
+        return self.server.mock
+
+    def log_message(self, format, *args):
+        pass
+
+    def _limited(self, resource: str) -> bool:
+        """
+        先按 faults 抽签注入故障，再扣配额；注入故障或被限流时直接返回错误响应
+        （计入 injected_* / rate_limited / secondary_limited）
+        """
+        fault = self.mock.faults.draw() if self.mock.faults else None
+        if fault:
+            name, status, self.quota_headers, body = fault
+            self.mock.count(name)
+            self._send(status, body, resource)
+            return True
+        token = self.headers.get("Authorization", "").rpartition(" ")[2]
+        status, self.quota_headers = self.mock.take(token, resource)
+        if status == 200:
+            return False
+        if "Retry-After" in self.quota_headers:
+            self.mock.count("secondary_limited")
+            self._send(403, {"message": "You have exceeded a secondary rate limit."}, resource)
+        else:
+            self.mock.count("rate_limited")
+            self._send(403, {"message": "API rate limit exceeded."}, resource)
+        return True
+
+    def _send(self, status: int, body: Any, resource: str = "core",
+              content_type: str = "application/json", extra_headers: Optional[dict] = None) -> None:
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        etag = None
+        if self.command == "GET" and status == 200:
+            etag = f'"{hashlib.sha1(payload).hexdigest()[:20]}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.mock.count("not_modified")
+                status, payload = 304, b""
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        quota_headers = getattr(self, "quota_headers", None) or \
+            {**UNLIMITED_HEADERS, "X-RateLimit-Reset": str(int(time.time()) + 3600)}
+        for key, value in quota_headers.items():
+            self.send_header(key, value)
+        self.send_header("X-RateLimit-Resource", resource)
+        for key, value in (extra_headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        time.sleep(self.mock.latency)
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = url.path.rstrip("/")
+        self.quota_headers = None
+        if path != "/rate_limit" and self._limited("search" if path.startswith("/search/") else "core"):
+            return
+
+        if path == "/search/repositories":
+            return self._search(params)
+        if path == "/rate_limit":
+            self.mock.count("rate_limit")
+            reset = int(time.time()) + 3600
+            bucket = {"limit": 1000000, "remaining": 999999, "reset": reset, "used": 1}
+            return self._send(200, {"resources": {"core": bucket, "search": bucket}, "rate": bucket})
+
+        match = re.fullmatch(r"/repos/([^/]+)/([^/]+)(/readme|/topics)?", path)
+        if match:
+            full_name = f"{match.group(1)}/{match.group(2)}"
+            repo = self.mock.by_name.get(full_name)
+            if repo is None:
+                return self._send(404, {"message": "Not Found"})
+            if match.group(3) == "/readme":
+                return self._readme(repo)
+            if match.group(3) == "/topics":
+                self.mock.count("topics")
+                return self._send(200, {"names": repo["topics"]})
+            self.mock.count("repo")
+            return self._send(200, _public(repo))
+
+        match = re.fullmatch(r"/users/([^/]+)", path)
+        if match:
+            self.mock.count("user")
+            return self._send(200, {"login": match.group(1), "id": 1, "type": "User"})
+
+        self._send(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        time.sleep(self.mock.latency)
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        self.quota_headers = None
+        if urlparse(self.path).path.rstrip("/") != "/graphql":
+            return self._send(404, {"message": "Not Found"})
+        if self._limited("graphql"):
+            return
+
+        self.mock.count("graphql")
+        nodes = []
+        for node_id in (body.get("variables") or {}).get("ids", []):
+            repo = self.mock.by_node_id.get(node_id)
+            if repo is None:
+                nodes.append(None)
+                continue
+            node = {
+                "id": repo["node_id"],
+                "databaseId": repo["id"],
+                "nameWithOwner": repo["full_name"],
+                "stargazerCount": repo["stargazers_count"],
+                "owner": {"__typename": repo["owner"]["type"], "login": repo["owner"]["login"]},
+                "repositoryTopics": {"nodes": [{"topic": {"name": t}} for t in repo["topics"]]},
+                "readme0": {"text": readme_text(repo), "isBinary": False} if repo["has_readme"] else None,
+                "rootTree": {"entries": [{"name": "README.md"}] if repo["has_readme"] else [{"name": "src"}]},
+            }
+            nodes.append(node)
+        reset_at = datetime.utcfromtimestamp(time.time() + 3600).strftime("%Y-%m-%dT%H:%M:%SZ")
+        data = {"nodes": nodes, "rateLimit": {"cost": 1, "remaining": 4999, "resetAt": reset_at}}
+        self._send(200, {"data": data}, resource="graphql")
+
+    def _search(self, params: Dict[str, str]) -> None:
+        self.mock.count("search")
+        query = params.get("q", "")
+        match = re.search(r"created:(>?)(\d{4}-\d{2}-\d{2})\S*?(?:\.\.(\d{4}-\d{2}-\d{2})\S*)?(?:\s|$)", query)
+        repos = []
+        if match:
+            day = datetime.strptime(match.group(2), "%Y-%m-%d")
+            last = datetime.strptime(match.group(3) or match.group(2), "%Y-%m-%d")
+            if match.group(1):
+                day, last = day + timedelta(days=1), datetime.now()
+            while day <= last:
+                repos += self.mock.repos_for_day(day.strftime("%Y-%m-%d"))
+                day += timedelta(days=1)
+        repos = list(filter(_query_filter(query), repos))
+        per_page = int(params.get("per_page", 30))
+        page = int(params.get("page", 1))
+        capped = repos[:1000]
+        items = [_public(r) for r in capped[(page - 1) * per_page: page * per_page]]
+
+        headers = {}
+        last_page = max(1, -(-len(capped) // per_page))
+        if page < last_page:
+            base = f"http://{self.headers.get('Host')}/search/repositories"
+            next_params = dict(params, page=page + 1)
+            last_params = dict(params, page=last_page)
+            headers["Link"] = (f'<{base}?{urlencode(next_params)}>; rel="next", '
+                               f'<{base}?{urlencode(last_params)}>; rel="last"')
+
+        body = {"total_count": len(repos), "incomplete_results": False, "items": items}
+        self._send(200, body, resource="search", extra_headers=headers)
+
+    def _readme(self, repo: Dict[str, Any]) -> None:
+        self.mock.count("readme")
+        if not repo["has_readme"]:
+            return self._send(404, {"message": "Not Found"})
+        text = readme_text(repo)
+        if "raw" in self.headers.get("Accept", ""):
+            return self._send(200, text.encode("utf-8"), content_type="text/plain; charset=utf-8")
+        body = {
+            "type": "file",
+            "encoding": "base64",
+            "name": "README.md",
+            "path": "README.md",
+            "size": len(text.encode("utf-8")),
+            "sha": f"{repo['id']:040x}"[-40:],
+            "content": base64.b64encode(text.encode("utf-8")).decode("ascii"),
+            "html_url": f"{repo['html_url']}/blob/main/README.md",
+        }
+        self._send(200, body)
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    # 默认 listen backlog 只有 5，并发引擎同时建连时会被丢弃 SYN，触发 1 秒重传
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address):
+        # 客户端丢弃未读完的限流响应时会重置连接，不打印堆栈
+        if not isinstance(sys.exc_info()[1], ConnectionResetError):
+            super().handle_error(request, client_address)
+
+
+class MockGitHubServer:
+    """在后台线程中运行 mock 服务器（handler 可换成录制代理 / 回放处理器，见 github_replay）"""
+
+    def __init__(self, mock: Optional[MockGitHub] = None, host: str = "127.0.0.1", port: int = 0,
+                 handler=MockGitHubHandler):
+        self.mock = mock or MockGitHub()
+        self.httpd = _MockHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self.mock
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockGitHubServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    server = MockGitHubServer(port=DEFAULT_PORT)
+    print(f"[Mock GitHub] {datetime.now():%H:%M:%S} 监听 {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[Mock GitHub] 已停止")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vibe Coding 项目爬虫 - 异步并发引擎
+
+核心特性：
+- 基于 asyncio + aiohttp，搜索分页与 README 下载同时在途
+- 超过 1000 条的切片拆分后，子切片并发爬取
+- 全局信号量限制同时在途的请求数 (MAX_IN_FLIGHT)
+- 与同步引擎共用 TokenPool：按 token 读取 X-RateLimit-* 响应头，请求路由到余量最多的 token，全部耗尽才等待重置；
+  配额不足时按池预约的发送时刻匀速发送，次级速率限制只暂停触发它的 token，退避带随机抖动
+- topics / owner 直接取自搜索结果（转成 RepoItem），每个仓库只有 README 一次请求
+- 每次尝试的耗时、状态码与重试记入与同步引擎相同的 Telemetry
+- 复用 VibeCodingCrawler 的过滤、抽样、落盘与统计逻辑，run() 可直接替换
+
+用法：
+    python async_crawl_engine.py
+"""
+
+import asyncio
+import json
+import math
+import time
+from dataclasses import replace
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+
+import aiohttp
+
+import vibe_coding_crawler as vcc
+from vibe_coding_crawler import VibeCodingCrawler, GITHUB_TOKENS, build_repo_record
+from slice_planner import Slice, SEARCH_RESULT_CAP
+from http_cache import cache_key
+from repo_item import RepoItem
+from github_client import backoff_delay, secondary_limit_wait
+
+# ========== 并发配置 ==========
+MAX_IN_FLIGHT = 16        # 同时在途的最大请求数
+REQUEST_TIMEOUT = 30      # 单个请求超时(秒)
+MAX_RETRIES = 3           # 网络错误 / 5xx 的最大重试次数
+
+
+class AsyncVibeCodingCrawler(VibeCodingCrawler):
+    """异步并发版爬虫，过滤/抽样/落盘逻辑与 VibeCodingCrawler 完全一致"""
+
+    def __init__(self, tokens, max_in_flight: int = MAX_IN_FLIGHT):
+        super().__init__(tokens)
+        self.max_in_flight = max_in_flight
+        self.pool = self.client.pool
+        self.pending = 0        # 已通过抽样、README 尚在下载中的仓库数
+        self.semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _get(self, session: aiohttp.ClientSession, url: str, endpoint: str,
+                   params: Optional[dict] = None, raw: bool = False) -> Tuple[Optional[int], Any]:
+        """
+        带配额控制与重试的 GET 请求，endpoint 用于统计 HTTP 调用数
+        返回: (状态码, JSON 或文本)；多次失败返回 (None, None)
+        """
+        resource = "search" if endpoint == "search" else "core"
+        accept = "application/vnd.github.raw" if raw else "application/vnd.github+json"
+        key = cache_key(url, params, accept) if self.http_cache is not None else None
+
+        attempt = 0
+        while attempt < MAX_RETRIES:
+            token, wait = self.pool.pick(resource)
+            if token is None and wait > 0:
+                # 池中所有 token 都已耗尽或暂停
+                self.pool.note_wait(resource, wait)
+                await asyncio.sleep(wait)
+                continue
+            if wait > 0:
+                # 匀速：等到预约的发送时刻（在信号量之外，不占用并发名额）
+                await asyncio.sleep(wait)
+            headers = {"Accept": accept}
+            if token:
+                headers["Authorization"] = f"token {token}"
+            conditional = self.http_cache.lookup(key) if key else None
+            if conditional:
+                headers.update(conditional)
+
+            retry_after = None
+            async with self.semaphore:
+                self.stats["http_calls"][endpoint] += 1
+                start = time.perf_counter()
+                status = None
+                try:
+                    async with session.get(url, params=params, headers=headers) as resp:
+                        status = resp.status
+                        if token:
+                            self.pool.update(token, resource, resp.headers)
+
+                        if key and resp.status == 304:
+                            cached = self.http_cache.hit(key)
+                            if cached is not None:
+                                body = cached[1].decode("utf-8", errors="ignore")
+                                return 200, body if raw else json.loads(body)
+                            # 缓存条目已被淘汰（或代理对无条件请求也回 304）：计入重试次数，避免无限循环
+                            self.telemetry.retry(endpoint)
+                            attempt += 1
+                            continue
+                        if resp.status in (403, 429):
+                            if resp.headers.get("X-RateLimit-Remaining") == "0" and token:
+                                # 主速率限制：该 token 到重置前不再使用，立即换下一个（计入重试次数）
+                                reset_at = float(resp.headers.get("X-RateLimit-Reset", time.time() + 60))
+                                self.pool.exhaust(token, resource, reset_at)
+                                self.telemetry.retry(endpoint)
+                                attempt += 1
+                                continue
+                            if "Retry-After" in resp.headers:
+                                # 次级速率限制
+                                retry_after = secondary_limit_wait(resp.headers, attempt)
+                            elif resp.status == 403:
+                                return resp.status, None
+                        elif 400 <= resp.status < 500:
+                            # 其余客户端错误（404、422 超出搜索结果上限等）重试也不会成功，与同步客户端一样直接返回
+                            return resp.status, None
+                        elif resp.status < 500:
+                            payload = await resp.read()
+                            body = payload.decode("utf-8", errors="ignore")
+                            if not raw:
+                                try:
+                                    body = json.loads(body)
+                                except ValueError:
+                                    # 正文不是 JSON（如代理返回的错误页）：与 get_json 一样按失败处理
+                                    return resp.status, None
+                            if key and resp.status == 200:
+                                self.http_cache.store(key, resp.headers, payload)
+                            return resp.status, body
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    pass
+                finally:
+                    self.telemetry.observe(endpoint, time.perf_counter() - start, status)
+
+            self.telemetry.retry(endpoint)
+            attempt += 1
+            if retry_after is not None and token:
+                # 次级速率限制：暂停这个 token，下一次尝试换 token 或在 pick 处等待
+                self.pool.pause(token, retry_after)
+                continue
+            # 退避放在信号量之外，不占用并发名额
+            await asyncio.sleep(retry_after or backoff_delay(attempt))
+
+        self.telemetry.fail(endpoint)
+        return None, None
+
+    async def _search_page(self, session: aiohttp.ClientSession, query: str, page: int,
+                           per_page: int = vcc.SEARCH_PER_PAGE) -> Optional[dict]:
+        """获取一页搜索结果"""
+        params = {
+            "q": query,
+            "sort": "updated",
+            "order": "desc",
+            "per_page": per_page,
+            "page": page,
+        }
+        status, data = await self._get(session, f"{vcc.GITHUB_API_URL}/search/repositories", "search", params)
+        return data if status == 200 else None
+
+    async def _fetch_readme(self, session: aiohttp.ClientSession, full_name: str) -> Optional[str]:
+        """获取 README 原文，失败返回 None"""
+        status, text = await self._get(session, f"{vcc.GITHUB_API_URL}/repos/{full_name}/readme", "readme", raw=True)
+        return text if status == 200 else None
+
+    async def _enrich_and_save(self, session: aiohttp.ClientSession, item: RepoItem, tier: str) -> bool:
+        """下载 README 并落盘，返回是否成功保存"""
+        try:
+            readme_content = await self._fetch_readme(session, item.full_name)
+        finally:
+            self.pending -= 1
+
+        if readme_content is not None:
+            self.stats["readme_success"] += 1
+        else:
+            self.stats["readme_failed"] += 1
+
+        # 总量熔断
+        if self.total_saved >= vcc.TARGET_TOTAL:
+            return False
+
+        repo_data = build_repo_record(item, tier, readme_content)
+        self.save_repo(repo_data)
+
+        if tier == "silent":
+            self.stats["tier1_silent"] += 1
+        else:
+            self.stats["tier2_signal"] += 1
+        return True
+
+    async def _plan_sampling_async(self, session: aiohttp.ClientSession, root: Slice, date_str: str) -> None:
+        """按天配额：各层 total_count 并发读取（续传时沿用断点中的值）"""
+        if not self.sampler.quota_tiers():
+            return
+        totals = self.checkpoint.get_sample_plan(date_str)
+        if totals is not None:
+            self.sampler.plan_day(date_str, totals)
+            return
+        queries = self.tier_probe_queries(root)
+        pages = await asyncio.gather(*(self._search_page(session, q, 1, per_page=1) for q in queries.values()))
+        if any(page is None for page in pages):
+            print(f"  [{date_str}] 抽样配额探测出错")
+            return
+        self.apply_sample_plan(date_str, {tier: page.get("total_count", 0)
+                                          for tier, page in zip(queries, pages)})
+
+    async def search_repos_for_day_async(self, session: aiohttp.ClientSession, date: datetime) -> int:
+        """
+        搜索某一天的仓库（根切片超过 1000 条时自适应拆分）
+        返回: 当天保存的数量
+        """
+        date_str = date.strftime('%Y-%m-%d')
+        print(f"\n[{date_str}] 开始搜索...")
+        root = self.root_slice(date)
+        # 配额阈值需在第一条结果抽样前确定
+        await self._plan_sampling_async(session, root, date_str)
+        if not self.needs_pushdown_probe(root):
+            return await self.crawl_slice_async(session, root, date_str)
+
+        # 未下推的 total_count 与当天的爬取并发获取，不增加延迟
+        base, saved = await asyncio.gather(
+            self._search_page(session, replace(root, exclusions="").query, 1, per_page=1),
+            self.crawl_slice_async(session, root, date_str),
+        )
+        node = self.slices.get(root)
+        if base is not None and node is not None:
+            self.record_pushdown(base.get("total_count", 0), node["total"])
+        return saved
+
+    async def crawl_slice_async(self, session: aiohttp.ClientSession, slice_: Slice, date_str: str) -> int:
+        """
+        爬取一个切片：先取第 1 页拿到 total_count，超过上限则拆分并发爬取子切片；
+        否则其余分页与 README 下载并发进行
+        返回: 保存的数量
+        """
+        node = self.slices.get(slice_)
+        if node and node["status"] == "done":
+            self.stats["slices"]["skipped"] += 1
+            return 0
+        if node and node["status"] == "split":
+            return await self.crawl_children_async(session, slice_, node["total"],
+                                                   self.slices.children(slice_), date_str)
+
+        first = await self._search_page(session, slice_.query, 1)
+        if first is None:
+            print(f"  [{date_str}] 切片 {slice_.label} 搜索出错，跳过")
+            return 0
+        self.stats["slices"]["probed"] += 1
+
+        total = first.get("total_count", 0)
+        if total > SEARCH_RESULT_CAP:
+            children = self.slices.split(slice_, total)
+            if children:
+                self.stats["slices"]["split"] += 1
+                print(f"  [{date_str}] 切片 {slice_.label} 共 {total} 条，拆分为 {len(children)} 个子切片")
+                return await self.crawl_children_async(session, slice_, total, children, date_str)
+            self.stats["slices"]["capped"] += 1
+            print(f"  [{date_str}] 切片 {slice_.label} 无法再拆分，只能获取前 {SEARCH_RESULT_CAP}/{total} 条")
+
+        pages = math.ceil(min(total, SEARCH_RESULT_CAP) / vcc.SEARCH_PER_PAGE)
+        page_tasks = [
+            asyncio.create_task(self._search_page(session, slice_.query, page))
+            for page in range(2, pages + 1)
+        ]
+
+        readme_tasks: List[asyncio.Task] = []
+        slice_scanned = 0
+        complete = True
+
+        def schedule(items: List[Dict[str, Any]]) -> None:
+            nonlocal slice_scanned, complete
+            for raw in items:
+                # 总量熔断：已保存 + 下载中 达到目标后不再发起 README 请求
+                if self.total_saved + self.pending >= vcc.TARGET_TOTAL:
+                    complete = False
+                    return
+                item = RepoItem.from_search(raw)
+                tier = self._select(item)
+                slice_scanned += 1
+                if tier is None:
+                    continue
+                self.pending += 1
+                readme_tasks.append(asyncio.create_task(self._enrich_and_save(session, item, tier)))
+
+        schedule(first.get("items", []))
+        for next_page in asyncio.as_completed(page_tasks):
+            data = await next_page
+            if data:
+                schedule(data.get("items", []))
+            else:
+                complete = False
+            print(f"  [{date_str}] 扫描: {slice_scanned} | 下载中: {self.pending} | 总进度: {self.total_saved}/{vcc.TARGET_TOTAL}")
+
+        results = await asyncio.gather(*readme_tasks)
+        if complete and self.total_saved < vcc.TARGET_TOTAL:
+            self.slices.mark_done(slice_, total, capped=total > SEARCH_RESULT_CAP)
+            self.stats["slices"]["done"] += 1
+        return sum(1 for saved in results if saved)
+
+    async def crawl_children_async(self, session: aiohttp.ClientSession, parent: Slice, total: int,
+                                   children: List[Slice], date_str: str) -> int:
+        """并发爬取子切片，全部完成后把父切片也标记为完成"""
+        results = await asyncio.gather(*(self.crawl_slice_async(session, c, date_str) for c in children))
+        if all(self.slices.is_done(child) for child in children):
+            self.slices.mark_done(parent, total)
+        return sum(results)
+
+    async def run_async(self) -> None:
+        """异步主流程"""
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight)
+
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            for current_date in self.crawl_days():
+                if self.total_saved >= vcc.TARGET_TOTAL:
+                    break
+                if self.slices.is_done(self.root_slice(current_date)):
+                    self.stats["slices"]["skipped"] += 1
+                    continue
+
+                day_saved = await self.search_repos_for_day_async(session, current_date)
+                self.stats["days_scanned"] += 1
+
+                if day_saved > 0:
+                    print(f"  [{current_date.strftime('%Y-%m-%d')}] 当日保存: {day_saved} 个")
+
+        if self.total_saved >= vcc.TARGET_TOTAL:
+            print(f"\n[完成] 已达到目标数量 {vcc.TARGET_TOTAL}，停止爬取")
+
+    def run(self) -> None:
+        """主流程（异步引擎），可直接替换 VibeCodingCrawler.run"""
+        self.print_banner()
+        print(f"并发引擎: asyncio，最大在途请求 {self.max_in_flight}")
+        print("="*70)
+
+        if not self.tokens:
+            print("[错误] 未设置 GITHUB_TOKENS / GITHUB_TOKEN 环境变量")
+            return
+
+        self.load_existing_data()
+
+        if self.total_saved >= vcc.TARGET_TOTAL:
+            print(f"[完成] 已存在 {self.total_saved} 个仓库，达到目标数量")
+            self.print_final_stats()
+            return
+
+        self.start_telemetry()
+        asyncio.run(self.run_async())
+        self.checkpoint.commit()
+
+        print("\n" + "="*70)
+        print("[爬取完成]")
+        print("="*70)
+        self.print_final_stats()
+
+
+def main():
+    crawler = AsyncVibeCodingCrawler(GITHUB_TOKENS)
+    try:
+        crawler.run()
+    except KeyboardInterrupt:
+        print("\n\n[中断] 用户手动停止")
+        crawler.print_final_stats()
+    except Exception as e:
+        print(f"\n[错误] {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        crawler.close()
+
+
+if __name__ == "__main__":
+    main()
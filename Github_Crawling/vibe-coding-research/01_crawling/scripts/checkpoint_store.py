@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+断点续传索引 - JSONL 数据集旁的 SQLite 小文件
+
+记录内容：
+- repos:  已保存仓库的 id 及其在 JSONL 中的字节偏移（id 主键索引，查重无需把全部 id 载入内存）
+- slices: 搜索切片树（total_count / split / done / 子切片），续传时跳过已完成的切片
+- meta:   已建立索引的 JSONL 字节数；按天抽样配额用到的各层 total_count（sampler.plan_day）；
+          增量刷新的起点 last_run 与被新版本取代的旧记录数 stale_records（见 delta_crawl）
+
+新记录的索引行在 commit() 时才提交；commit 前先调用 before_commit（通常是把 JSONL 缓冲 fsync 到磁盘），
+保证索引中出现的 id 一定已经落盘。
+
+多线程（流水线爬虫）共用一个连接，所有操作经 self.lock（可重入）串行；
+写 JSONL 与 add_repo 需在同一把锁内完成，commit 也在锁内先落盘再提交，索引不会领先于数据。
+
+启动时只需比较 JSONL 文件大小与已索引字节数：
+- 相等：直接续传，不读取 JSONL
+- 变大：只扫描未索引的尾部（例如上次写入后、提交索引前被中断）；末尾不完整的一行截掉，不计入索引
+- 变小：文件被替换，全量重建索引
+
+增量刷新把仓库的新版本追加到 JSONL 末尾并用 update_repo 把索引指向它；compact_jsonl 再把每个仓库的
+最新版本写回它首次出现的位置，去掉旧版本。
+"""
+
+import json
+import os
+import re
+import sqlite3
+from threading import RLock
+from typing import Optional, Callable, Dict, Any
+
+# json.dump 写出的第一个字段就是 id，重建索引时优先用正则取 id，避免解析整条 README
+_ID_PREFIX = re.compile(rb'^\{"id":\s*(\d+)')
+
+
+class CheckpointStore:
+    """SQLite 断点续传存储"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.before_commit: Optional[Callable[[], None]] = None
+        self.lock = RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS repos (
+                id      INTEGER PRIMARY KEY,
+                offset  INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS slices (
+                key      TEXT PRIMARY KEY,
+                total    INTEGER NOT NULL,
+                status   TEXT NOT NULL,
+                capped   INTEGER NOT NULL DEFAULT 0,
+                children TEXT
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key   TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    # ========== 仓库索引 ==========
+
+    def has_repo(self, repo_id: int) -> bool:
+        with self.lock:
+            row = self.conn.execute("SELECT 1 FROM repos WHERE id = ?", (repo_id,)).fetchone()
+        return row is not None
+
+    def repo_count(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM repos").fetchone()[0]
+
+    def repo_offset(self, repo_id: int) -> Optional[int]:
+        """仓库最新版本在 JSONL 中的字节偏移；不存在时返回 None"""
+        with self.lock:
+            row = self.conn.execute("SELECT offset FROM repos WHERE id = ?", (repo_id,)).fetchone()
+        return row[0] if row else None
+
+    def add_repo(self, repo_id: int, offset: int, end_offset: int) -> None:
+        """记录一条已写入的仓库（下次 commit 时提交）；end_offset 为写入后的 JSONL 字节数"""
+        with self.lock:
+            self.conn.execute("INSERT OR IGNORE INTO repos (id, offset) VALUES (?, ?)", (repo_id, offset))
+            self._set_meta("indexed_bytes", str(end_offset))
+
+    def update_repo(self, repo_id: int, offset: int, end_offset: int) -> None:
+        """已有仓库的新版本追加到了 offset 处：索引改指新版本，旧版本计为待压缩"""
+        with self.lock:
+            self.conn.execute("UPDATE repos SET offset = ? WHERE id = ?", (offset, repo_id))
+            self._set_meta("indexed_bytes", str(end_offset))
+            self._set_meta("stale_records", str(self.stale_count() + 1))
+
+    def stale_count(self) -> int:
+        """JSONL 中已被新版本取代、等待 compact_jsonl 去掉的记录数"""
+        with self.lock:
+            return int(self._get_meta("stale_records") or 0)
+
+    def commit(self) -> None:
+        """断点：先让数据落盘，再提交索引"""
+        with self.lock:
+            if self.before_commit:
+                self.before_commit()
+            self.conn.commit()
+
+    def sync_with_jsonl(self, jsonl_path: str) -> int:
+        """
+        让索引追上 JSONL 文件，只扫描未索引的部分
+        返回: 新索引的记录数
+        """
+        if not os.path.exists(jsonl_path):
+            return 0
+
+        file_size = os.path.getsize(jsonl_path)
+        indexed = int(self._get_meta("indexed_bytes") or 0)
+        if file_size == indexed:
+            return 0
+        stale = self.stale_count()
+        if file_size < indexed:
+            # 文件被替换或截断，全量重建
+            self.conn.execute("DELETE FROM repos")
+            indexed = stale = 0
+
+        added = 0
+        with open(jsonl_path, 'rb+') as f:
+            f.seek(indexed)
+            offset = indexed
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # 末尾未写完整的行（写入中途被中断）：截掉，该仓库下次重新爬取，续写也不会接在半行后面
+                    f.truncate(offset)
+                    print(f"[Resume] JSONL 末尾有 {len(line)} 字节未写完整的记录，已截掉")
+                    break
+                repo_id = self.extract_id(line)
+                if repo_id is not None:
+                    cursor = self.conn.execute(
+                        "INSERT OR IGNORE INTO repos (id, offset) VALUES (?, ?)", (repo_id, offset))
+                    if cursor.rowcount:
+                        added += 1
+                    else:
+                        # 同一仓库出现多次（增量刷新追加的新版本）：后出现的是新版本
+                        self.conn.execute("UPDATE repos SET offset = ? WHERE id = ?", (offset, repo_id))
+                        stale += 1
+                offset += len(line)
+
+        self._set_meta("indexed_bytes", str(offset))
+        self._set_meta("stale_records", str(stale))
+        self.conn.commit()
+        return added
+
+    def compact_jsonl(self, jsonl_path: str) -> int:
+        """
+        去掉被新版本取代的旧记录：每个仓库的最新版本写到它首次出现的位置（记录顺序不变），重建偏移
+        写入临时文件后原子替换；替换后、提交索引前中断时文件变小，下次 sync_with_jsonl 会全量重建
+        调用前需关闭 JSONL 的写入句柄（RecordSink.close）
+        返回: 去掉的记录数
+        """
+        with self.lock:
+            if not self.stale_count():
+                return 0
+            latest = dict(self.conn.execute("SELECT id, offset FROM repos"))
+            tmp_path = jsonl_path + ".compact"
+            offsets = []
+            written = set()
+            dropped = 0
+            with open(jsonl_path, 'rb') as src, open(jsonl_path, 'rb') as reader, open(tmp_path, 'wb') as dst:
+                offset = 0
+                for line in src:
+                    line_offset, offset = offset, offset + len(line)
+                    repo_id = self.extract_id(line)
+                    if repo_id is not None:
+                        if repo_id in written:
+                            dropped += 1
+                            continue
+                        written.add(repo_id)
+                        newest = latest.get(repo_id, line_offset)
+                        if newest != line_offset:
+                            reader.seek(newest)
+                            line = reader.readline()
+                        offsets.append((repo_id, dst.tell()))
+                    dst.write(line)
+                dst.flush()
+                os.fsync(dst.fileno())
+                end_offset = dst.tell()
+            os.replace(tmp_path, jsonl_path)
+
+            self.conn.execute("DELETE FROM repos")
+            self.conn.executemany("INSERT INTO repos (id, offset) VALUES (?, ?)", offsets)
+            self._set_meta("indexed_bytes", str(end_offset))
+            self._set_meta("stale_records", "0")
+            self.conn.commit()
+        return dropped
+
+    @staticmethod
+    def extract_id(line: bytes) -> Optional[int]:
+        """取一行 JSONL 记录的 id（分片合并也用它去重）"""
+        match = _ID_PREFIX.match(line)
+        if match:
+            return int(match.group(1))
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            return json.loads(line).get('id')
+        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+            return None
+
+    # ========== 切片树 ==========
+
+    def get_slice(self, key: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT total, status, capped, children FROM slices WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        total, status, capped, children = row
+        node = {"total": total, "status": status, "capped": bool(capped)}
+        if children:
+            node["children"] = json.loads(children)
+        return node
+
+    def put_slice(self, key: str, node: Dict[str, Any]) -> None:
+        children = node.get("children")
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO slices (key, total, status, capped, children) VALUES (?, ?, ?, ?, ?)",
+                (key, node["total"], node["status"], int(node.get("capped", False)),
+                 json.dumps(children) if children else None),
+            )
+            self.commit()
+
+    # ========== 抽样计划 ==========
+
+    def get_sample_plan(self, day: str) -> Optional[Dict[str, int]]:
+        """某天各层的 total_count；续传时沿用首次记录的值，抽样阈值不随重跑漂移"""
+        with self.lock:
+            value = self._get_meta(f"sample_plan:{day}")
+        return json.loads(value) if value else None
+
+    def put_sample_plan(self, day: str, totals: Dict[str, int]) -> None:
+        with self.lock:
+            self._set_meta(f"sample_plan:{day}", json.dumps(totals))
+            self.commit()
+
+    # ========== 增量刷新 ==========
+
+    def get_last_run(self) -> Optional[str]:
+        """增量刷新的起点（UTC，2026-02-10T08:00:00Z）：索引中所有记录至少是这个时间的版本"""
+        with self.lock:
+            return self._get_meta("last_run")
+
+    def put_last_run(self, timestamp: str) -> None:
+        with self.lock:
+            self._set_meta("last_run", timestamp)
+            self.commit()
+
+    # ========== 元数据 ==========
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self) -> None:
+        with self.lock:
+            self.commit()
+            self.conn.close()
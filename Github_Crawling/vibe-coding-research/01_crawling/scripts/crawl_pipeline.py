@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分阶段流水线 - 线程 + 有界队列，各阶段并发独立设置
+
+    输入 -> [stage 1] -队列-> [stage 2] -队列-> ... -> [stage N]
+
+- 每个阶段有自己的输入队列 (queue_size) 和工作线程数 (workers)；handler(输入, emit) 处理一条输入，
+  emit(输出) 把结果放进下一阶段的队列，下游队列满时阻塞（背压），阻塞时间计入该阶段的统计
+- 设置了 batch_size 的阶段一次取最多 batch_size 条输入（第一条到达后最多再等 linger 秒），handler 收到列表
+- 上游全部线程退出后才向下游发送结束信号，队列中剩余的输入都会被处理完
+- handler 抛出的异常只记录、不终止线程，避免流水线卡死
+- 运行期间定时采样各队列深度，结束后按阶段报告吞吐、忙碌率、队列深度与下游阻塞时间，忙碌率最高的阶段即瓶颈
+
+Ticket 用于"一组输入全部走完流水线后"的回调（例如切片内所有仓库落盘后才标记切片完成）：
+创建时持有 1 个计数，每派发一条输入 hold()，该输入在任意阶段结束时 release()，计数归零时回调 on_done(ok)。
+"""
+
+import time
+from queue import Queue, Empty
+from threading import Thread, Lock, Event, local
+from typing import Callable, Dict, Any, Iterable, List, Optional
+
+PIPELINE_QUEUE_SIZE = 256       # 每个阶段输入队列的默认容量
+PIPELINE_REPORT_INTERVAL = 10.0  # 进度行输出间隔(秒)
+PIPELINE_SAMPLE_INTERVAL = 0.2   # 队列深度采样间隔(秒)
+
+_STOP = object()
+
+
+class Ticket:
+    """一组下游工作的完成计数（线程安全）"""
+
+    def __init__(self, on_done: Callable[[bool], None]):
+        self.on_done = on_done
+        self.pending = 1
+        self.ok = True
+        self.lock = Lock()
+
+    def hold(self) -> None:
+        with self.lock:
+            self.pending += 1
+
+    def release(self, ok: bool = True) -> None:
+        with self.lock:
+            self.ok = self.ok and ok
+            self.pending -= 1
+            finished = self.pending == 0
+        if finished:
+            self.on_done(self.ok)
+
+
+class Stage:
+    """流水线的一个阶段"""
+
+    def __init__(self, name: str, handler: Callable[[Any, Callable[[Any], None]], None],
+                 workers: int = 1, queue_size: int = PIPELINE_QUEUE_SIZE,
+                 batch_size: Optional[int] = None, linger: float = 0.0):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.linger = linger
+        self.queue: Queue = Queue(queue_size)
+        self.next: Optional["Stage"] = None
+        self.lock = Lock()
+        self._local = local()  # 当前线程本次 handler 调用中的下游阻塞时间
+        self._alive = 0
+        self.stats = {
+            "processed": 0,      # 处理的输入条数
+            "emitted": 0,        # 交给下游的输出条数
+            "errors": 0,
+            "busy": 0.0,         # handler 累计耗时（不含下游阻塞）
+            "blocked": 0.0,      # 下游队列满、等待放入的累计时间（背压）
+            "depth_sum": 0,
+            "depth_max": 0,
+            "samples": 0,
+        }
+
+    def emit(self, output: Any) -> None:
+        """把输出交给下一阶段；下游队列满时阻塞"""
+        if self.next is None:
+            return
+        start = time.perf_counter()
+        self.next.queue.put(output)
+        waited = time.perf_counter() - start
+        self._local.blocked = getattr(self._local, "blocked", 0.0) + waited
+        with self.lock:
+            self.stats["emitted"] += 1
+            self.stats["blocked"] += waited
+
+    def _take(self) -> Any:
+        """取一条输入；批量阶段取最多 batch_size 条"""
+        first = self.queue.get()
+        if self.batch_size is None or first is _STOP:
+            return first
+        batch = [first]
+        deadline = time.perf_counter() + self.linger
+        while len(batch) < self.batch_size:
+            try:
+                remaining = deadline - time.perf_counter()
+                item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except Empty:
+                break
+            if item is _STOP:
+                # 结束信号放回队列，处理完这一批后再退出
+                self.queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _work(self) -> None:
+        while True:
+            work = self._take()
+            if work is _STOP:
+                break
+            count = 1 if self.batch_size is None else len(work)
+            self._local.blocked = 0.0
+            start = time.perf_counter()
+            try:
+                self.handler(work, self.emit)
+            except Exception as e:
+                with self.lock:
+                    self.stats["errors"] += 1
+                print(f"  [pipeline] {self.name} 出错: {e}")
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.stats["processed"] += count
+                self.stats["busy"] += elapsed - self._local.blocked
+        self._exit()
+
+    def _exit(self) -> None:
+        with self.lock:
+            self._alive -= 1
+            last = self._alive == 0
+        if last and self.next is not None:
+            for _ in range(self.next.workers):
+                self.next.queue.put(_STOP)
+
+    def start(self) -> List[Thread]:
+        self._alive = self.workers
+        threads = [Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+                   for i in range(self.workers)]
+        for t in threads:
+            t.start()
+        return threads
+
+    def sample(self) -> None:
+        depth = self.queue.qsize()
+        with self.lock:
+            self.stats["depth_sum"] += depth
+            self.stats["depth_max"] = max(self.stats["depth_max"], depth)
+            self.stats["samples"] += 1
+
+
+class Pipeline:
+    """按顺序串联的阶段"""
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+        for upstream, downstream in zip(stages, stages[1:]):
+            upstream.next = downstream
+        self.elapsed = 0.0
+        self._start: Optional[float] = None
+
+    def run(self, inputs: Iterable[Any], progress: Optional[Callable[[], str]] = None) -> None:
+        """把 inputs 送入第一阶段，运行到所有阶段处理完毕"""
+        threads = [t for stage in self.stages for t in stage.start()]
+        start = self._start = time.perf_counter()
+        done = Event()
+
+        def monitor():
+            last_report = time.perf_counter()
+            while not done.wait(PIPELINE_SAMPLE_INTERVAL):
+                for stage in self.stages:
+                    stage.sample()
+                if time.perf_counter() - last_report >= PIPELINE_REPORT_INTERVAL:
+                    last_report = time.perf_counter()
+                    depths = " | ".join(f"{s.name} 队列 {s.queue.qsize()}" for s in self.stages)
+                    print(f"  [pipeline] {depths}" + (f" | {progress()}" if progress else ""))
+
+        watcher = Thread(target=monitor, name="pipeline-monitor", daemon=True)
+        watcher.start()
+
+        first = self.stages[0]
+        for item in inputs:
+            first.queue.put(item)
+        for _ in range(first.workers):
+            first.queue.put(_STOP)
+        for t in threads:
+            t.join()
+
+        done.set()
+        watcher.join()
+        self.elapsed = time.perf_counter() - start
+
+    def report(self) -> List[Dict[str, Any]]:
+        """各阶段统计: 吞吐、忙碌率（忙碌时间 / 线程数 / 总时长）、当前 / 平均 / 最大队列深度；运行中按已运行时长计算"""
+        elapsed = self.elapsed
+        if not elapsed and self._start is not None:
+            elapsed = time.perf_counter() - self._start
+        rows = []
+        for stage in self.stages:
+            s = stage.stats
+            rows.append({
+                "stage": stage.name,
+                "workers": stage.workers,
+                "processed": s["processed"],
+                "emitted": s["emitted"],
+                "errors": s["errors"],
+                "throughput": s["processed"] / elapsed if elapsed > 0 else 0.0,
+                "utilization": s["busy"] / stage.workers / elapsed if elapsed > 0 else 0.0,
+                "blocked": s["blocked"],
+                "depth": stage.queue.qsize(),
+                "depth_avg": s["depth_sum"] / s["samples"] if s["samples"] else 0.0,
+                "depth_max": s["depth_max"],
+            })
+        return rows
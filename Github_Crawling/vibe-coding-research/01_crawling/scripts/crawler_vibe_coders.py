@@ -11,24 +11,45 @@
 - 包含 README 内容供人工/AI筛选
 """
 
-import requests
 import json
 import os
 import csv
 import base64
-import re
+import bisect
 import sys
+import time
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-import time
 from collections import Counter
+from threading import Lock
+from github_client import GitHubClient, load_tokens
+from http_cache import HttpCache
+from graphql_enricher import GraphQLEnricher, ENRICH_BATCH_SIZE
+from telemetry import Telemetry
+from crawl_pipeline import Pipeline, Stage
+from search_fanout import SearchFanout, SearchQuery, load_yields, save_yields
+from readme_cleaner import clean_readme
+from readme_style import detect_readme_style
 
 load_dotenv()
 sys.stdout.reconfigure(encoding='utf-8')
 
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
+GITHUB_TOKENS = load_tokens()  # GITHUB_TOKENS=tok1,tok2,...（或单个 GITHUB_TOKEN），按配额轮换
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")  # 可指向本地 mock / 回放服务器
+HTTP_CACHE_FILE = os.getenv("HTTP_CACHE_FILE", "github_http_cache.sqlite")  # 条件请求缓存，设为空关闭
+# 遥测快照（见 telemetry）：.json 或 .prom，设为空关闭
+TELEMETRY_FILE = os.getenv("VIBE_CODERS_TELEMETRY_FILE", "vibe_coders_metrics.json")
+TELEMETRY_INTERVAL = float(os.getenv("TELEMETRY_INTERVAL", "15"))
+# 搜索并发：同时在途的搜索请求数（实际速率由配额池按 X-RateLimit 响应头控制，不会超过 30 次/分钟/token）
+SEARCH_CONCURRENCY = int(os.getenv("SEARCH_CONCURRENCY", "4"))
+# 各查询上次运行保留的仓库数，用于按期望产出调度查询顺序；设为空关闭
+YIELD_FILE = os.getenv("VIBE_CODERS_YIELD_FILE", "vibe_coders_query_yield.json")
 DAYS_BACK = 14
 MAX_README_LENGTH = 4000
+# README 获取方式: graphql = 批量 GraphQL（未命中回退 REST）; rest = 每个仓库一次 REST 请求
+README_FETCH_MODE = os.getenv("README_FETCH_MODE", "graphql")
+README_BATCH_LINGER = 2.0  # graphql 模式下 README 阶段凑批的最长等待(秒)
+README_WORKERS = int(os.getenv("README_WORKERS", "8"))  # README 阶段并发线程数（共用客户端的 keep-alive 连接池）
 
 # ========== 搜索策略 ==========
 # 策略1：生活场景关键词（不依赖AI工具名，去AI偏见）
@@ -175,28 +196,30 @@ NOISE_KEYWORDS = [
 
 
 class VibeCodersCrawler:
-    def __init__(self, token: str = ""):
-        self.token = token
-        self.headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-        self.base_url = "https://api.github.com"
+    def __init__(self, tokens=()):
+        self.tokens = [tokens] if isinstance(tokens, str) else list(tokens)
+        self.base_url = GITHUB_API_URL
+        self.http_cache = HttpCache(HTTP_CACHE_FILE) if HTTP_CACHE_FILE else None
+        self.telemetry = Telemetry()
+        self.client = GitHubClient(self.tokens, self.base_url, cache=self.http_cache, telemetry=self.telemetry)
+        self.telemetry.quota_source = self.client.pool.summary
         self.all_repos = []
+        self.enricher = GraphQLEnricher(self.client)
+        self.seen = {}
+        self.readme_stats = {"done": 0, "success": 0, "failed": 0}
+        self.readme_lock = Lock()
+        self.pipeline = self.build_pipeline()
+        self.telemetry.stage_source = self.pipeline.report
         
     def _request(self, url: str, params: dict = None) -> dict:
-        for attempt in range(3):
-            try:
-                resp = requests.get(url, headers=self.headers, params=params, timeout=30)
-                if resp.status_code == 403:
-                    time.sleep(5)
-                    continue
-                resp.raise_for_status()
-                return resp.json()
-            except:
-                if attempt < 2:
-                    time.sleep(2)
-        return {}
+        """经共用客户端发送请求（token 轮换、限流与重试由 GitHubClient 处理），失败返回 {}"""
+        return self.client.get_json(url, params)
+    
+    def close(self):
+        """写出最终遥测快照并提交 HTTP 缓存（中断时也要调用）"""
+        self.telemetry.stop()
+        if self.http_cache is not None:
+            self.http_cache.close()
     
     def get_readme(self, full_name: str) -> dict:
         """
@@ -211,35 +234,23 @@ class VibeCodersCrawler:
         try:
             # Base64解码获取原始内容
             raw_content = base64.b64decode(data["content"]).decode("utf-8", errors="ignore")
-            
-            # 清理后的内容（用于快速预览）
-            cleaned = raw_content
-            # 简化代码块，但保留存在性标记
-            cleaned = re.sub(r'```[\s\S]*?```', '\n[CODE_BLOCK]\n', cleaned)
-            cleaned = re.sub(r'`[^`]+`', '[code]', cleaned)
-            # 移除图片
-            cleaned = re.sub(r'!\[([^\]]*)\]\([^)]+\)', '', cleaned)
-            # 简化链接，保留文本
-            cleaned = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', cleaned)
-            # 移除HTML标签
-            cleaned = re.sub(r'<[^>]+>', '', cleaned)
-            # 简化格式标记
-            cleaned = re.sub(r'\*\*([^*]+)\*\*', r'\1', cleaned)
-            cleaned = re.sub(r'\*([^*]+)\*', r'\1', cleaned)
-            # 规范化空白
-            cleaned = re.sub(r'\s+', ' ', cleaned)
-            cleaned = cleaned.strip()
-            
-            return {
-                "raw": raw_content[:MAX_README_LENGTH],  # 原始内容（截断）
-                "cleaned": cleaned[:MAX_README_LENGTH],  # 清理后内容（截断）
-                "html_url": data.get("html_url", ""),
-                "size": data.get("size", 0),
-            }
+            return self.build_readme(raw_content, data.get("html_url", ""), data.get("size", 0))
         except Exception as e:
             print(f"[ERROR] Failed to decode README for {full_name}: {e}")
             return {"raw": "", "cleaned": "", "html_url": ""}
     
+    def build_readme(self, raw_content: str, html_url: str, size: int) -> dict:
+        """由README原文生成原始内容和清理后的内容（REST 与 GraphQL 共用）"""
+        # 清理后的内容（用于快速预览）：代码块 / 行内代码保留存在性标记，去掉图片、链接地址、HTML 标签和粗斜体标记
+        cleaned = clean_readme(raw_content)
+        
+        return {
+            "raw": raw_content[:MAX_README_LENGTH],  # 原始内容（截断）
+            "cleaned": cleaned[:MAX_README_LENGTH],  # 清理后内容（截断）
+            "html_url": html_url,
+            "size": size,
+        }
+    
     def is_noise(self, repo: dict) -> bool:
         """噪音检测"""
         text = f"{repo.get('name', '')} {repo.get('description', '')}".lower()
@@ -252,234 +263,174 @@ class VibeCodersCrawler:
             pass
         return False
     
-    def search_by_keywords(self, start_date: str) -> list:
-        """策略1：项目关键词搜索"""
-        print("\n" + "="*70)
-        print("[Strategy 1] Project Type Keywords")
-        print("="*70)
-        
-        repos = []
-        
-        for idx, keyword in enumerate(PROJECT_KEYWORDS, 1):
-            print(f"\n[{idx}/{len(PROJECT_KEYWORDS)}] '{keyword}'")
-            
-            query = f'{keyword} created:>{start_date}'
-            url = f"{self.base_url}/search/repositories"
-            
-            page = 1
-            found = 0
-            filtered = 0
-            
-            while page <= 2:  # 每关键词最多200个
-                params = {
-                    "q": query,
-                    "sort": "created",  # 按创建时间，不是stars！
-                    "order": "desc",
-                    "per_page": 100,
-                    "page": page
-                }
-                
-                data = self._request(url, params)
-                items = data.get("items", [])
-                
-                if not items:
-                    break
-                
-                for repo in items:
-                    # 噪音过滤
-                    if self.is_noise(repo):
-                        filtered += 1
-                        continue
-                    
-                    repos.append({
-                        "repo_id": repo["id"],
-                        "name": repo["name"],
-                        "full_name": repo["full_name"],
-                        "html_url": repo["html_url"],
-                        "description": (repo.get("description") or "")[:500],  # 增加描述长度
-                        "created_at": repo["created_at"],
-                        "updated_at": repo["updated_at"],
-                        "stars": repo["stargazers_count"],
-                        "language": repo.get("language") or "Unknown",
-                        "topics": ",".join(repo.get("topics", [])),
-                        "owner_type": repo.get("owner", {}).get("type", "Unknown"),
-                        "owner_login": repo.get("owner", {}).get("login", ""),
-                        "source_keyword": keyword,
-                        "readme_raw": "",           # 原始README（完整）
-                        "readme_cleaned": "",       # 清理后README（用于预览）
-                        "readme_url": "",           # README文件URL
-                    })
-                    found += 1
-                
-                if len(items) < 100:
-                    break
-                page += 1
-                time.sleep(0.5)
-            
-            print(f"  -> Found {found} (filtered {filtered})")
-        
-        return repos
+    def make_record(self, repo: dict, source: str) -> dict:
+        """由搜索结果构造候选记录（README 字段由 fetch_readmes 补全）"""
+        return {
+            "repo_id": repo["id"],
+            "node_id": repo.get("node_id", ""),
+            "name": repo["name"],
+            "full_name": repo["full_name"],
+            "html_url": repo["html_url"],
+            "description": (repo.get("description") or "")[:500],  # 增加描述长度
+            "created_at": repo["created_at"],
+            "updated_at": repo["updated_at"],
+            "stars": repo["stargazers_count"],
+            "language": repo.get("language") or "Unknown",
+            "topics": ",".join(repo.get("topics", [])),
+            "owner_type": repo.get("owner", {}).get("type", "Unknown"),
+            "owner_login": repo.get("owner", {}).get("login", ""),
+            "source_keyword": source,
+            "readme_raw": "",           # 原始README（完整）
+            "readme_cleaned": "",       # 清理后README（用于预览）
+            "readme_url": "",           # README文件URL
+        }
+    
+    def keyword_queries(self, start_date: str) -> list:
+        """策略1：项目关键词搜索（按创建时间，不是stars！每关键词最多200个）"""
+        return [
+            SearchQuery(keyword, {"q": f'{keyword} created:>{start_date}', "sort": "created", "order": "desc"},
+                        max_pages=2, label=keyword)
+            for keyword in PROJECT_KEYWORDS
+        ]
+    
+    def tech_queries(self, start_date: str) -> list:
+        """策略2：技术栈组合搜索（只取前100个，避免太多）"""
+        return [
+            SearchQuery(query, {"q": query.replace("2025-02-01", start_date), "sort": "created", "order": "desc"},
+                        max_pages=1, label=query.split()[0])
+            for query in TECH_COMBINATIONS
+        ]
     
-    def search_by_tech(self, start_date: str) -> list:
-        """策略2：技术栈组合搜索"""
+    def iter_unique(self, queries: list):
+        """
+        并发执行全部搜索查询（见 search_fanout），每页结果到达即过滤、去重，
+        仓库第一次出现时立即产出（run 直接交给 README 阶段，README 下载与后续搜索重叠）
+        每个仓库只保留一条记录：self.seen[repo_id] = [最早命中位置, 记录, [(命中位置, 来源), ...]]，
+        重复命中只按命中位置并入来源
+        """
         print("\n" + "="*70)
-        print("[Strategy 2] Tech Stack Combinations")
+        print(f"[Search] {len(queries)} queries, {SEARCH_CONCURRENCY} in flight")
         print("="*70)
         
-        repos = []
-        
-        for idx, query in enumerate(TECH_COMBINATIONS, 1):
-            print(f"\n[{idx}/{len(TECH_COMBINATIONS)}] '{query}'")
-            
-            url = f"{self.base_url}/search/repositories"
-            
-            found = 0
-            filtered = 0
-            
-            # 只取前100个（避免太多）
-            params = {
-                "q": query.replace("2025-02-01", start_date),
-                "sort": "created",
-                "order": "desc",
-                "per_page": 100,
-                "page": 1
-            }
-            
-            data = self._request(url, params)
-            items = data.get("items", [])
-            
-            for repo in items:
+        fanout = SearchFanout(self.client, SEARCH_CONCURRENCY, load_yields(YIELD_FILE))
+        self.seen = {}
+        found = [0] * len(queries)
+        filtered = [0] * len(queries)
+        completed = 0
+        started = time.perf_counter()
+        
+        for result in fanout.run(queries):
+            query = queries[result.index]
+            for pos, repo in enumerate(result.items):
+                # 噪音过滤
                 if self.is_noise(repo):
-                    filtered += 1
+                    filtered[result.index] += 1
                     continue
-                
-                repos.append({
-                    "repo_id": repo["id"],
-                    "name": repo["name"],
-                    "full_name": repo["full_name"],
-                    "html_url": repo["html_url"],
-                    "description": (repo.get("description") or "")[:500],
-                    "created_at": repo["created_at"],
-                    "updated_at": repo["updated_at"],
-                    "stars": repo["stargazers_count"],
-                    "language": repo.get("language") or "Unknown",
-                    "topics": ",".join(repo.get("topics", [])),
-                    "owner_type": repo.get("owner", {}).get("type", "Unknown"),
-                    "owner_login": repo.get("owner", {}).get("login", ""),
-                    "source_keyword": query.split()[0],
-                    "readme_raw": "",
-                    "readme_cleaned": "",
-                    "readme_url": "",
-                })
-                found += 1
-            
-            print(f"  -> Found {found} (filtered {filtered})")
-            time.sleep(0.5)
-        
-        return repos
+                found[result.index] += 1
+                self.telemetry.tick("found")
+                rank = (result.index, result.page, pos)
+                entry = self.seen.get(repo["id"])
+                if entry is None:
+                    record = self.make_record(repo, query.label)
+                    self.seen[repo["id"]] = [rank, record, [(rank, query.label)]]
+                    yield record
+                else:
+                    entry[0] = min(entry[0], rank)
+                    bisect.insort(entry[2], (rank, query.label))
+            if result.done:
+                completed += 1
+                print(f"  [{completed}/{len(queries)}] '{query.key}' -> "
+                      f"Found {found[result.index]} (filtered {filtered[result.index]})")
+        
+        elapsed = time.perf_counter() - started
+        s = fanout.stats
+        print(f"\n  Search: {s['requests']} requests in {elapsed:.1f}s "
+              f"({s['requests'] / elapsed * 60 if elapsed > 0 else 0:.0f}/min), {s['failed']} failed")
+        save_yields(YIELD_FILE, {**fanout.yields, **{q.key: n for q, n in zip(queries, found)}})
+        print(f"\n[Before dedup] {sum(found)} repos")
+        print(f"[After dedup] {len(self.seen)} repos")
     
-    def fetch_readmes(self, repos: list) -> list:
-        """批量获取README，保留原始和清理后两种格式"""
-        print("\n" + "="*70)
-        print("[Fetching READMEs]")
-        print("="*70)
-        
-        success_count = 0
-        fail_count = 0
-        
-        for idx, repo in enumerate(repos, 1):
-            print(f"  [{idx}/{len(repos)}] {repo['full_name'][:45]:45} ", end="", flush=True)
+    def merged(self) -> list:
+        """
+        去重结果：按最早命中位置排序，source_keyword 按命中顺序以 | 连接
+        （与逐个查询串行搜索再去重一致）
+        """
+        unique = []
+        for _, record, sources in sorted(self.seen.values(), key=lambda entry: entry[0]):
+            record["source_keyword"] = "|".join(label for _, label in sources)
+            unique.append(record)
+        return unique
+    
+    def search(self, queries: list) -> list:
+        """只搜索并去重，不获取 README"""
+        for _ in self.iter_unique(queries):
+            pass
+        return self.merged()
+    
+    def build_pipeline(self) -> Pipeline:
+        """
+        README 阶段：README_WORKERS 个线程并发下载；
+        graphql 模式按 ENRICH_BATCH_SIZE 凑批（最多等 README_BATCH_LINGER 秒），rest 模式逐个
+        """
+        graphql = README_FETCH_MODE == "graphql"
+        return Pipeline([
+            Stage("readme", self.fetch_readme_batch, workers=README_WORKERS,
+                  batch_size=ENRICH_BATCH_SIZE if graphql else 1,
+                  linger=README_BATCH_LINGER if graphql else 0.0),
+        ])
+    
+    def fetch_readme_batch(self, batch: list, emit=None) -> None:
+        """获取一批仓库的README，保留原始和清理后两种格式（流水线 readme 阶段的 handler，多线程调用）"""
+        enriched = {}
+        if README_FETCH_MODE == "graphql":
+            enriched = self.enricher.fetch_batch([r["node_id"] for r in batch if r.get("node_id")])
+        
+        for repo in batch:
+            info = enriched.get(repo.get("node_id"))
+            if info and info["readme"] is not None:
+                readme_data = self.build_readme(info["readme"], f"{repo['html_url']}/blob/HEAD/README.md",
+                                                len(info["readme"].encode("utf-8")))
+            elif info and info["no_readme"]:
+                readme_data = {"raw": "", "cleaned": "", "html_url": ""}
+            else:
+                # GraphQL 未命中，回退 REST（限速由 GitHubClient 的配额池按响应头控制）
+                readme_data = self.get_readme(repo["full_name"])
             
-            readme_data = self.get_readme(repo["full_name"])
+            if info:
+                repo["stars"] = info["stars"]
+                repo["owner_type"] = info["owner_type"]
+                repo["topics"] = ",".join(info["topics"])
             
+            with self.readme_lock:
+                self.readme_stats["done"] += 1
+                self.readme_stats["success" if readme_data["raw"] else "failed"] += 1
+                done = self.readme_stats["done"]
+            line = f"  [README {done}/{len(self.seen)}] {repo['full_name'][:45]:45} "
             if readme_data["raw"]:
                 repo["readme_raw"] = readme_data["raw"]
                 repo["readme_cleaned"] = readme_data["cleaned"]
                 repo["readme_url"] = readme_data["html_url"]
-                success_count += 1
+                self.telemetry.tick("readmes")
                 # 显示README大小
-                size_kb = len(readme_data["raw"]) / 1024
-                print(f"[OK] {size_kb:.1f}KB")
+                print(f"{line}[OK] {len(readme_data['raw']) / 1024:.1f}KB")
             else:
-                fail_count += 1
-                print("[--]")
-            
-            # 每10个休息下，避免触发限流
-            if idx % 10 == 0:
-                time.sleep(1)
-        
-        print(f"\n  README fetched: {success_count}/{len(repos)} ({fail_count} failed)")
-        return repos
+                print(f"{line}[--]")
     
-    def deduplicate(self, repos: list) -> list:
-        """去重"""
-        seen = {}
-        for r in repos:
-            rid = r["repo_id"]
-            if rid not in seen:
-                seen[rid] = r
-            else:
-                seen[rid]["source_keyword"] += f"|{r['source_keyword']}"
-        return list(seen.values())
+    def search_and_fetch(self, queries: list) -> list:
+        """搜索结果流式去重，新仓库立即进入 README 阶段；全部完成后返回去重结果"""
+        self.pipeline.run(self.iter_unique(queries),
+                          progress=lambda: f"README {self.readme_stats['done']}/{len(self.seen)}")
+        r = self.readme_stats
+        print(f"\n  README fetched: {r['success']}/{r['done']} ({r['failed']} failed)")
+        if README_FETCH_MODE == "graphql":
+            e = self.enricher.stats
+            print(f"  GraphQL: {e['queries']} queries, {e['readme_hits']} README hits, "
+                  f"{e['no_readme']} without README, {e['failed_queries']} failed queries")
+        return self.merged()
     
     def detect_readme_style(self, readme: str) -> dict:
-        """
-        检测README写作风格是否像AI生成
-        不依赖关键词匹配，而是看写作特征
-        """
-        if not readme or len(readme) < 50:
-            return {"is_ai_like": False, "confidence": 0}
-        
-        text_lower = readme.lower()
-        signals = []
-        score = 0
-        
-        # 信号1：过度结构化的标题（## Features, ## Installation）
-        if re.search(r'##\s+(features|installation|getting started|tech stack)', text_lower):
-            signals.append("structured")
-            score += 15
-        
-        # 信号2：AI常用词汇
-        ai_words = ["leverage", "seamlessly", "robust", "empower", "utilize"]
-        if any(w in text_lower for w in ai_words):
-            signals.append("ai_words")
-            score += 10
-        
-        # 信号3：标题emoji（AI喜欢在标题加emoji）
-        if re.search(r'^##?\s+[\U0001F300-\U0001F9FF]', readme, re.MULTILINE):
-            signals.append("emoji_headers")
-            score += 10
-        
-        # 信号4：完美列表格式（AI生成的通常很规整）
-        if re.search(r'##\s+\w+\s*\n+(?:-\s+.+\n+){3,}', readme):
-            signals.append("perfect_list")
-            score += 10
-        
-        # 信号5：包含shields.io徽章
-        if "shields.io" in readme or ("![" in readme and "github.com" in readme):
-            signals.append("badges")
-            score += 8
-        
-        # 信号6：明确提到AI工具（最强信号）
-        ai_tools = ["cursor", "claude", "copilot", "gpt", "chatgpt", "ai generated", "cursorrules"]
-        if any(t in text_lower for t in ai_tools):
-            signals.append("mentions_ai")
-            score += 30
-        
-        # 信号7：README篇幅（AI生成的通常完整但不太长）
-        word_count = len(readme.split())
-        if 150 < word_count < 1000:
-            score += 10
-        
-        is_ai_like = score >= 35
-        confidence = min(score / 60, 1.0)
-        
-        return {
-            "is_ai_like": is_ai_like,
-            "confidence": round(confidence, 2),
-            "signals": signals,
-            "word_count": word_count
-        }
+        """检测README写作风格是否像AI生成（信号与打分见 readme_style）"""
+        return detect_readme_style(readme)
     
     def classify_project_type(self, repo: dict) -> str:
         """自动分类项目类型/场景"""
@@ -565,7 +516,7 @@ class VibeCodersCrawler:
             flat_repos.append(flat_r)
         
         fieldnames = [
-            "repo_id", "name", "full_name", "html_url", "description",
+            "repo_id", "node_id", "name", "full_name", "html_url", "description",
             "created_at", "updated_at", "stars", "language", "topics",
             "owner_type", "owner_login", "source_keyword", "project_type",
             "ai_likelihood", "ai_style", "ai_confidence", "ai_signals", "readme_words",
@@ -588,26 +539,17 @@ class VibeCodersCrawler:
         print("Target: Grassroots projects built by ordinary people with AI")
         print("="*70)
         
-        if not self.token:
-            print("[ERROR] No GITHUB_TOKEN")
+        if not self.tokens:
+            print("[ERROR] No GITHUB_TOKENS / GITHUB_TOKEN")
             return
         
         start_date = (datetime.now() - timedelta(days=DAYS_BACK)).strftime("%Y-%m-%d")
         print(f"\nDate range: Last {DAYS_BACK} days (from {start_date})")
+        if TELEMETRY_FILE:
+            self.telemetry.start(TELEMETRY_FILE, TELEMETRY_INTERVAL)
         
-        # 搜索
-        repos_a = self.search_by_keywords(start_date)
-        repos_b = self.search_by_tech(start_date)
-        
-        # 合并
-        all_repos = repos_a + repos_b
-        print(f"\n[Before dedup] {len(all_repos)} repos")
-        
-        unique = self.deduplicate(all_repos)
-        print(f"[After dedup] {len(unique)} repos")
-        
-        # 获取README
-        enriched = self.fetch_readmes(unique)
+        # 搜索（两种策略的查询一起并发执行，边收边去重）+ 获取README（新仓库一出现就开始）
+        enriched = self.search_and_fetch(self.keyword_queries(start_date) + self.tech_queries(start_date))
         
         # 筛选vibe coding候选
         high, medium, all_data = self.filter_vibe_coding_candidates(enriched)
@@ -687,6 +629,22 @@ class VibeCodersCrawler:
                 desc = r["description"][:50].encode('ascii', 'ignore').decode('ascii')
                 print(f"      {desc}...")
         
+        if self.http_cache is not None:
+            c = self.http_cache.summary()
+            print(f"\n  HTTP cache: {c['hits']} hits (304) / {c['misses']} misses "
+                  f"({c['hit_rate']*100:.1f}%), {c['entries']} entries {c['size_mb']:.1f}/{c['max_mb']:.0f}MB, "
+                  f"{c['evicted']} evicted")
+        
+        pool = self.client.pool.stats
+        print(f"\n  Rate limiting: {pool['paced']} paced ({pool['pace_seconds']:.0f}s), "
+              f"{pool['pool_waits']} pool waits ({pool['wait_seconds']:.0f}s), {pool['paused']} token pauses")
+        
+        latency_rows = self.telemetry.report()
+        if latency_rows:
+            print(f"\n  Request latency (per endpoint, every attempt):")
+            for row in latency_rows:
+                print(f"    {row}")
+        
         print("\n" + "="*70)
         print("[DONE]")
         print("="*70)
@@ -695,7 +653,7 @@ class VibeCodersCrawler:
 
 
 def main():
-    crawler = VibeCodersCrawler(GITHUB_TOKEN)
+    crawler = VibeCodersCrawler(GITHUB_TOKENS)
     try:
         crawler.run()
     except KeyboardInterrupt:
@@ -704,6 +662,8 @@ def main():
         print(f"\n[ERROR] {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        crawler.close()
 
 
 if __name__ == "__main__":
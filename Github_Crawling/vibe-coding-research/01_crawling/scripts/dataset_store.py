@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据集列式存储 - JSONL 的 Parquet (zstd) 替代格式
+
+JSONL 每行把 readme_content 和元数据放在一起，只读几个字段也要解析全部 README。
+Parquet 按列存储：
+- 元数据各列与 readme_content 列分开压缩（zstd），只读 id/created_at 等列时完全不读 README 的数据页
+- 爬虫记录 (build_repo_record) 的字段使用固定类型；其他字段（旧版爬虫、补充字段）以 JSON 文本存放，读回时还原
+- 列顺序保持 JSONL 中首次出现的顺序，id 固定为第一列（断点索引按行首 {"id": 取 id）
+- JSONL 中缺失的字段读回为 null
+
+读取 API 同时支持 .jsonl 和 .parquet，下游脚本换格式只需改文件名；
+记录只有 readme_hash（README 存放在 readme_store 中）时，传入 readme_store 路径即可取回 readme_content：
+    iter_dataset(path, columns=["id", "created_at"])   逐条读取（只取指定列）
+    load_dataset(path, columns=[...])                  全部读入列表
+    read_table(path, columns=[...])                    pyarrow.Table（.to_pandas() 转 DataFrame）
+
+转换：
+    python dataset_store.py to-parquet vibe_coding_dataset_2w.jsonl [输出.parquet]
+    python dataset_store.py to-jsonl   vibe_coding_dataset_2w.parquet [输出.jsonl]
+
+需要 pyarrow（pip install pyarrow）；只读写 JSONL 时不需要。
+"""
+
+import json
+import os
+import sys
+from typing import Optional, Dict, Any, List, Iterator
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # 只用 JSONL 时不需要 pyarrow
+    pa = pq = None
+
+from readme_store import ReadmeStore
+from record_sink import RecordSink
+
+PARQUET_ROW_GROUP_SIZE = 2000  # 每个行组的记录数（行组是列裁剪后最小的读取单位）
+PARQUET_ZSTD_LEVEL = 6         # 元数据列的 zstd 压缩级别
+README_ZSTD_LEVEL = 12          # readme_content 列单独用更高的压缩级别（占文件体积的绝大部分）
+READ_BATCH_SIZE = 1024          # iter_dataset 每批读取的记录数
+JSON_COLUMNS_KEY = b"vibe.json_columns"  # schema 元数据：以 JSON 文本存放的列
+
+# 爬虫记录字段的列类型（见 vibe_coding_crawler.build_repo_record）
+DATASET_COLUMN_TYPES = {
+    "id": "int64",
+    "repo_name": "string",
+    "repo_url": "string",
+    "stars": "int64",
+    "description": "string",
+    "language": "string",
+    "topics": "list<string>",
+    "created_at": "string",
+    "pushed_at": "string",
+    "tier": "string",
+    "size_kb": "int64",
+    "forks_count": "int64",
+    "open_issues": "int64",
+    "owner_login": "string",
+    "owner_type": "string",
+    "readme_content": "string",
+    "readme_hash": "string",   # 启用 README 存储时代替 readme_content
+    "refreshed_at": "string",  # 增量刷新更新过的记录（见 delta_crawl）
+}
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("Parquet 格式需要 pyarrow: pip install pyarrow")
+
+
+def _arrow_type(name: str):
+    if name == "list<string>":
+        return pa.list_(pa.string())
+    return getattr(pa, name)()
+
+
+def is_parquet(path: str) -> bool:
+    return path.endswith(".parquet")
+
+
+def _iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _plan_schema(jsonl_path: str):
+    """第一遍扫描：按首次出现顺序收集字段，决定每列的类型"""
+    keys: Dict[str, None] = {"id": None}
+    for record in _iter_jsonl(jsonl_path):
+        for key in record:
+            keys.setdefault(key)
+    fields, json_columns = [], []
+    for key in keys:
+        if key in DATASET_COLUMN_TYPES:
+            fields.append(pa.field(key, _arrow_type(DATASET_COLUMN_TYPES[key])))
+        else:
+            fields.append(pa.field(key, pa.string()))
+            json_columns.append(key)
+    schema = pa.schema(fields, metadata={JSON_COLUMNS_KEY: json.dumps(json_columns).encode()})
+    return schema, set(json_columns)
+
+
+def _to_batch(records: List[Dict[str, Any]], schema, json_columns) -> "pa.RecordBatch":
+    arrays = []
+    for field in schema:
+        if field.name in json_columns:
+            values = [json.dumps(r[field.name], ensure_ascii=False) if field.name in r else None
+                      for r in records]
+        else:
+            values = [r.get(field.name) for r in records]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def jsonl_to_parquet(jsonl_path: str, parquet_path: str,
+                     row_group_size: int = PARQUET_ROW_GROUP_SIZE) -> Dict[str, Any]:
+    """JSONL -> Parquet（两遍扫描：先定 schema，再按行组流式写入）"""
+    _require_pyarrow()
+    schema, json_columns = _plan_schema(jsonl_path)
+    compression_level = {f.name: PARQUET_ZSTD_LEVEL for f in schema}
+    if "readme_content" in compression_level:
+        compression_level["readme_content"] = README_ZSTD_LEVEL
+
+    records = 0
+    with pq.ParquetWriter(parquet_path, schema, compression="zstd",
+                          compression_level=compression_level) as writer:
+        batch: List[Dict[str, Any]] = []
+        for record in _iter_jsonl(jsonl_path):
+            batch.append(record)
+            if len(batch) >= row_group_size:
+                writer.write_batch(_to_batch(batch, schema, json_columns), row_group_size=row_group_size)
+                records += len(batch)
+                batch = []
+        if batch:
+            writer.write_batch(_to_batch(batch, schema, json_columns), row_group_size=row_group_size)
+            records += len(batch)
+    return {
+        "records": records,
+        "columns": len(schema),
+        "jsonl_bytes": os.path.getsize(jsonl_path),
+        "parquet_bytes": os.path.getsize(parquet_path),
+    }
+
+
+def _json_columns(schema) -> set:
+    metadata = schema.metadata or {}
+    return set(json.loads(metadata.get(JSON_COLUMNS_KEY, b"[]")))
+
+
+def _decode_batch(batch, json_columns) -> Iterator[Dict[str, Any]]:
+    for row in batch.to_pylist():
+        for key in json_columns & row.keys():
+            if row[key] is None:
+                del row[key]  # JSONL 中原本没有这个字段
+            else:
+                row[key] = json.loads(row[key])
+        yield row
+
+
+def _iter_records(path: str, columns: Optional[List[str]], batch_size: int) -> Iterator[Dict[str, Any]]:
+    if not is_parquet(path):
+        for record in _iter_jsonl(path):
+            yield record if columns is None else {k: record.get(k) for k in columns}
+        return
+
+    _require_pyarrow()
+    parquet = pq.ParquetFile(path)
+    json_columns = _json_columns(parquet.schema_arrow)
+    if columns is not None:
+        missing = [c for c in columns if c not in parquet.schema_arrow.names]
+        if missing:
+            raise KeyError(f"{path} 中没有列: {missing}")
+    for batch in parquet.iter_batches(batch_size=batch_size, columns=columns):
+        yield from _decode_batch(batch, json_columns)
+
+
+def iter_dataset(path: str, columns: Optional[List[str]] = None,
+                 batch_size: int = READ_BATCH_SIZE,
+                 readme_store: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    逐条读取数据集（.parquet 或 .jsonl）
+    columns: 只返回这些字段；Parquet 只读取这些列的数据页，JSONL 仍需解析整行
+    readme_store: README 存储路径（见 readme_store）；记录只有 readme_hash 时从中取回 readme_content
+    """
+    if readme_store is None or not os.path.exists(readme_store):
+        yield from _iter_records(path, columns, batch_size)
+        return
+
+    # 需要 readme_content 时按 readme_hash 取回正文
+    read_columns = columns
+    if columns is not None and "readme_content" in columns:
+        names = None
+        if is_parquet(path):
+            _require_pyarrow()
+            names = set(pq.ParquetFile(path).schema_arrow.names)
+        read_columns = [c for c in columns if names is None or c in names]
+        if names is None or "readme_hash" in names:
+            read_columns = read_columns + ["readme_hash"]
+    store = ReadmeStore(readme_store)
+    try:
+        for record in _iter_records(path, read_columns, batch_size):
+            if record.get("readme_content") is None and record.get("readme_hash"):
+                record["readme_content"] = store.get(record["readme_hash"])
+            yield record if columns is None else {k: record.get(k) for k in columns}
+    finally:
+        store.close()
+
+
+def load_dataset(path: str, columns: Optional[List[str]] = None,
+                 readme_store: Optional[str] = None) -> List[Dict[str, Any]]:
+    """全部读入列表（参数同 iter_dataset）"""
+    return list(iter_dataset(path, columns, readme_store=readme_store))
+
+
+def read_table(path: str, columns: Optional[List[str]] = None) -> "pa.Table":
+    """读成 pyarrow.Table（JSON 文本列保持原样），适合直接 .to_pandas() 做统计"""
+    _require_pyarrow()
+    if is_parquet(path):
+        return pq.read_table(path, columns=columns)
+    return pa.Table.from_pylist(load_dataset(path, columns))
+
+
+def parquet_to_jsonl(parquet_path: str, jsonl_path: str) -> Dict[str, Any]:
+    """Parquet -> JSONL（覆盖已有文件；每行格式与爬虫落盘一致）"""
+    if os.path.exists(jsonl_path):
+        os.remove(jsonl_path)
+    records = 0
+    with RecordSink(jsonl_path) as sink:
+        for record in iter_dataset(parquet_path):
+            sink.write(record)
+            records += 1
+    return {
+        "records": records,
+        "parquet_bytes": os.path.getsize(parquet_path),
+        "jsonl_bytes": os.path.getsize(jsonl_path),
+    }
+
+
+def main():
+    sys.stdout.reconfigure(encoding='utf-8')
+    if len(sys.argv) < 3 or sys.argv[1] not in ("to-parquet", "to-jsonl"):
+        print("用法: python dataset_store.py to-parquet <输入.jsonl> [输出.parquet]")
+        print("      python dataset_store.py to-jsonl <输入.parquet> [输出.jsonl]")
+        return
+    command, source = sys.argv[1], sys.argv[2]
+    base = os.path.splitext(source)[0]
+    if command == "to-parquet":
+        target = sys.argv[3] if len(sys.argv) > 3 else base + ".parquet"
+        stats = jsonl_to_parquet(source, target)
+    else:
+        target = sys.argv[3] if len(sys.argv) > 3 else base + ".jsonl"
+        stats = parquet_to_jsonl(source, target)
+    print(f"{source} -> {target}")
+    print(f"  记录: {stats['records']} | JSONL {stats['jsonl_bytes'] / 1024 / 1024:.1f}MB | "
+          f"Parquet {stats['parquet_bytes'] / 1024 / 1024:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量刷新 - 只更新上次运行后有新提交的已保存仓库
+
+全量爬取之后 stars、pushed_at 和 README 会持续变化。增量模式不重新爬取，而是：
+1. 搜索 created:START_DATE..今天 pushed:>上次运行时间（断点索引中的 last_run）：整个时间范围一个查询，
+   超过 1000 条时按 created 时间自适应拆分；切片树同样记录在断点索引中，中断后续传
+2. 只处理断点索引中已有的仓库（新仓库由全量爬虫负责）；元数据直接取自搜索结果，
+   与已保存记录相同时不再请求 README（续传时已刷新过的仓库）
+3. README 用 REST 条件请求：带上次响应的 ETag，未变化时 304 不计配额（需启用 HTTP_CACHE_FILE；
+   README_FETCH_MODE=graphql 爬取的仓库第一次刷新时还没有 ETag）
+4. 新版本追加到 JSONL 并把索引指向它；结束时压缩 JSONL，每个仓库只保留最新版本，位置不变
+5. 所有切片完成后 last_run 更新为本次开始时间；未完成时保持不变，下次从同一起点续传
+
+记录保留原来的 tier（抽样时的分层）与其他字段，新增 refreshed_at（本次刷新的开始时间）。
+请求失败拿不到 README 时保留原 README。
+
+用法：
+    python delta_crawl.py
+"""
+
+import json
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+import vibe_coding_crawler as vcc
+from crawl_pipeline import Pipeline, Stage
+from readme_store import readme_hash
+from slice_planner import Slice, parse_range
+from vibe_coding_crawler import VibeCodingCrawler, build_repo_record, utc_timestamp
+
+# 已保存仓库的 size / stars 可能已超出全量爬取的范围，增量搜索不限制
+DELTA_SIZE_RANGE = "0..100000000"
+DELTA_STARS_RANGE = "0..100000000"
+# 比较新旧记录时忽略的字段（README 单独比较）
+README_FIELDS = ("readme_content", "readme_hash")
+
+
+class DeltaCrawler(VibeCodingCrawler):
+    """增量模式：复用全量爬虫的流水线、切片树、条件请求缓存与 README 存储"""
+
+    def __init__(self, tokens):
+        super().__init__(tokens)
+        self.since: Optional[str] = None       # pushed:> 的起点（last_run）
+        self.started_at = utc_timestamp()      # 本次开始时间，完成后成为新的 last_run
+        self.delta_stats = {
+            "candidates": 0,      # 搜索到的有新提交的仓库
+            "unknown": 0,         # 其中不在数据集中的（未入选或未爬到）
+            "unchanged": 0,       # 记录字段无变化（已刷新过），跳过
+            "refreshed": 0,       # 更新了记录
+            "readme_changed": 0,  # 其中 README 有变化
+            "readme_kept": 0,     # 拿不到 README，保留原内容
+            "compacted": 0,       # 压缩 JSONL 时去掉的旧版本
+        }
+
+    def target_reached(self) -> bool:
+        # 增量刷新只更新已有记录，不受 TARGET_TOTAL 限制
+        return False
+
+    def delta_slice(self) -> Slice:
+        """覆盖全部爬取天数的根切片: created:首日..末日 pushed:>last_run"""
+        days = self.crawl_days()
+        first, last = days[0], days[-1]
+        return Slice(
+            created_from=datetime(first.year, first.month, first.day),
+            created_to=datetime(last.year, last.month, last.day, 23, 59, 59),
+            size=parse_range(DELTA_SIZE_RANGE),
+            stars=parse_range(DELTA_STARS_RANGE),
+            pushed_after=self.since,
+        )
+
+    def load_record(self, repo_id: int) -> Optional[Dict[str, Any]]:
+        """按索引偏移读出已保存的最新记录；不在数据集中时返回 None"""
+        offset = self.checkpoint.repo_offset(repo_id)
+        if offset is None:
+            return None
+        with open(vcc.OUTPUT_FILE, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    # ========== 流水线: 搜索 -> 比较 -> README 条件请求 -> 更新 ==========
+
+    def build_pipeline(self) -> Pipeline:
+        return Pipeline([
+            Stage("search", self.search_delta, workers=1),
+            Stage("filter", self.select_changed, workers=vcc.PIPELINE_WORKERS["filter"]),
+            Stage("readme", self.refresh_readme, workers=vcc.PIPELINE_WORKERS["readme"]),
+            Stage("writer", self.update_record, workers=1),
+        ])
+
+    def search_delta(self, slice_: Slice, emit) -> None:
+        """阶段 1：搜索增量切片树，逐条派发 (item, ticket)"""
+        print(f"\n[增量] 搜索 pushed:>{slice_.pushed_after} ...")
+        total = self.search_slice(slice_, None, "增量", emit)
+        if total is not None:
+            print(f"  [增量] 有新提交的仓库: {total}")
+
+    def select_changed(self, work: tuple, emit) -> None:
+        """阶段 2：只保留数据集中已有、且元数据有变化的仓库，派发 (item, record, ticket)"""
+        item, ticket = work
+        with self.stats_lock:
+            if item.id in self.seen_ids:
+                ticket.release()
+                return
+            self.seen_ids.add(item.id)
+            self.delta_stats["candidates"] += 1
+            self.stats["repos_scanned"] += 1
+        self.telemetry.tick("scanned")
+        record = self.load_record(item.id)
+        if record is None:
+            with self.stats_lock:
+                self.delta_stats["unknown"] += 1
+            ticket.release()
+            return
+        fresh = build_repo_record(item, record.get("tier", ""), None)
+        if all(record.get(k) == v for k, v in fresh.items() if k not in README_FIELDS):
+            with self.stats_lock:
+                self.delta_stats["unchanged"] += 1
+            ticket.release()
+            return
+        emit((item, record, ticket))
+
+    def refresh_readme(self, work: tuple, emit) -> None:
+        """阶段 3：README 条件请求（未变化时 304，正文取自缓存）"""
+        item, record, ticket = work
+        emit((item, record, self.get_readme_content(item.full_name), ticket))
+
+    def update_record(self, work: tuple, emit) -> None:
+        """阶段 4（单线程）：合并新旧记录，追加新版本并把索引指向它"""
+        item, record, readme_content, ticket = work
+        updated = {**record, **build_repo_record(item, record.get("tier", ""), None)}
+        updated.pop("readme_content", None)
+        updated.pop("readme_hash", None)
+
+        old_digest = record.get("readme_hash")
+        if old_digest is None and record.get("readme_content"):
+            old_digest = readme_hash(record["readme_content"])
+        if readme_content is None:
+            # 请求失败（或 README 已删除）：保留原 README
+            new_digest = old_digest
+            for field in README_FIELDS:
+                if field in record:
+                    updated[field] = record[field]
+        else:
+            new_digest = readme_hash(readme_content)
+            if self.readme_store is not None:
+                updated["readme_hash"] = self.readme_store.put(readme_content)
+                self.readme_store.unref(record.get("readme_hash"))
+            else:
+                updated["readme_content"] = readme_content
+        updated["refreshed_at"] = self.started_at
+
+        with self.checkpoint.lock:
+            offset, end_offset = self.sink.write(updated)
+            self.checkpoint.update_repo(updated["id"], offset, end_offset)
+        with self.stats_lock:
+            self.delta_stats["refreshed"] += 1
+            self.delta_stats["readme_kept"] += readme_content is None
+            self.delta_stats["readme_changed"] += new_digest != old_digest
+        self.telemetry.tick("refreshed")
+        ticket.release()
+
+    def print_banner(self) -> None:
+        print("=" * 70)
+        print("[Vibe Coding 项目爬虫 - 增量刷新]")
+        print("=" * 70)
+        print(f"数据文件: {vcc.OUTPUT_FILE}")
+        print(f"GitHub token: {len(self.tokens)} 个（按配额余量轮换）")
+        print(f"README 条件请求: {'开启' if self.http_cache is not None else '关闭（未设置 HTTP_CACHE_FILE）'}")
+
+    def run(self) -> None:
+        self.print_banner()
+        print("=" * 70)
+
+        if not self.tokens:
+            print("[错误] 未设置 GITHUB_TOKENS / GITHUB_TOKEN 环境变量")
+            return
+
+        self.load_existing_data()
+        if not self.total_saved:
+            print("[增量] 数据集为空，请先运行全量爬虫")
+            return
+        self.since = self.checkpoint.get_last_run()
+        print(f"[增量] 上次运行: {self.since} | 已保存仓库: {self.total_saved}")
+        self.start_telemetry()
+
+        root = self.delta_slice()
+        self.pipeline = self.build_pipeline()
+        self.pipeline.run([root], progress=lambda: f"候选 {self.delta_stats['candidates']} | "
+                                                   f"已更新 {self.delta_stats['refreshed']}")
+        complete = self.slices.is_done(root)
+        self.checkpoint.commit()
+        if complete:
+            self.checkpoint.put_last_run(self.started_at)
+
+        # 压缩前关闭写入句柄（压缩会替换文件）
+        self.sink.close()
+        self.delta_stats["compacted"] = self.checkpoint.compact_jsonl(vcc.OUTPUT_FILE)
+
+        print("\n" + "=" * 70)
+        print("[增量刷新完成]" if complete else "[增量刷新未完成] 下次运行从同一起点续传")
+        print("=" * 70)
+        self.print_final_stats()
+
+    def print_final_stats(self) -> None:
+        d = self.delta_stats
+        print(f"\n增量统计 (pushed:>{self.since}):")
+        print(f"  - 有新提交: {d['candidates']} | 不在数据集中: {d['unknown']} | 无变化: {d['unchanged']}")
+        print(f"  - 更新记录: {d['refreshed']} | README 变化: {d['readme_changed']} | 保留原 README: {d['readme_kept']}")
+        print(f"  - 压缩 JSONL: 去掉旧版本 {d['compacted']} 条")
+
+        calls = self.stats["http_calls"]
+        print(f"\nHTTP 调用:")
+        for endpoint in ("search", "readme"):
+            print(f"  - {endpoint}: {calls[endpoint]}")
+        if self.http_cache is not None:
+            print(f"  - 缓存: {self.http_cache.report()}")
+        if self.readme_store is not None:
+            print(f"\nREADME 存储: {self.readme_store.report()}")
+
+        sl = self.stats["slices"]
+        print(f"\n搜索切片: 探测 {sl['probed']} | 拆分 {sl['split']} | 完成 {sl['done']} | "
+              f"续传跳过 {sl['skipped']} | 超限 {sl['capped']}")
+        latency_rows = self.telemetry.report()
+        if latency_rows:
+            print(f"\n请求延迟（按接口，含重试的每次尝试）:")
+            for row in latency_rows:
+                print(f"  - {row}")
+        print(f"\n输出文件: {vcc.OUTPUT_FILE}")
+        print("=" * 70)
+
+
+def main():
+    crawler = DeltaCrawler(vcc.GITHUB_TOKENS)
+    try:
+        crawler.run()
+    except KeyboardInterrupt:
+        print("\n\n[中断] 用户手动停止")
+        crawler.print_final_stats()
+    except Exception as e:
+        print(f"\n[错误] {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        crawler.close()
+
+
+if __name__ == "__main__":
+    main()
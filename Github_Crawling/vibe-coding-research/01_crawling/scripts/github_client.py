@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GitHub HTTP 客户端 - 多 token 轮换
+
+- TokenPool: 按 token 分别记录 core / search / code_search / graphql 各类资源的剩余配额（读 X-RateLimit-* 响应头），
+  每个请求路由到该资源余量最多的 token；只有池中所有 token 都耗尽时才等待最早的重置时间。
+  同时是所有线程 / 协程共用的限速器（令牌桶）：余量高于 PACE_THRESHOLD * 上限时不限速（突发），
+  低于时把剩余配额均匀分布到重置前的窗口，每个请求预约一个发送时刻；
+  次级速率限制只暂停触发它的 token，其他 token 照常使用，并加大该 token 的最小发送间隔
+  （每次限流翻倍，之后每个正常响应缩小一点，AIMD），避免暂停结束后立即再次触发
+- GitHubClient: 基于 requests.Session 的同步客户端（keep-alive 连接池，各线程共用，大小 HTTP_POOL_SIZE），主速率限制时换 token 重试，
+  次级速率限制按 Retry-After（没有时从 SECONDARY_LIMIT_WAIT 起指数退避）暂停该 token，
+  网络错误 / 5xx 指数退避；退避时间都带随机抖动，并发请求不会在同一时刻重试；
+  传入 HttpCache 时 GET 请求带 If-None-Match，304 直接用缓存正文（见 http_cache）；
+  传入 Telemetry 时记录每次尝试的接口、耗时与状态码，以及重试 / 放弃次数（见 telemetry）
+
+token 配置（.env）：
+    GITHUB_TOKENS=ghp_xxx,ghp_yyy,ghp_zzz   # 多个 token，逗号分隔
+    GITHUB_TOKEN=ghp_xxx                     # 只有一个 token 时沿用旧配置
+"""
+
+import math
+import os
+import random
+import time
+from datetime import datetime
+from threading import Lock
+from typing import Optional, Dict, Any, List, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import HttpCache, cache_key
+from telemetry import Telemetry, endpoint_for
+
+QUOTA_RESERVE = 2          # 每个 token 每种资源保留的余量
+REQUEST_TIMEOUT = 30       # 单个请求超时(秒)
+HTTP_POOL_SIZE = 32        # 每个主机保留的 keep-alive 连接数（应不少于并发请求的线程数，超出的连接用完即关闭）
+MAX_RETRIES = 3            # 网络错误 / 5xx / 主、次级限流的最大重试次数
+SECONDARY_LIMIT_WAIT = 60  # 次级限流没有 Retry-After 时的等待(秒)
+PACE_THRESHOLD = 0.25      # 剩余配额低于上限的该比例时开始匀速发送
+BACKOFF_JITTER = 0.5       # 退避时间随机延长的最大比例
+SPACING_START = 0.1        # 第一次次级限流后同一 token 的最小发送间隔(秒)，之后每次翻倍
+SPACING_MAX = 5.0
+SPACING_DECAY = 0.98       # 每个正常响应把最小发送间隔乘以该系数，低于 SPACING_START / 4 时取消
+
+
+def load_tokens() -> List[str]:
+    """读取 GITHUB_TOKENS（逗号分隔），没有时退回 GITHUB_TOKEN"""
+    tokens = [t.strip() for t in os.getenv("GITHUB_TOKENS", "").split(",") if t.strip()]
+    if not tokens and os.getenv("GITHUB_TOKEN"):
+        tokens = [os.getenv("GITHUB_TOKEN")]
+    return tokens
+
+
+def backoff_delay(attempt: int, base: float = 1.0) -> float:
+    """第 attempt 次重试的退避时间：base * 2^attempt，再随机延长至多 BACKOFF_JITTER"""
+    return base * 2 ** attempt * (1 + random.uniform(0, BACKOFF_JITTER))
+
+
+def secondary_limit_wait(headers, attempt: int) -> float:
+    """次级速率限制的等待时间：优先 Retry-After，否则从 SECONDARY_LIMIT_WAIT 起指数退避（均带抖动）"""
+    if "Retry-After" in headers:
+        return float(headers["Retry-After"]) * (1 + random.uniform(0, BACKOFF_JITTER))
+    return backoff_delay(attempt, SECONDARY_LIMIT_WAIT)
+
+
+def resource_for(path: str) -> str:
+    """按接口路径判断配额资源（与响应头 X-RateLimit-Resource 的取值一致）"""
+    if "/search/code" in path:
+        return "code_search"
+    if "/search/" in path:
+        return "search"
+    if path.rstrip("/").endswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+class TokenPool:
+    """多 token 配额池（线程安全）"""
+
+    def __init__(self, tokens: List[str], reserve: int = QUOTA_RESERVE):
+        self.tokens = list(dict.fromkeys(t for t in tokens if t))
+        self.reserve = reserve
+        # token -> resource -> {"remaining": int, "reset": float, "limit": int}
+        self.quota: Dict[str, Dict[str, Dict[str, float]]] = {t: {} for t in self.tokens}
+        # token -> resource -> 下一个可用的发送时刻（匀速时逐个预约）
+        self.slots: Dict[str, Dict[str, float]] = {t: {} for t in self.tokens}
+        # token -> 次级速率限制暂停到的时刻 / 最小发送间隔
+        self.paused: Dict[str, float] = {}
+        self.spacing: Dict[str, float] = {}
+        self.lock = Lock()
+        self._next = 0
+        self._waiting = False
+        self.stats = {
+            "requests": {self.label(t): 0 for t in self.tokens},
+            "exhausted": 0,      # 单个 token 触发主速率限制的次数
+            "pool_waits": 0,     # 整个池耗尽、需要等待的次数
+            "wait_seconds": 0.0,
+            "paced": 0,          # 配额不足、按匀速间隔推迟发送的请求数
+            "pace_seconds": 0.0,
+            "paused": 0,         # 单个 token 因次级速率限制暂停的次数
+        }
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def label(self, token: str) -> str:
+        """统计用的 token 名称（不输出 token 本身）"""
+        return f"token{self.tokens.index(token) + 1}"
+
+    def _headroom(self, token: str, resource: str, now: float) -> float:
+        q = self.quota[token].get(resource)
+        if q is None or q["reset"] <= now:
+            return math.inf  # 未知或已过重置时间：视为满额
+        return q["remaining"] - self.reserve
+
+    def _ready_at(self, token: str, resource: str, now: float) -> float:
+        """token 可以再发送该资源请求的时刻（耗尽时为重置时间，次级限流时为暂停结束时间）"""
+        ready = self.paused.get(token, 0.0)
+        if self._headroom(token, resource, now) <= 0:
+            ready = max(ready, self.quota[token][resource]["reset"] + 1)
+        return ready
+
+    def _interval(self, token: str, resource: str, at: float) -> float:
+        """
+        发送时刻 at 之后的匀速间隔：余量不足 PACE_THRESHOLD * 上限时为 (重置时间 - at) / 剩余配额，
+        否则为 0（允许突发）；at 已过重置时间时配额恢复，也为 0。不小于次级限流后的最小发送间隔
+        """
+        spacing = self.spacing.get(token, 0.0)
+        q = self.quota[token].get(resource)
+        if q is None or q["reset"] <= at or not q.get("limit"):
+            return spacing
+        headroom = q["remaining"] - self.reserve
+        if headroom >= q["limit"] * PACE_THRESHOLD:
+            return spacing
+        return max((q["reset"] - at) / max(headroom, 1), spacing)
+
+    def pick(self, resource: str) -> Tuple[Optional[str], float]:
+        """
+        选出可用的 token，预扣一个配额并预约发送时刻（不阻塞）
+        返回: (token, 发送前需等待的秒数)；全部耗尽或暂停时返回 (None, 需要等待的秒数)
+        """
+        with self.lock:
+            if not self.tokens:
+                return None, 0.0
+            now = time.time()
+            # 从轮转位置开始比较，条件相同时各 token 轮流使用
+            order = self.tokens[self._next:] + self.tokens[:self._next]
+            self._next = (self._next + 1) % len(self.tokens)
+            usable = [t for t in order if self._ready_at(t, resource, now) <= now]
+            if not usable:
+                ready = min(self._ready_at(t, resource, now) for t in self.tokens)
+                return None, max(ready - now, 1.0)
+
+            # 先选最早能发送的，再选余量最多的
+            best = min(usable, key=lambda t: (max(self.slots[t].get(resource, 0.0), now),
+                                              -self._headroom(t, resource, now)))
+            send_at = max(self.slots[best].get(resource, 0.0), now)
+            self.slots[best][resource] = send_at + self._interval(best, resource, send_at)
+            q = self.quota[best].get(resource)
+            if q is not None and q["reset"] > now:
+                q["remaining"] -= 1
+            self.stats["requests"][self.label(best)] += 1
+            wait = send_at - now
+            if wait > 0:
+                self.stats["paced"] += 1
+                self.stats["pace_seconds"] += wait
+            return best, wait
+
+    def acquire(self, resource: str) -> str:
+        """同步获取 token：匀速时睡到预约的发送时刻；整个池耗尽时睡到最早的重置时间"""
+        while True:
+            token, wait = self.pick(resource)
+            if token is not None or not self.tokens:
+                if wait > 0:
+                    time.sleep(wait)
+                return token
+            self.note_wait(resource, wait)
+            time.sleep(wait)
+
+    def note_wait(self, resource: str, wait: float) -> None:
+        """记录一次整池等待（同步/异步调用方共用）"""
+        with self.lock:
+            self.stats["pool_waits"] += 1
+            self.stats["wait_seconds"] += wait
+            first = not self._waiting
+            self._waiting = True
+        if first:
+            reset_time = datetime.fromtimestamp(time.time() + wait).strftime('%H:%M:%S')
+            print(f"\n[Rate Limit] {len(self.tokens)} 个 token 的 {resource} 配额均已耗尽或暂停，"
+                  f"{int(wait)} 秒后继续 (reset at {reset_time})")
+
+    def update(self, token: str, resource: str, headers) -> None:
+        """用响应头刷新某个 token 的配额"""
+        resource = headers.get("X-RateLimit-Resource", resource)
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        with self.lock:
+            if token in self.spacing and "Retry-After" not in headers:
+                spacing = self.spacing[token] * SPACING_DECAY
+                if spacing < SPACING_START / 4:
+                    del self.spacing[token]
+                else:
+                    self.spacing[token] = spacing
+            self.quota[token][resource] = {
+                "remaining": int(headers["X-RateLimit-Remaining"]),
+                "reset": float(headers.get("X-RateLimit-Reset", time.time() + 60)),
+                "limit": int(headers.get("X-RateLimit-Limit", 0)),
+            }
+            self._waiting = False
+
+    def exhaust(self, token: str, resource: str, reset_at: float) -> None:
+        """某个 token 触发主速率限制（重置时间已过或时钟偏差时至少跳过 1 秒，避免立即再拿到同一个 token）"""
+        with self.lock:
+            reset_at = max(reset_at, time.time() + 1)
+            self.quota[token][resource] = {"remaining": 0, "reset": reset_at}
+            self.stats["exhausted"] += 1
+
+    def pause(self, token: str, seconds: float) -> None:
+        """某个 token 触发次级速率限制：暂停 seconds 秒（期间请求改用其他 token），并加大它的最小发送间隔"""
+        with self.lock:
+            now = time.time()
+            if self.paused.get(token, 0.0) <= now:
+                # 同一次暂停期间其他在途请求的限流响应不再重复翻倍
+                self.spacing[token] = min(max(self.spacing.get(token, 0.0) * 2, SPACING_START), SPACING_MAX)
+            self.paused[token] = max(self.paused.get(token, 0.0), now + seconds)
+            self.stats["paused"] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """各 token 当前配额快照: {label: {resource: remaining}}"""
+        with self.lock:
+            return {self.label(t): {r: int(q["remaining"]) for r, q in self.quota[t].items()}
+                    for t in self.tokens}
+
+
+class GitHubClient:
+    """共用的 GitHub REST / GraphQL 客户端，所有请求经过 TokenPool 选择 token"""
+
+    def __init__(self, tokens: List[str], api_url: str = "https://api.github.com",
+                 session: Optional[requests.Session] = None, pool: Optional[TokenPool] = None,
+                 cache: Optional[HttpCache] = None, telemetry: Optional[Telemetry] = None):
+        self.api_url = api_url.rstrip("/")
+        self.pool = pool or TokenPool(tokens)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+        self.cache = cache
+        self.telemetry = telemetry
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "rate_limited": 0,   # 主速率限制（已换 token 重试）
+            "secondary_limited": 0,
+            "errors": 0,         # 重试后仍失败
+        }
+
+    def url(self, path: str) -> str:
+        return path if path.startswith("http") else f"{self.api_url}{path}"
+
+    def request(self, method: str, path: str, params: Optional[dict] = None,
+                json_body: Optional[dict] = None, accept: str = "application/vnd.github+json",
+                resource: Optional[str] = None) -> Optional[requests.Response]:
+        """
+        发送请求：主速率限制时标记该 token 耗尽并换 token 重试；各类重试合计不超过 MAX_RETRIES 次
+        返回: Response（包括 404 等客户端错误，由调用方判断）；多次失败返回 None
+        """
+        url = self.url(path)
+        resource = resource or resource_for(url)
+        endpoint = endpoint_for(url)
+        key = cache_key(url, params, accept) if self.cache is not None and method == "GET" else None
+        attempt = 0
+        while attempt < MAX_RETRIES:
+            token = self.pool.acquire(resource)
+            headers = {"Accept": accept}
+            if token:
+                headers["Authorization"] = f"token {token}"
+            conditional = self.cache.lookup(key) if key else None
+            if conditional:
+                headers.update(conditional)
+
+            self.stats["requests"] += 1
+            start = time.perf_counter()
+            try:
+                resp = self.session.request(method, url, params=params, json=json_body,
+                                            headers=headers, timeout=REQUEST_TIMEOUT)
+            except requests.RequestException:
+                self._observe(endpoint, start, None)
+                self._retry(endpoint)
+                attempt += 1
+                self.stats["retries"] += 1
+                time.sleep(backoff_delay(attempt))
+                continue
+            self._observe(endpoint, start, resp.status_code)
+
+            if token:
+                self.pool.update(token, resource, resp.headers)
+
+            if key and resp.status_code == 304:
+                cached = self.cache.hit(key)
+                if cached is None:
+                    # 缓存条目已被淘汰（或代理对无条件请求也回 304）：计入重试次数，避免无限循环
+                    self._retry(endpoint)
+                    attempt += 1
+                    self.stats["retries"] += 1
+                    continue
+                # 304 不消耗配额：把缓存正文填回响应，调用方照常按 200 处理
+                resp.status_code = 200
+                resp.headers.update(cached[0])
+                resp._content = cached[1]
+                return resp
+            if key and resp.status_code == 200:
+                self.cache.store(key, resp.headers, resp.content)
+
+            if resp.status_code in (403, 429):
+                if resp.headers.get("X-RateLimit-Remaining") == "0" and token:
+                    # 主速率限制：这个 token 到重置前不再使用，立即换下一个（计入重试次数）
+                    reset_at = float(resp.headers.get("X-RateLimit-Reset", time.time() + 60))
+                    self.pool.exhaust(token, resource, reset_at)
+                    self.stats["rate_limited"] += 1
+                    self._retry(endpoint)
+                    attempt += 1
+                    continue
+                if "Retry-After" in resp.headers or "rate limit" in resp.text.lower():
+                    # 次级速率限制：暂停这个 token，下一次尝试由 acquire 换 token 或等待
+                    self.stats["secondary_limited"] += 1
+                    self._retry(endpoint)
+                    wait = secondary_limit_wait(resp.headers, attempt)
+                    attempt += 1
+                    if token:
+                        self.pool.pause(token, wait)
+                    else:
+                        time.sleep(wait)
+                    continue
+                return resp
+
+            if resp.status_code >= 500:
+                self._retry(endpoint)
+                attempt += 1
+                self.stats["retries"] += 1
+                time.sleep(backoff_delay(attempt))
+                continue
+            return resp
+
+        self.stats["errors"] += 1
+        if self.telemetry is not None:
+            self.telemetry.fail(endpoint)
+        return None
+
+    def _observe(self, endpoint: str, start: float, status: Optional[int]) -> None:
+        """记录一次尝试的耗时与状态码（网络错误时为 None）"""
+        if self.telemetry is not None:
+            self.telemetry.observe(endpoint, time.perf_counter() - start, status)
+
+    def _retry(self, endpoint: str) -> None:
+        if self.telemetry is not None:
+            self.telemetry.retry(endpoint)
+
+    def get_json(self, path: str, params: Optional[dict] = None) -> Dict[str, Any]:
+        """GET 并解析 JSON；失败返回 {}"""
+        resp = self.request("GET", path, params=params)
+        if resp is None or not resp.ok:
+            return {}
+        try:
+            return resp.json()
+        except ValueError:
+            return {}
+
+    def get_readme_text(self, full_name: str) -> Optional[str]:
+        """获取 README 原文（raw 格式，无需 base64 解码）；不存在或失败返回 None"""
+        resp = self.request("GET", f"/repos/{full_name}/readme", accept="application/vnd.github.raw")
+        if resp is None or resp.status_code != 200:
+            return None
+        return resp.content.decode('utf-8', errors='ignore')
+
+    def graphql(self, query: str, variables: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """执行 GraphQL 查询，返回完整响应 JSON；失败返回 None"""
+        resp = self.request("POST", "/graphql", json_body={"query": query, "variables": variables})
+        if resp is None or not resp.ok:
+            return None
+        try:
+            return resp.json()
+        except ValueError:
+            return None
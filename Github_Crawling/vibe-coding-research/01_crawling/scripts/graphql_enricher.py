@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphQL 批量补全 - 一次查询获取一批仓库的 README / topics / stars / owner 类型
+
+REST 每个 README 需要 1 次请求；GraphQL 的 nodes(ids:) 一次可取 ENRICH_BATCH_SIZE 个仓库，
+README 通过 object(expression: "HEAD:README.md") 直接读取 Blob 文本。
+
+同时读取根目录文件名列表：
+- 命中候选文件名 -> 直接返回 README 文本
+- 根目录没有任何 readme* 文件 -> 标记 no_readme，调用方无需再请求 REST
+- 其余情况（README.rst 等其他文件名、二进制、空仓库、节点失效）-> 不返回 README，由调用方回退 REST
+
+请求经由共用的 GitHubClient 发出，graphql 配额同样按 token 轮换。
+可被流水线的多个 README 线程同时调用（统计在锁内更新）。
+"""
+
+from threading import Lock
+from typing import Dict, Any, List
+
+from github_client import GitHubClient
+
+README_CANDIDATES = ["README.md", "readme.md", "Readme.md", "README"]
+ENRICH_BATCH_SIZE = 50     # 每次查询的仓库数（nodes 上限 100）
+MAX_TOPICS = 20
+
+
+def _build_query() -> str:
+    readme_fields = "\n".join(
+        f'      readme{i}: object(expression: "HEAD:{name}") {{ ... on Blob {{ text isBinary }} }}'
+        for i, name in enumerate(README_CANDIDATES)
+    )
+    return f"""query($ids: [ID!]!) {{
+  nodes(ids: $ids) {{
+    ... on Repository {{
+      id
+      databaseId
+      nameWithOwner
+      stargazerCount
+      owner {{ __typename login }}
+      repositoryTopics(first: {MAX_TOPICS}) {{ nodes {{ topic {{ name }} }} }}
+{readme_fields}
+      rootTree: object(expression: "HEAD:") {{ ... on Tree {{ entries {{ name }} }} }}
+    }}
+  }}
+  rateLimit {{ cost remaining resetAt }}
+}}"""
+
+
+ENRICH_QUERY = _build_query()
+
+
+def parse_node(node: Dict[str, Any]) -> Dict[str, Any]:
+    """把单个 Repository 节点解析为补全信息"""
+    readme = None
+    for i in range(len(README_CANDIDATES)):
+        blob = node.get(f"readme{i}")
+        if blob and not blob.get("isBinary") and blob.get("text") is not None:
+            readme = blob["text"]
+            break
+
+    no_readme = False
+    tree = node.get("rootTree")
+    if readme is None and tree and tree.get("entries") is not None:
+        no_readme = not any(e["name"].lower().startswith("readme") for e in tree["entries"])
+
+    owner = node.get("owner") or {}
+    topics = (node.get("repositoryTopics") or {}).get("nodes") or []
+    return {
+        "id": node.get("databaseId"),
+        "full_name": node.get("nameWithOwner"),
+        "stars": node.get("stargazerCount"),
+        "owner_login": owner.get("login"),
+        "owner_type": owner.get("__typename"),
+        "topics": [t["topic"]["name"] for t in topics if t and t.get("topic")],
+        "readme": readme,
+        "no_readme": no_readme,
+    }
+
+
+class GraphQLEnricher:
+    """按 node_id 批量查询仓库补全信息"""
+
+    def __init__(self, client: GitHubClient):
+        self.client = client
+        self.stats = {
+            "queries": 0,
+            "failed_queries": 0,
+            "nodes": 0,
+            "readme_hits": 0,
+            "no_readme": 0,
+        }
+        self.rate_limit: Dict[str, Any] = {}
+        self.lock = Lock()
+
+    def fetch_batch(self, node_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        查询一批仓库（最多 100 个）
+        返回: {node_id: 补全信息}；查询失败或节点失效的仓库不在结果中
+        """
+        if not node_ids:
+            return {}
+
+        payload = self.client.graphql(ENRICH_QUERY, {"ids": node_ids})
+        data = payload.get("data") if payload else None
+        if not data:
+            # 请求失败或整体失败（如 RATE_LIMITED），全部交给 REST 回退
+            with self.lock:
+                self.stats["queries"] += 1
+                self.stats["failed_queries"] += 1
+            return {}
+
+        results = {}
+        for node in data.get("nodes") or []:
+            if not node or not node.get("id"):
+                continue
+            results[node["id"]] = parse_node(node)
+
+        with self.lock:
+            self.rate_limit = data.get("rateLimit") or {}
+            self.stats["queries"] += 1
+            self.stats["nodes"] += len(results)
+            self.stats["readme_hits"] += sum(1 for info in results.values() if info["readme"] is not None)
+            self.stats["no_readme"] += sum(1 for info in results.values()
+                                           if info["readme"] is None and info["no_readme"])
+        return results
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GitHub API 条件请求缓存 - 重跑 / 补爬时复用已下载的搜索页和 README
+
+- 以 (Accept, URL, 排序后的参数) 为键，保存 200 响应的正文和 ETag / Last-Modified
+- 再次请求同一资源时带上 If-None-Match / If-Modified-Since；GitHub 返回 304 时不计入速率限制，
+  正文直接取自缓存
+- 总大小超过 max_bytes 时按最近使用时间淘汰 (LRU)，淘汰到上限的 90% 为止
+- 与断点索引一样存放在 SQLite (WAL) 中，多线程共用一个连接；写入每 CACHE_COMMIT_EVERY 次提交一次，
+  缓存只影响请求次数，崩溃时丢失最后一批写入无妨
+
+只缓存 GET：GraphQL 不支持条件请求。
+"""
+
+import json
+import os
+import sqlite3
+import time
+from threading import Lock
+from typing import Optional, Dict, Any, Tuple
+from urllib.parse import urlencode
+
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_MB", "512")) * 1024 * 1024  # 缓存总大小上限
+CACHE_COMMIT_EVERY = 50   # 每写入多少次提交一次
+CACHE_EVICT_RATIO = 0.9   # 超限时淘汰到上限的多少
+# 304 响应没有正文相关的头，命中时从缓存补回这些头
+CACHED_HEADERS = ["Content-Type", "Link", "ETag", "Last-Modified"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+
+def cache_key(url: str, params: Optional[dict] = None, accept: str = "") -> str:
+    """同一资源、同一格式对应同一个键（参数顺序无关）"""
+    query = urlencode(sorted((params or {}).items()))
+    return f"{accept} {url}?{query}" if query else f"{accept} {url}"
+
+
+class HttpCache:
+    """ETag / Last-Modified 条件请求缓存（线程安全）"""
+
+    def __init__(self, path: str, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.lock = Lock()
+        self._pending = 0
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        self.stats = {
+            "hits": 0,          # 304，正文取自缓存
+            "misses": 0,        # 没有缓存，或缓存已过期（服务器返回了新正文）
+            "stored": 0,
+            "evicted": 0,
+            "bytes_saved": 0,   # 命中时少下载的正文字节数
+        }
+
+    def lookup(self, key: str) -> Optional[Dict[str, str]]:
+        """返回条件请求头；没有缓存时返回 None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        headers = {}
+        if row[0]:
+            headers["If-None-Match"] = row[0]
+        if row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def hit(self, key: str) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """服务器返回 304：取出缓存的 (响应头, 正文) 并刷新使用时间"""
+        with self.lock:
+            row = self.conn.execute("SELECT headers, body FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                # 304 与淘汰之间的竞态：按未命中处理，调用方重新请求
+                return None
+            self.conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._note_write()
+            self.stats["hits"] += 1
+            self.stats["bytes_saved"] += len(row[1])
+        return json.loads(row[0]), row[1]
+
+    def store(self, key: str, headers, body: bytes) -> None:
+        """保存 200 响应；没有 ETag / Last-Modified 的响应无法重新验证，只计未命中"""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        with self.lock:
+            self.stats["misses"] += 1
+            if not etag and not last_modified:
+                return
+            kept = {h: headers[h] for h in CACHED_HEADERS if h in headers}
+            old = self.conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (key, etag, last_modified, headers, body, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, json.dumps(kept), body, len(body), time.time()))
+            self.total_bytes += len(body) - (old[0] if old else 0)
+            self.stats["stored"] += 1
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+            self._note_write()
+
+    def _evict(self) -> None:
+        """按 last_used 从旧到新删除，直到总大小回到上限的 CACHE_EVICT_RATIO"""
+        target = self.max_bytes * CACHE_EVICT_RATIO
+        rows = self.conn.execute("SELECT key, size FROM entries ORDER BY last_used").fetchall()
+        victims = []
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            victims.append((key,))
+            self.total_bytes -= size
+        self.conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self.stats["evicted"] += len(victims)
+
+    def _note_write(self) -> None:
+        self._pending += 1
+        if self._pending >= CACHE_COMMIT_EVERY:
+            self.conn.commit()
+            self._pending = 0
+
+    def summary(self) -> Dict[str, Any]:
+        """命中率与缓存占用，供各爬虫结束时打印"""
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "entries": entries,
+                "size_mb": self.total_bytes / 1024 / 1024,
+                "max_mb": self.max_bytes / 1024 / 1024,
+            }
+
+    def report(self) -> str:
+        """一行命中 / 未命中报告"""
+        s = self.summary()
+        return (f"命中(304) {s['hits']} | 未命中 {s['misses']} | 命中率 {s['hit_rate']*100:.1f}% | "
+                f"少下载 {s['bytes_saved'] / 1024 / 1024:.1f}MB | "
+                f"缓存 {s['entries']} 条 {s['size_mb']:.1f}/{s['max_mb']:.0f}MB | 淘汰 {s['evicted']}")
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.commit()
+            self.conn.close()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+预编译噪音过滤引擎 - 每个字段一个合并正则，一次扫描得到命中的类别和关键词
+
+原实现对每个仓库逐类别、逐关键词执行 `keyword in desc or keyword in name`，
+项目名模式再逐条 re.search。这里把关键词按 (类别顺序, 列表顺序) 编号：
+- 所有关键词合并为一个前缀树形式的正则（如 config(?:uration)?），不带捕获组，
+  一次 search 判断是否命中（绝大多数仓库在这一步就结束）
+- 命中时用前瞻 (?=...) 从命中位置起扫描每个命中位置；同一位置上贪婪匹配得到最长关键词，
+  在该位置命中的其他关键词都是它的前缀，预先算好"最长关键词 -> 其前缀中的最小编号"，
+  取所有位置的最小编号即与原来的逐条判断完全一致
+- 项目名模式同理合并为一个交替正则，命中时按分支编号取最小
+
+判断顺序与原 check_noise 相同：
+fork -> 空项目 -> owner 黑名单 -> 项目名模式 -> 关键词类别(教育/算法/配置/Awesome/教程/描述) -> topics 黑名单
+"""
+
+import re
+from typing import Optional, Dict, List, Tuple
+
+# (统计键, 原因前缀, NOISE_FILTERS 键, 是否也匹配项目名)，顺序即优先级
+KEYWORD_CATEGORIES = [
+    ("education", "education", "education_keywords", True),
+    ("algorithm", "algorithm", "algorithm_keywords", True),
+    ("config", "config", "config_keywords", True),
+    ("awesome", "awesome", "awesome_keywords", True),
+    ("tutorial", "tutorial", "tutorial_keywords", True),
+    ("desc_keyword", "desc", "desc_keywords", False),
+]
+
+
+def _trie_regex(words: List[str]) -> str:
+    """把关键词列表转成前缀树正则；可选后缀贪婪匹配，同一位置总是得到最长的关键词"""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+class _KeywordMatcher:
+    """字面关键词匹配：返回文本中命中关键词的最小编号"""
+
+    def __init__(self, ranked: List[Tuple[int, str]]):
+        self.any_re = self.scan_re = None
+        if not ranked:
+            return
+        rank_of = {}
+        for rank, word in ranked:
+            rank_of.setdefault(word, rank)
+        # 最长关键词 -> 它的所有前缀关键词（含自身）中的最小编号
+        self.best_rank = {
+            word: min(r for w, r in rank_of.items() if word.startswith(w))
+            for word in rank_of
+        }
+        pattern = _trie_regex(list(rank_of))
+        self.any_re = re.compile(pattern)
+        self.scan_re = re.compile(f"(?=({pattern}))")
+
+    def best(self, text: str) -> Optional[int]:
+        if self.any_re is None or not text:
+            return None
+        m = self.any_re.search(text)
+        if m is None:
+            return None
+        best = self.best_rank[m.group()]
+        # 前面的位置都没有命中，从首个命中位置之后继续找编号更小的
+        for m in self.scan_re.finditer(text, m.start() + 1):
+            best = min(best, self.best_rank[m.group(1)])
+        return best
+
+
+class _PatternMatcher:
+    """正则模式匹配：返回命中的最小模式编号"""
+
+    def __init__(self, patterns: List[str]):
+        self.any_re = self.scan_re = None
+        if not patterns:
+            return
+        self.any_re = re.compile("|".join(f"(?:{p})" for p in patterns))
+        body = "|".join(f"({p})" for p in patterns)
+        self.scan_re = re.compile(f"(?=(?:{body}))")
+
+    def best(self, text: str) -> Optional[int]:
+        if self.any_re is None or not text:
+            return None
+        m = self.any_re.search(text)
+        if m is None:
+            return None
+        # 交替分支按编号排列，同一位置先匹配编号最小的分支
+        return min(m.lastindex - 1 for m in self.scan_re.finditer(text, m.start()))
+
+
+class NoiseFilter:
+    """由 NOISE_FILTERS 构建的预编译过滤器"""
+
+    def __init__(self, filters: Dict[str, List[str]]):
+        self.owner_blacklist = frozenset(filters["owner_blacklist"])
+        self.topic_blacklist = frozenset(filters["topic_blacklist"])
+
+        self.name_patterns = list(filters["name_patterns"])
+        self.name_matcher = _PatternMatcher(self.name_patterns)
+
+        # 关键词按优先级编号；重复关键词只保留第一次出现的位置
+        self.keywords: List[Tuple[str, str, str]] = []  # (统计键, 原因前缀, 关键词)
+        name_keywords, desc_keywords = [], []
+        seen = set()
+        for stat_key, prefix, filter_key, match_name in KEYWORD_CATEGORIES:
+            for keyword in filters[filter_key]:
+                if (prefix, keyword) in seen:
+                    continue
+                seen.add((prefix, keyword))
+                rank = len(self.keywords)
+                self.keywords.append((stat_key, prefix, keyword))
+                desc_keywords.append((rank, keyword))
+                if match_name:
+                    name_keywords.append((rank, keyword))
+
+        self.name_kw_matcher = _KeywordMatcher(name_keywords)
+        self.desc_kw_matcher = _KeywordMatcher(desc_keywords)
+
+    def match(self, owner: str, name: str, desc: str, topics: List[str],
+              fork: bool, size: int) -> Tuple[Optional[str], str]:
+        """
+        输入均已转为小写
+        返回: (统计键, 原因)；不是噪音时返回 (None, "")
+        """
+        if fork:
+            return "fork", "fork"
+        if size == 0:
+            return "empty_repo", "empty_repo"
+        if owner in self.owner_blacklist:
+            return "owner_blacklist", f"owner_blacklist:{owner}"
+
+        idx = self.name_matcher.best(name)
+        if idx is not None:
+            return "name_pattern", f"name_pattern:{self.name_patterns[idx]}"
+
+        best = self.desc_kw_matcher.best(desc)
+        rank = self.name_kw_matcher.best(name)
+        if rank is not None:
+            best = rank if best is None else min(best, rank)
+        if best is not None:
+            stat_key, prefix, keyword = self.keywords[best]
+            return stat_key, f"{prefix}:{keyword}"
+
+        for topic in topics:
+            if topic in self.topic_blacklist:
+                return "topic_blacklist", f"topic:{topic}"
+
+        return None, ""
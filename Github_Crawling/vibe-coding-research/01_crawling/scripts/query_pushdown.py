@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+查询下推 - 把能在服务端完成的噪音过滤写进搜索查询，被排除的仓库不再占用分页和配额
+
+按优先级依次追加，直到查询长度达到上限：
+1. fork:false archived:false
+2. NOT 关键词（GitHub 最多 5 个布尔运算符）
+3. -user:owner（GitHub 的 user: 限定词同时匹配个人和组织账号，一个 owner 只需一个限定词）
+
+放不下的 owner 仍由本地 is_noise 过滤，结果不变，只是少省一些请求。
+NOT 关键词应选本地过滤一定会排除的词（同时在关键词列表和 topic 黑名单中），
+服务端按词匹配 name/description/topics，本地按子串匹配，服务端排除的仓库是本地排除集合的子集。
+"""
+
+from typing import List
+
+SEARCH_QUERY_MAX_LEN = 256    # GitHub 搜索查询长度上限
+MAX_BOOLEAN_OPERATORS = 5     # AND / OR / NOT 运算符上限
+QUERY_SLACK = 16              # 子切片的 size/stars 区间可能比根切片多几个字符
+PUSHDOWN_QUALIFIERS = ["fork:false", "archived:false"]
+
+
+class QueryPushdown:
+    """根据基础查询的长度挑选能放下的排除条件"""
+
+    def __init__(self, owner_blacklist: List[str], not_terms: List[str],
+                 max_len: int = SEARCH_QUERY_MAX_LEN, slack: int = QUERY_SLACK):
+        self.owner_blacklist = list(dict.fromkeys(o.lower() for o in owner_blacklist))
+        self.not_terms = list(not_terms)[:MAX_BOOLEAN_OPERATORS]
+        self.max_len = max_len
+        self.slack = slack
+        # 最近一次 exclusions() 实际下推的内容，用于报告
+        self.pushed_terms: List[str] = []
+        self.pushed_owners: List[str] = []
+
+    def exclusions(self, base_query: str) -> str:
+        """返回追加到 base_query 之后的排除条件（不含前导空格）"""
+        budget = self.max_len - self.slack - len(base_query)
+        parts: List[str] = []
+
+        def fits(term: str) -> bool:
+            nonlocal budget
+            if budget < len(term) + 1:
+                return False
+            parts.append(term)
+            budget -= len(term) + 1
+            return True
+
+        for qualifier in PUSHDOWN_QUALIFIERS:
+            fits(qualifier)
+
+        self.pushed_terms = []
+        for term in self.not_terms:
+            if fits(f'NOT "{term}"' if " " in term else f"NOT {term}"):
+                self.pushed_terms.append(term)
+
+        self.pushed_owners = []
+        for owner in self.owner_blacklist:
+            if fits(f"-user:{owner}"):
+                self.pushed_owners.append(owner)
+
+        return " ".join(parts)
+
+    def describe(self, base_query: str) -> str:
+        """一行说明 base_query 能下推的内容"""
+        self.exclusions(base_query)
+        local = len(self.owner_blacklist) - len(self.pushed_owners)
+        return (f"{' '.join(PUSHDOWN_QUALIFIERS)}, NOT x{len(self.pushed_terms)}, "
+                f"-user: x{len(self.pushed_owners)}（其余 {local} 个 owner 本地过滤）")
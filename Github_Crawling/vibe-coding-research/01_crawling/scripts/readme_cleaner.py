@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+README markdown → 纯文本清理（各爬虫共用）
+
+原来每个爬虫各自对 README 串行执行 8~9 次 re.sub（代码块、行内代码、图片、链接、HTML 标签、
+标题、粗体、斜体、空白），每轮都生成一份新字符串；而且 `\\[[^\\]]+\\]`、`<[^>]+>` 这类模式
+遇到未闭合的 `[` / `<` 时每个起点都要扫到文末，大 README 上退化为平方时间。这里改为：
+
+1. 代码：预编译的两个正则（先 ``` 代码块，再行内代码）替换为占位标记；这两个模式的失败尝试
+   最多扫到下一个反引号（未闭合的 ``` 至多一个），本身就是线性的
+2. 其余规则（图片、链接、HTML 标签、标题、粗体、斜体）都只删除字符：不再生成中间字符串，
+   在代码替换后的文本上共用一个保留掩码，按原来的先后顺序逐条扫描；每条规则用 str.find 跳到
+   自己的开标记，闭合符的位置缓存、只前进不后退，"下一个未删除字符" 用 bytearray.find 查找，整体线性时间
+3. 按掩码一次拼出保留的文本段，再规范化空白
+
+规则的先后顺序、最左优先和不重叠匹配与原来逐轮 re.sub 完全一致，输出逐字相同
+（见 benchmarks/bench_readme_cleaner.py 的一致性检查）。
+"""
+
+import re
+from functools import partial
+from typing import List, Tuple
+
+# 代码块 / 行内代码的占位标记（crawler_vibe_coders 的默认值）
+CODE_BLOCK_MARK = "\n[CODE_BLOCK]\n"
+INLINE_CODE_MARK = "[code]"
+
+_FENCE = re.compile(r"```[\s\S]*?```")
+_INLINE_CODE = re.compile(r"`[^`]+`")
+_STAR = re.compile(r"\*")
+_KEPT = re.compile(rb"\x01+")
+
+
+class _Scan:
+    """一篇文本 + 保留掩码（1 = 保留, 0 = 已删除）"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.keep = bytearray(b"\x01") * len(text)
+        # next_alive(pos): pos 及之后第一个未删除字符的位置，没有返回 -1
+        self.next_alive = partial(self.keep.find, 1)
+        self.deleted = False
+
+    def find(self, ch: str, pos: int) -> int:
+        """pos 及之后第一个未删除的 ch，没有返回 -1；落在已删除区间内时整段跳过"""
+        text, keep = self.text, self.keep
+        p = text.find(ch, pos)
+        while p >= 0 and not keep[p]:
+            p = keep.find(1, p)
+            if p < 0:
+                break
+            p = text.find(ch, p)
+        return p
+
+    def delete(self, spans: List[Tuple[int, int]]) -> None:
+        """删除闭区间 [start, end]；每条规则扫描完后统一写入（^ 等判断基于规则开始前的文本）"""
+        keep = self.keep
+        for start, end in spans:
+            keep[start:end + 1] = bytes(end + 1 - start)
+        self.deleted = self.deleted or bool(spans)
+
+    def result(self) -> str:
+        text = self.text
+        if not self.deleted:
+            return text
+        return "".join([text[a:b] for a, b in (m.span() for m in _KEPT.finditer(self.keep))])
+
+
+def _strip_images(scan: _Scan) -> None:
+    """!\\[([^\\]]*)\\]\\([^)]+\\) -> 删除（删除类规则中的第一条，此时还没有字符被删除）"""
+    text = scan.text
+    spans = []
+    close = end = -1  # 缓存的 ] / ) 位置，查询位置只增不减
+    i = text.find("![")
+    while i >= 0:
+        if close <= i + 1:
+            close = text.find("]", i + 2)
+            if close < 0:
+                break
+        if text.startswith("(", close + 1):
+            if end <= close + 1:
+                end = text.find(")", close + 2)
+                if end < 0:
+                    break
+            if end > close + 2:
+                spans.append((i, end))
+                i = text.find("![", end + 1)
+                continue
+        i = text.find("![", i + 1)
+    scan.delete(spans)
+
+
+def _strip_links(scan: _Scan) -> None:
+    """\\[([^\\]]+)\\]\\([^)]+\\) -> 链接文字"""
+    text, keep, find, nxt = scan.text, scan.keep, scan.find, scan.next_alive
+    spans = []
+    close = end = -1
+    i = find("[", 0)
+    while i >= 0:
+        if close <= i:
+            close = find("]", i + 1)
+            if close < 0:
+                break
+        paren = nxt(close + 1)
+        if paren >= 0 and text[paren] == "(" and nxt(i + 1) != close:
+            if end <= paren:
+                end = find(")", paren + 1)
+                if end < 0:
+                    break
+            if nxt(paren + 1) != end:
+                spans += ((i, i), (close, end))
+                i = end
+        # 下一个 [：多数情况下未被删除，直接 str.find
+        i = text.find("[", i + 1)
+        if i >= 0 and not keep[i]:
+            i = find("[", i)
+    scan.delete(spans)
+
+
+def _strip_tags(scan: _Scan) -> None:
+    """<[^>]+> -> 删除"""
+    find, nxt = scan.find, scan.next_alive
+    spans = []
+    end = -1
+    i = find("<", 0)
+    while i >= 0:
+        if end <= i:
+            end = find(">", i + 1)
+            if end < 0:
+                break
+        if nxt(i + 1) != end:
+            spans.append((i, end))
+            i = find("<", end + 1)
+        else:
+            i = find("<", i + 1)
+    scan.delete(spans)
+
+
+def _strip_headings(scan: _Scan) -> None:
+    """^#+\\s*（多行模式）-> 删除"""
+    text, keep, find, nxt = scan.text, scan.keep, scan.find, scan.next_alive
+    spans = []
+    i = find("#", 0)
+    while i >= 0:
+        prev = keep.rfind(1, 0, i)
+        if prev >= 0 and text[prev] != "\n":
+            i = find("#", i + 1)
+            continue
+        end, p = i, nxt(i + 1)
+        while p >= 0 and text[p] == "#":
+            end, p = p, nxt(p + 1)
+        while p >= 0 and text[p].isspace():
+            end, p = p, nxt(p + 1)
+        spans.append((i, end))
+        i = find("#", end + 1)
+    scan.delete(spans)
+
+
+def _alive_stars(scan: _Scan) -> List[int]:
+    keep = scan.keep
+    return [p for p in (m.start() for m in _STAR.finditer(scan.text)) if keep[p]]
+
+
+def _strip_bold(scan: _Scan) -> None:
+    """\\*\\*([^*]+)\\*\\* -> 内容"""
+    stars, nxt = _alive_stars(scan), scan.next_alive
+    spans, k = [], 0
+    while k + 3 < len(stars):
+        a, b, c, d = stars[k:k + 4]
+        # 开、闭各两个相邻的 *，中间至少一个字符
+        if nxt(a + 1) == b and nxt(b + 1) != c and nxt(c + 1) == d:
+            spans += ((a, b), (c, d))
+            k += 4
+        else:
+            k += 1
+    scan.delete(spans)
+
+
+def _strip_italic(scan: _Scan) -> None:
+    """\\*([^*]+)\\* -> 内容"""
+    stars, nxt = _alive_stars(scan), scan.next_alive
+    spans, k = [], 0
+    while k + 1 < len(stars):
+        a, b = stars[k], stars[k + 1]
+        if nxt(a + 1) != b:
+            spans += ((a, a), (b, b))
+            k += 2
+        else:
+            k += 1
+    scan.delete(spans)
+
+
+class ReadmeCleaner:
+    """
+    README 清理器：规则与原来逐轮 re.sub 相同
+    code_block / inline_code: 代码块与行内代码的占位标记
+    strip_headings: 删除行首的 # 标题标记（^#+\\s*）
+    strip_italic: 去掉 *斜体* 标记
+    """
+
+    def __init__(self, code_block: str = CODE_BLOCK_MARK, inline_code: str = INLINE_CODE_MARK,
+                 strip_headings: bool = False, strip_italic: bool = True):
+        self.code_block = code_block
+        self.inline_code = inline_code
+        # 作为 re.sub 的替换模板，反斜杠需要转义
+        self._fence_repl = code_block.replace("\\", "\\\\")
+        self._inline_repl = inline_code.replace("\\", "\\\\")
+        self.strip_headings = strip_headings
+        self.strip_italic = strip_italic
+
+    def clean(self, text: str) -> str:
+        """markdown → 单行纯文本（空白规范化为单个空格，去首尾空白）"""
+        text = _INLINE_CODE.sub(self._inline_repl, _FENCE.sub(self._fence_repl, text))
+        scan = _Scan(text)
+        _strip_images(scan)
+        _strip_links(scan)
+        _strip_tags(scan)
+        if self.strip_headings:
+            _strip_headings(scan)
+        _strip_bold(scan)
+        if self.strip_italic:
+            _strip_italic(scan)
+        return " ".join(scan.result().split())
+
+
+# crawler_vibe_coders 的清理规则
+DEFAULT_CLEANER = ReadmeCleaner()
+
+
+def clean_readme(text: str) -> str:
+    """用默认规则清理 README"""
+    return DEFAULT_CLEANER.clean(text)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+README 内容寻址存储 - 模板克隆（create-next-app、Vite 模板等）的相同 README 只存一份
+
+- 键为规范化文本的 SHA-256：去掉 BOM、统一换行、去掉行尾空白和首尾空行，
+  只有这些差异的 README 视为同一份
+- 数据集记录中只保存 readme_hash，正文（zlib 压缩）存放在 SQLite 中；refs 记录引用次数，用于计算去重率
+- 与断点索引一样使用 SQLite (WAL)，多线程共用一个连接；每次写入立即提交（自动提交模式），
+  README 总是先于引用它的 JSONL 记录落盘，中断后不会出现指向不存在 README 的记录
+- 分片爬取合并时用 add_ref 把合并进来的记录引用的 README 复制到主存储
+- 增量刷新替换记录的 README 时用 unref 减少旧 README 的引用（正文保留，分类结果可能仍引用它）
+- 分类器按 readme_hash 分组，同一份 README 只调用一次 API（见 deepseek_analyzer_8cat）
+"""
+
+import hashlib
+import sqlite3
+import zlib
+from threading import Lock
+from typing import Optional, Dict, Any
+
+README_ZLIB_LEVEL = 6  # 正文压缩级别
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS readmes (
+    hash TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    refs INTEGER NOT NULL
+);
+"""
+
+
+def normalize_readme(text: str) -> str:
+    """规范化：去 BOM、统一换行、去行尾空白和首尾空行"""
+    text = text.lstrip("\ufeff").replace("\r\n", "\n").replace("\r", "\n")
+    return "\n".join(line.rstrip() for line in text.split("\n")).strip("\n")
+
+
+def readme_hash(text: str) -> str:
+    """规范化文本的 SHA-256（十六进制）"""
+    return hashlib.sha256(normalize_readme(text).encode("utf-8")).hexdigest()
+
+
+class ReadmeStore:
+    """SHA-256 -> README 正文（线程安全）"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.lock = Lock()
+        self.stats = {
+            "puts": 0,        # 本次运行写入的 README 数
+            "new": 0,         # 其中首次出现的
+        }
+
+    def put(self, text: Optional[str]) -> Optional[str]:
+        """保存 README，返回其哈希；空 README 返回 None"""
+        if not text:
+            return None
+        normalized = normalize_readme(text)
+        if not normalized:
+            return None
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        with self.lock:
+            self.stats["puts"] += 1
+            cursor = self.conn.execute("UPDATE readmes SET refs = refs + 1 WHERE hash = ?", (digest,))
+            if cursor.rowcount == 0:
+                body = normalized.encode("utf-8")
+                self.conn.execute("INSERT INTO readmes (hash, body, size, refs) VALUES (?, ?, ?, 1)",
+                                  (digest, zlib.compress(body, README_ZLIB_LEVEL), len(body)))
+                self.stats["new"] += 1
+        return digest
+
+    def get(self, digest: Optional[str]) -> Optional[str]:
+        """按哈希取 README 正文（规范化后的文本）；不存在时返回 None"""
+        if not digest:
+            return None
+        with self.lock:
+            row = self.conn.execute("SELECT body FROM readmes WHERE hash = ?", (digest,)).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def add_ref(self, digest: str, source: "ReadmeStore") -> bool:
+        """
+        合并分片时登记一条引用：已有则引用数 +1，否则从 source（分片的存储）复制正文
+        返回: source 中也没有该 README 时返回 False
+        """
+        with self.lock:
+            cursor = self.conn.execute("UPDATE readmes SET refs = refs + 1 WHERE hash = ?", (digest,))
+            if cursor.rowcount:
+                return True
+        with source.lock:
+            row = source.conn.execute("SELECT body, size FROM readmes WHERE hash = ?", (digest,)).fetchone()
+        if row is None:
+            return False
+        with self.lock:
+            self.conn.execute("INSERT INTO readmes (hash, body, size, refs) VALUES (?, ?, ?, 1)",
+                              (digest, row[0], row[1]))
+        return True
+
+    def unref(self, digest: Optional[str]) -> None:
+        """记录改为引用其他 README 时，旧 README 的引用数 -1"""
+        if not digest:
+            return
+        with self.lock:
+            self.conn.execute("UPDATE readmes SET refs = refs - 1 WHERE hash = ? AND refs > 0", (digest,))
+
+    def summary(self) -> Dict[str, Any]:
+        """去重效果：引用数、不同 README 数、去重率与节省的字节数"""
+        with self.lock:
+            unique, refs, unique_bytes, total_bytes, stored_bytes = self.conn.execute(
+                "SELECT COALESCE(SUM(refs > 0), 0), COALESCE(SUM(refs), 0), "
+                "COALESCE(SUM(CASE WHEN refs > 0 THEN size ELSE 0 END), 0), "
+                "COALESCE(SUM(size * refs), 0), COALESCE(SUM(LENGTH(body)), 0) FROM readmes").fetchone()
+        return {
+            **self.stats,
+            "unique": unique,
+            "refs": refs,
+            "dedup_ratio": 1 - unique / refs if refs else 0.0,
+            "total_bytes": total_bytes,      # 每条记录内嵌 README 时的总字节数
+            "unique_bytes": unique_bytes,    # 去重后
+            "stored_bytes": stored_bytes,    # 去重并压缩后
+        }
+
+    def report(self) -> str:
+        """一行去重报告"""
+        s = self.summary()
+        return (f"引用 {s['refs']} | 不同 README {s['unique']} | 去重率 {s['dedup_ratio']*100:.1f}% | "
+                f"{s['total_bytes'] / 1024 / 1024:.1f}MB -> 去重 {s['unique_bytes'] / 1024 / 1024:.1f}MB"
+                f" -> 压缩 {s['stored_bytes'] / 1024 / 1024:.1f}MB")
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+README 写作风格打分（像不像 AI 生成）—— 逐篇 + 批量
+
+七个信号与分值（原 VibeCodersCrawler.detect_readme_style）：
+    structured     ## Features / Installation / Getting Started / Tech Stack 标题   +15
+    ai_words       leverage / seamlessly / robust / empower / utilize                +10
+    emoji_headers  # / ## 标题以 emoji 开头                                          +10
+    perfect_list   ## 标题后紧跟 3 条以上 "- " 列表                                   +10
+    badges         shields.io 徽章，或同时有图片和 github.com 链接                     +8
+    mentions_ai    cursor / claude / copilot / gpt / ai generated ...                +30
+    good_length    150 < 词数 < 1000                                                  +10
+score >= 35 判为 AI 风格，confidence = min(score / 60, 1)，保留两位小数；不足 50 字符的 README 不打分。
+
+逐篇打分 detect_readme_style 返回原来的字典（爬虫 CSV 的 ai_style / ai_signals 等列）；
+批量打分 score_readmes 对一列 README 逐篇调用同一套规则，结果整理成 pandas.DataFrame
+（每个信号一列布尔值 + word_count / score / is_ai_like / confidence），两者只有一份打分代码。
+正则预编译、关键词组去掉包含组内其他词的词（chatgpt 含 gpt、cursorrules 含 cursor），结果与原实现相同
+（见 benchmarks/bench_readme_style.py 的一致性检查）。
+
+分析脚本中使用：
+    sys.path.insert(0, ".../01_crawling/scripts")
+    from readme_style import score_readmes
+    styles = score_readmes(df["readme_content"])      # 索引与 df 对齐
+
+命令行（数据集 .jsonl / .parquet 的 readme_content 列，见 dataset_store）：
+    python readme_style.py vibe_coding_dataset_2w.parquet [输出.csv] [readme_store.sqlite]
+
+批量打分需要 pandas（pip install pandas）；逐篇打分不需要。
+"""
+
+import os
+import re
+import sys
+import time
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import pandas as pd
+except ImportError:  # 只逐篇打分时不需要
+    pd = None
+
+MIN_README_CHARS = 50        # 短于此的 README 不打分
+AI_LIKE_SCORE = 35           # score >= 此值判为 AI 风格
+FULL_CONFIDENCE_SCORE = 60   # confidence = min(score / 此值, 1)
+GOOD_LENGTH_WORDS = (150, 1000)  # 词数在此开区间内加分
+
+AI_WORDS = ["leverage", "seamlessly", "robust", "empower", "utilize"]
+AI_TOOLS = ["cursor", "claude", "copilot", "gpt", "chatgpt", "ai generated", "cursorrules"]
+
+# 信号 -> 分值（顺序即 signals 列表的顺序；good_length 不计入 signals）
+SIGNAL_WEIGHTS = {
+    "structured": 15,
+    "ai_words": 10,
+    "emoji_headers": 10,
+    "perfect_list": 10,
+    "badges": 8,
+    "mentions_ai": 30,
+}
+GOOD_LENGTH_WEIGHT = 10
+
+_STRUCTURED = re.compile(r'##\s+(features|installation|getting started|tech stack)')
+_EMOJI_HEADER = re.compile(r'^##?\s+[\U0001F300-\U0001F9FF]', re.MULTILINE)
+_PERFECT_LIST = re.compile(r'##\s+\w+\s*\n+(?:-\s+.+\n+){3,}')
+
+
+def _shortest(words: List[str]) -> List[str]:
+    """去掉包含组内其他词的词（"任一词出现" 的结果不变）"""
+    return [w for w in words if not any(o != w and o in w for o in words)]
+
+
+_AI_WORD_PROBES = _shortest(AI_WORDS)
+_AI_TOOL_PROBES = _shortest(AI_TOOLS)
+
+
+def _confidence(score: int) -> float:
+    return round(min(score / FULL_CONFIDENCE_SCORE, 1.0), 2)
+
+
+def _score(readme: str) -> Tuple[Dict[str, bool], int, int]:
+    """打分规则（逐篇与批量共用）；返回: (各信号是否命中, 词数, 总分)"""
+    text_lower = readme.lower()
+    hits = {
+        "structured": _STRUCTURED.search(text_lower) is not None,
+        "ai_words": any(w in text_lower for w in _AI_WORD_PROBES),
+        "emoji_headers": _EMOJI_HEADER.search(readme) is not None,
+        "perfect_list": _PERFECT_LIST.search(readme) is not None,
+        "badges": "shields.io" in readme or ("![" in readme and "github.com" in readme),
+        "mentions_ai": any(t in text_lower for t in _AI_TOOL_PROBES),
+    }
+    score = sum(SIGNAL_WEIGHTS[name] for name, hit in hits.items() if hit)
+
+    word_count = len(readme.split())
+    hits["good_length"] = GOOD_LENGTH_WORDS[0] < word_count < GOOD_LENGTH_WORDS[1]
+    if hits["good_length"]:
+        score += GOOD_LENGTH_WEIGHT
+    return hits, word_count, score
+
+
+def detect_readme_style(readme: str) -> dict:
+    """
+    检测README写作风格是否像AI生成
+    不依赖关键词匹配，而是看写作特征
+    """
+    if not readme or len(readme) < MIN_README_CHARS:
+        return {"is_ai_like": False, "confidence": 0}
+
+    hits, word_count, score = _score(readme)
+    return {
+        "is_ai_like": score >= AI_LIKE_SCORE,
+        "confidence": _confidence(score),
+        "signals": [name for name in SIGNAL_WEIGHTS if hits[name]],
+        "word_count": word_count
+    }
+
+
+def _require_pandas() -> None:
+    if pd is None:
+        raise RuntimeError("批量打分需要 pandas: pip install pandas")
+
+
+def score_readmes(readmes: Iterable) -> "pd.DataFrame":
+    """
+    批量打分：readmes 为 README 列表或 pandas.Series（None / NaN 视为空 README）
+    返回 DataFrame，每篇一行（Series 输入时沿用其索引）：
+        structured ... mentions_ai, good_length  各信号是否命中 (bool)
+        word_count                               词数（未打分的短 README 为 0）
+        score / is_ai_like / confidence          总分、是否像 AI 生成、置信度
+        scored                                   是否打分（README 不少于 MIN_README_CHARS 字符）
+    """
+    _require_pandas()
+    index = readmes.index if isinstance(readmes, pd.Series) else None
+    names = list(SIGNAL_WEIGHTS) + ["good_length"]
+    columns = {name: [] for name in names + ["word_count", "score", "is_ai_like", "confidence", "scored"]}
+    for readme in readmes:
+        scored = isinstance(readme, str) and len(readme) >= MIN_README_CHARS
+        hits, word_count, score = _score(readme) if scored else (dict.fromkeys(names, False), 0, 0)
+        for name in names:
+            columns[name].append(hits[name])
+        columns["word_count"].append(word_count)
+        columns["score"].append(score)
+        columns["is_ai_like"].append(score >= AI_LIKE_SCORE)
+        columns["confidence"].append(_confidence(score))
+        columns["scored"].append(scored)
+    return pd.DataFrame(columns, index=index)
+
+
+def main():
+    sys.stdout.reconfigure(encoding='utf-8')
+    if len(sys.argv) < 2:
+        print("用法: python readme_style.py <数据集.jsonl|.parquet> [输出.csv] [readme_store.sqlite]")
+        return
+    from dataset_store import load_dataset
+
+    source = sys.argv[1]
+    target = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(source)[0] + "_readme_style.csv"
+    store = sys.argv[3] if len(sys.argv) > 3 else None
+    records = load_dataset(source, ["id", "repo_name", "readme_content"], readme_store=store)
+
+    start = time.perf_counter()
+    frame = score_readmes([r.get("readme_content") for r in records])
+    elapsed = time.perf_counter() - start
+    frame.insert(0, "repo_name", [r.get("repo_name") for r in records])
+    frame.insert(0, "id", [r.get("id") for r in records])
+    frame.to_csv(target, index=False, encoding="utf-8")
+
+    scored = frame[frame["scored"]]
+    print(f"{source} -> {target}")
+    print(f"  README: {len(frame)} | 打分 {len(scored)} | 用时 {elapsed:.2f}s")
+    print(f"  AI 风格: {int(scored['is_ai_like'].sum())} ({scored['is_ai_like'].mean():.1%})")
+    for name in list(SIGNAL_WEIGHTS) + ["good_length"]:
+        print(f"    {name:14} {int(scored[name].sum()):7} ({scored[name].mean():.1%})")
+
+
+if __name__ == "__main__":
+    main()
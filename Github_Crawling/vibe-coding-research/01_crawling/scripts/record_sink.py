@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量落盘 - 爬虫和分析器共用的 JSONL(+CSV) 输出
+
+- 文件句柄常驻，记录先进缓冲区，满 batch_size 条或距上次落盘超过 flush_interval 秒时批量写入
+- 每条记录只构造一次 dict：JSONL 与 CSV 行都从同一个 dict 序列化
+- flush(fsync=True) 用于断点（进度文件、切片完成）之前，保证断点记录的内容已真正写到磁盘
+- write() 返回该记录在 JSONL 中的逻辑字节偏移，供断点续传索引使用
+- 线程安全：分析器的工作线程可直接写失败记录
+"""
+
+import csv
+import io
+import json
+import os
+import time
+from threading import Lock
+from typing import Optional, Dict, Any, List, Tuple
+
+SINK_BATCH_SIZE = 100       # 缓冲多少条记录后写入
+SINK_FLUSH_INTERVAL = 5.0   # 最长多少秒写入一次(秒)
+
+
+class RecordSink:
+    """JSONL (+ 可选 CSV) 批量追加写入"""
+
+    def __init__(self, jsonl_path: str, csv_path: Optional[str] = None,
+                 csv_fieldnames: Optional[List[str]] = None,
+                 batch_size: int = SINK_BATCH_SIZE, flush_interval: float = SINK_FLUSH_INTERVAL):
+        self.jsonl_path = jsonl_path
+        self.csv_path = csv_path
+        self.csv_fieldnames = csv_fieldnames
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.lock = Lock()
+        self._jsonl_file = None
+        self._csv_file = None
+        self._jsonl_buffer: List[bytes] = []
+        self._csv_buffer: List[str] = []
+        self._position: Optional[int] = None  # JSONL 逻辑长度（已写入 + 缓冲中）
+        self._last_flush = time.monotonic()
+        self.stats = {"records": 0, "flushes": 0, "fsyncs": 0}
+
+    def write(self, record: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        缓冲一条记录
+        返回: (记录起始偏移, 记录结束偏移)，均为 JSONL 字节位置
+        """
+        line = json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+        with self.lock:
+            if self._position is None:
+                self._position = os.path.getsize(self.jsonl_path) if os.path.exists(self.jsonl_path) else 0
+            offset = self._position
+            self._position += len(line)
+            self._jsonl_buffer.append(line)
+            if self.csv_path:
+                self._csv_buffer.append(self._csv_row(record))
+            self.stats["records"] += 1
+
+            if (len(self._jsonl_buffer) >= self.batch_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked(fsync=False)
+            return offset, self._position
+
+    def _csv_row(self, record: Dict[str, Any]) -> str:
+        if self.csv_fieldnames is None:
+            self.csv_fieldnames = list(record.keys())
+        buf = io.StringIO()
+        csv.DictWriter(buf, fieldnames=self.csv_fieldnames).writerow(record)
+        return buf.getvalue()
+
+    def flush(self, fsync: bool = False) -> None:
+        """写出缓冲区；fsync=True 时同时刷到磁盘（断点前调用）"""
+        with self.lock:
+            self._flush_locked(fsync)
+
+    def _flush_locked(self, fsync: bool) -> None:
+        self._last_flush = time.monotonic()
+        if self._jsonl_buffer:
+            if self._jsonl_file is None:
+                self._jsonl_file = open(self.jsonl_path, 'ab')
+            self._jsonl_file.write(b''.join(self._jsonl_buffer))
+            self._jsonl_file.flush()
+            self._jsonl_buffer = []
+            self.stats["flushes"] += 1
+
+        if self._csv_buffer:
+            if self._csv_file is None:
+                self._csv_file = self._open_csv()
+            self._csv_file.write(''.join(self._csv_buffer).encode('utf-8'))
+            self._csv_file.flush()
+            self._csv_buffer = []
+
+        if fsync:
+            for f in (self._jsonl_file, self._csv_file):
+                if f is not None:
+                    os.fsync(f.fileno())
+            self.stats["fsyncs"] += 1
+
+    def _open_csv(self):
+        """新文件写入 BOM + 表头（与 utf-8-sig 追加写入的结果一致）"""
+        f = open(self.csv_path, 'ab')
+        if f.tell() == 0:
+            buf = io.StringIO()
+            csv.DictWriter(buf, fieldnames=self.csv_fieldnames).writeheader()
+            f.write('\ufeff'.encode('utf-8') + buf.getvalue().encode('utf-8'))
+        return f
+
+    def close(self) -> None:
+        with self.lock:
+            self._flush_locked(fsync=True)
+            for f in (self._jsonl_file, self._csv_file):
+                if f is not None:
+                    f.close()
+            self._jsonl_file = None
+            self._csv_file = None
+            self._position = None  # 关闭后文件可能被替换（compact_jsonl），再次写入时重新读取长度
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
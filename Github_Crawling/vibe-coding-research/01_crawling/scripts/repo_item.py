@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索结果中的仓库 - 只保留爬虫用到的字段的紧凑记录
+
+搜索 API 每个仓库返回约 80 个字段（大部分是 *_url 模板），整页 JSON 解析后若原样在流水线队列中传递，
+每个在途仓库都带着一个大 dict 和嵌套的 owner / license dict。RepoItem 在解析后立即构造：
+- __slots__ 数据类，没有实例 __dict__，只引用需要的字段（字符串与解析出的 JSON 共享，不复制）
+- 纯数据，不持有客户端或会话引用，读取任何属性都不会触发网络请求
+  （不同于 PyGithub 的 Repository：owner.type、get_topics() 等会懒加载补全）
+- GraphQL 补全时直接改写 stars / topics / owner_type
+
+用法：
+    items = [RepoItem.from_search(item) for item in page["items"]]
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List
+
+
+@dataclass(slots=True)
+class RepoItem:
+    id: int
+    node_id: str
+    name: str
+    full_name: str
+    html_url: str
+    description: Optional[str]
+    language: Optional[str]
+    topics: List[str]
+    created_at: str
+    pushed_at: Optional[str]
+    size: int
+    stars: int
+    forks_count: int
+    open_issues: int
+    fork: bool
+    archived: bool
+    owner_login: str
+    owner_type: Optional[str]
+
+    @classmethod
+    def from_search(cls, item: Dict[str, Any]) -> "RepoItem":
+        """由搜索 API 返回的单个仓库 JSON 构造（缺失字段取与 API 默认一致的值）"""
+        owner = item.get("owner") or {}
+        return cls(
+            item["id"],
+            item.get("node_id", ""),
+            item["name"],
+            item["full_name"],
+            item["html_url"],
+            item.get("description"),
+            item.get("language"),
+            item.get("topics") or [],
+            item["created_at"],
+            item.get("pushed_at"),
+            item.get("size", 0),
+            item.get("stargazers_count", 0),
+            item.get("forks_count", 0),
+            item.get("open_issues_count", 0),
+            item.get("fork", False),
+            item.get("archived", False),
+            owner.get("login") or "",
+            owner.get("type"),
+        )
+
+    @property
+    def created_day(self) -> str:
+        """创建日期 YYYY-MM-DD（分层抽样的按天配额用）"""
+        return self.created_at[:10]
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可复现的分层抽样 - 用 (种子, 仓库 id) 的哈希代替 random.random()
+
+- 每个仓库的抽样值 u = hash(seed, id) ∈ [0, 1)，与爬取顺序、重启次数无关：
+  同一种子下，同一仓库的保留/跳过结论永远相同，缓存和断点续传的结果可以直接对比
+- 分层：stars <= tier1_threshold 为 silent（按 tier1_rate 保留），其余为 signal（全部保留）
+- 每天每层配额 (day_quota)：开始搜索某天前先读出该层当天的 total_count (plan_day)，
+  把保留阈值收紧到 min(rate, quota / total)，等价于按 u 取当天最小的约 quota 个（bottom-k 蓄水池抽样），
+  不必先把整天的结果缓存下来再挑，也不会多下载被淘汰仓库的 README；
+  total_count 中含本地过滤掉的噪音，阈值只会偏紧，计数硬上限兜底偏松的情况
+- 续传时已保存的仓库经 restore() 计入当天配额
+"""
+
+import hashlib
+from collections import Counter
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+
+def hash_unit(seed: str, repo_id: int) -> float:
+    """(种子, 仓库 id) -> [0, 1) 上的均匀值"""
+    digest = hashlib.blake2b(f"{seed}:{repo_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2 ** 64
+
+
+class StratifiedSampler:
+    """按哈希决定保留的分层抽样器（线程安全）"""
+
+    def __init__(self, seed: str, tier1_threshold: int, tier1_rate: float,
+                 day_quota: Optional[Dict[str, Optional[int]]] = None):
+        self.seed = seed
+        self.tier1_threshold = tier1_threshold
+        self.rates = {"silent": tier1_rate, "signal": 1.0}
+        self.day_quota = day_quota or {}
+        self.day_totals: Dict[str, Dict[str, int]] = {}  # day -> {tier: total_count}
+        self.kept: Counter = Counter()  # (day, tier) -> 已保留数（含续传前已保存的）
+        self.lock = Lock()
+        self.stats = {
+            "kept": Counter(),       # tier -> 本次保留
+            "rate_skip": Counter(),  # tier -> 抽样率跳过
+            "quota_skip": Counter(), # tier -> 当天配额已满跳过
+            "restored": 0,           # 续传时计入配额的已保存仓库
+        }
+
+    def tier_of(self, stars: int) -> str:
+        return "silent" if stars <= self.tier1_threshold else "signal"
+
+    def tier_stars(self, stars: Tuple[int, int]) -> Dict[str, Tuple[int, int]]:
+        """把 stars 区间按层拆开，供 plan_day 之前分别查询各层的 total_count"""
+        lo, hi = stars
+        ranges = {"silent": (lo, min(hi, self.tier1_threshold)),
+                  "signal": (max(lo, self.tier1_threshold + 1), hi)}
+        return {tier: r for tier, r in ranges.items() if r[0] <= r[1]}
+
+    def quota_tiers(self):
+        """设置了每天配额的层；为空时无需 plan_day"""
+        return [tier for tier, quota in self.day_quota.items() if quota is not None]
+
+    def plan_day(self, day: str, totals: Dict[str, int]) -> None:
+        """记录当天各层的 total_count，用于把配额换算成阈值"""
+        with self.lock:
+            self.day_totals[day] = dict(totals)
+
+    def threshold(self, day: str, tier: str) -> float:
+        rate = self.rates[tier]
+        quota = self.day_quota.get(tier)
+        total = self.day_totals.get(day, {}).get(tier)
+        if quota is None or not total:
+            return rate
+        return min(rate, quota / total)
+
+    def decide(self, repo_id: int, stars: int, day: str) -> Tuple[bool, str, str]:
+        """
+        返回: (是否保留, tier, 跳过原因)；原因为 "" / "rate" / "quota"
+        """
+        tier = self.tier_of(stars)
+        if hash_unit(self.seed, repo_id) >= self.threshold(day, tier):
+            with self.lock:
+                self.stats["rate_skip"][tier] += 1
+            return False, tier, "rate"
+        quota = self.day_quota.get(tier)
+        with self.lock:
+            if quota is not None and self.kept[(day, tier)] >= quota:
+                self.stats["quota_skip"][tier] += 1
+                return False, tier, "quota"
+            self.kept[(day, tier)] += 1
+            self.stats["kept"][tier] += 1
+        return True, tier, ""
+
+    def restore(self, repo_id: int, stars: int, day: str) -> None:
+        """续传：已保存的仓库若在当前种子下会被选中，则计入当天配额"""
+        tier = self.tier_of(stars)
+        if hash_unit(self.seed, repo_id) < self.threshold(day, tier):
+            with self.lock:
+                self.kept[(day, tier)] += 1
+                self.stats["restored"] += 1
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索 API 并发扇出 - 多个搜索查询同时翻页，整体速率由配额池按响应头控制
+
+逐个查询串行翻页时，每页都要等一次完整的网络往返（搜索 API 通常 0.5-1 秒），
+远达不到搜索配额（每个 token 30 次/分钟）。SearchFanout：
+- 每个 (查询, 页) 是一个任务，按期望产出排序：上次运行每个查询保留的仓库数（load_yields / save_yields），
+  没有记录的查询按已知查询的均值；高产出的查询先发，中断或配额吃紧时大部分结果已经到手
+- 上一页满 per_page 条才提交下一页（与串行翻页的请求完全相同，不多发请求）
+- 至多 workers 个请求同时在途，经共用的 GitHubClient 发送：余量充足时突发，
+  不足时 TokenPool 把剩余配额匀速分布到重置前，整体用时逼近配额下限
+- 每页结果到达后立即交给调用方（调用方边收边去重），不等全部查询结束
+
+用法：
+    fanout = SearchFanout(client, workers=4, yields=load_yields(path))
+    for result in fanout.run(queries):
+        ...  # result.index / result.page / result.items / result.done
+"""
+
+import heapq
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterator, List, Optional
+
+from github_client import GitHubClient
+
+SEARCH_WORKERS = 4         # 同时在途的搜索请求数
+PER_PAGE = 100
+
+
+@dataclass
+class SearchQuery:
+    key: str                                    # 产出记录的键（同一查询跨运行一致）
+    params: Dict[str, Any]                      # 搜索参数（q / sort / order），page 与 per_page 由扇出设置
+    max_pages: int = 1
+    label: str = ""                             # 调用方使用的来源标记
+
+
+@dataclass
+class PageResult:
+    index: int                                  # 查询在输入列表中的位置
+    page: int
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    done: bool = True                           # 该查询的最后一页（不会再有后续页）
+
+
+def load_yields(path: str) -> Dict[str, float]:
+    """读取上次运行各查询的产出；没有文件时返回空"""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_yields(path: str, yields: Dict[str, float]) -> None:
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(yields, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+
+class SearchFanout:
+    """按期望产出调度的并发搜索"""
+
+    def __init__(self, client: GitHubClient, workers: int = SEARCH_WORKERS,
+                 yields: Optional[Dict[str, float]] = None, path: str = "/search/repositories"):
+        self.client = client
+        self.workers = max(1, workers)
+        self.yields = yields or {}
+        self.path = path
+        self.stats = {"requests": 0, "pages": 0, "items": 0, "failed": 0}
+
+    def expected(self, query: SearchQuery) -> float:
+        if query.key in self.yields:
+            return self.yields[query.key]
+        return sum(self.yields.values()) / len(self.yields) if self.yields else 0.0
+
+    def _fetch(self, query: SearchQuery, page: int) -> Dict[str, Any]:
+        params = dict(query.params, per_page=PER_PAGE, page=page)
+        return self.client.get_json(self.path, params)
+
+    def run(self, queries: List[SearchQuery]) -> Iterator[PageResult]:
+        """按到达顺序逐页返回结果"""
+        # (-期望产出, 查询位置, 页码)：同等期望按输入顺序
+        ready = [(-self.expected(q), i, 1) for i, q in enumerate(queries)]
+        heapq.heapify(ready)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="search") as executor:
+            in_flight = {}
+            while ready or in_flight:
+                while ready and len(in_flight) < self.workers:
+                    priority, index, page = heapq.heappop(ready)
+                    future = executor.submit(self._fetch, queries[index], page)
+                    in_flight[future] = (priority, index, page)
+                    self.stats["requests"] += 1
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    priority, index, page = in_flight.pop(future)
+                    data = future.result()
+                    if not data:
+                        self.stats["failed"] += 1
+                    items = data.get("items") or []
+                    more = len(items) >= PER_PAGE and page < queries[index].max_pages
+                    if more:
+                        heapq.heappush(ready, (priority, index, page + 1))
+                    self.stats["pages"] += 1
+                    self.stats["items"] += len(items)
+                    yield PageResult(index, page, items, done=not more)
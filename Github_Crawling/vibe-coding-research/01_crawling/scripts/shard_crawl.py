@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分片多进程爬取 - 长时间范围回填时按 token 数线性扩展
+
+    START_DATE..今天 -> 按天轮流分给 N 个分片 -> N 个进程各跑一个 VibeCodingCrawler -> 合并去重
+
+- 分片数默认等于 token 数，每个分片只用分到的 token（tokens[i::N]），配额互不争抢
+- 天按 i % N 轮流分配（而不是连续区间），新旧日期的仓库量差异均摊到各分片
+- 每个分片有自己的 JSONL / 断点索引 / HTTP 缓存 / 遥测快照 / 日志，放在 SHARD_DIR 下，可单独续传；
+  分片数记录在 SHARD_DIR/plan.json，重跑时沿用，保证每一天仍分给同一个分片
+- 全部分片结束后把分片 JSONL 合并进 OUTPUT_FILE：按 id 去重（含 OUTPUT_FILE 中已有的），
+  同时写入主断点索引，之后单进程续传不需要重扫；合并进来的记录引用的 README 复制到主 README 存储
+- 目标数量 TARGET_TOTAL 平均分给各分片
+
+用法：
+    python shard_crawl.py
+"""
+
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import vibe_coding_crawler as vcc
+from checkpoint_store import CheckpointStore
+from readme_store import ReadmeStore
+from vibe_coding_crawler import GITHUB_TOKENS, date_range
+
+# ========== 分片配置 ==========
+SHARD_DIR = os.getenv("SHARD_DIR", "shards")  # 分片输出目录
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))  # 分片（进程）数，0 = token 数
+SHARD_ENGINE = os.getenv("SHARD_ENGINE", "sync")  # 分片内的引擎: sync = 流水线; async = asyncio
+# 传给分片进程的主爬虫配置（子进程重新导入模块，在父进程中修改过的值需要显式带过去）
+SHARED_SETTINGS = [
+    "START_DATE", "GITHUB_API_URL", "README_FETCH_MODE", "QUERY_PUSHDOWN",
+    "SAMPLE_SEED", "DAY_TIER_QUOTA", "SIZE_RANGE", "STARS_RANGE", "TELEMETRY_INTERVAL",
+]
+
+
+def shard_days(days: List[datetime], shards: int) -> List[List[datetime]]:
+    """按 i % shards 轮流分配"""
+    return [days[i::shards] for i in range(shards)]
+
+
+def shard_tokens(tokens: List[str], shards: int) -> List[List[str]]:
+    """每个分片分到的 token；token 少于分片数时轮流共用"""
+    if len(tokens) >= shards:
+        return [tokens[i::shards] for i in range(shards)]
+    return [[tokens[i % len(tokens)]] for i in range(shards)]
+
+
+def shard_paths(index: int) -> Dict[str, str]:
+    prefix = os.path.join(SHARD_DIR, f"shard_{index:02d}")
+    return {
+        "output": f"{prefix}.jsonl",
+        "checkpoint": f"{prefix}_checkpoint.sqlite",
+        "cache": f"{prefix}_http_cache.sqlite",
+        "readmes": f"{prefix}_readmes.sqlite",
+        "metrics": f"{prefix}_metrics",  # 扩展名随 TELEMETRY_FILE（.json / .prom）
+        "log": f"{prefix}.log",
+    }
+
+
+def run_shard(index: int, days: List[datetime], tokens: List[str], target: int,
+              settings: Dict[str, Any], paths: Dict[str, str], engine: str) -> Dict[str, Any]:
+    """分片进程入口：输出重定向到分片日志，跑完返回统计"""
+    for name, value in settings.items():
+        setattr(vcc, name, value)
+    vcc.OUTPUT_FILE = paths["output"]
+    vcc.CHECKPOINT_FILE = paths["checkpoint"]
+    vcc.HTTP_CACHE_FILE = paths["cache"] if settings["HTTP_CACHE_FILE"] else ""
+    vcc.README_STORE_FILE = paths["readmes"] if settings["README_STORE_FILE"] else ""
+    telemetry_ext = os.path.splitext(settings["TELEMETRY_FILE"])[1]
+    vcc.TELEMETRY_FILE = paths["metrics"] + telemetry_ext if settings["TELEMETRY_FILE"] else ""
+    vcc.TARGET_TOTAL = target
+
+    if engine == "async":
+        from async_crawl_engine import AsyncVibeCodingCrawler as crawler_cls
+    else:
+        crawler_cls = vcc.VibeCodingCrawler
+
+    start = time.perf_counter()
+    with open(paths["log"], "a", encoding="utf-8") as log:
+        sys.stdout = log
+        crawler = crawler_cls(tokens)
+        crawler.days = days
+        try:
+            crawler.run()
+        finally:
+            crawler.close()
+            sys.stdout = sys.__stdout__
+    return {
+        "index": index,
+        "days": len(days),
+        "saved": crawler.total_saved,
+        "scanned": crawler.stats["repos_scanned"],
+        "http_calls": sum(crawler.stats["http_calls"].values()),
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+def merge_shards(shards: List[Dict[str, str]], output: str, checkpoint_file: str,
+                 readme_store_file: str = "") -> Dict[str, int]:
+    """
+    把分片 JSONL 追加进 output，按 id 去重（output 中已有的也算），并登记到主断点索引；
+    设置了 readme_store_file 时，新合并记录的 README 从分片存储复制过来（引用数按合并的记录计）
+    分片末尾未写完整的行（进程被中断）跳过
+    增量刷新的起点 last_run 取主索引与各分片中最早的一个
+    """
+    stats = {"merged": 0, "duplicates": 0, "invalid": 0}
+    store = CheckpointStore(checkpoint_file)
+    readmes = ReadmeStore(readme_store_file) if readme_store_file else None
+    store.sync_with_jsonl(output)
+    # 主索引已有数据却没有 last_run（旧版断点）时保持为空，由爬虫启动时保守处理
+    last_runs = [store.get_last_run()] if store.get_last_run() or not store.repo_count() else None
+    with open(output, "ab") as out:
+        store.before_commit = lambda: (out.flush(), os.fsync(out.fileno()))
+        offset = out.tell()
+        for paths in shards:
+            if not os.path.exists(paths["output"]):
+                continue
+            shard_readmes = ReadmeStore(paths["readmes"]) \
+                if readmes is not None and os.path.exists(paths["readmes"]) else None
+            with open(paths["output"], "rb") as f:
+                for line in f:
+                    repo_id = CheckpointStore.extract_id(line)
+                    if repo_id is None or not line.endswith(b"\n"):
+                        stats["invalid"] += 1
+                        continue
+                    if store.has_repo(repo_id):
+                        stats["duplicates"] += 1
+                        continue
+                    digest = json.loads(line).get("readme_hash") if shard_readmes is not None else None
+                    if digest and not readmes.add_ref(digest, shard_readmes):
+                        stats["invalid"] += 1
+                        continue
+                    out.write(line)
+                    store.add_repo(repo_id, offset, offset + len(line))
+                    offset += len(line)
+                    stats["merged"] += 1
+            if shard_readmes is not None:
+                shard_readmes.close()
+            if last_runs is not None and os.path.exists(paths["checkpoint"]):
+                shard_store = CheckpointStore(paths["checkpoint"])
+                last_runs.append(shard_store.get_last_run())
+                shard_store.close()
+        last_runs = [t for t in last_runs or [] if t]
+        if last_runs:
+            store.put_last_run(min(last_runs))
+        store.close()
+    if readmes is not None:
+        readmes.close()
+    return stats
+
+
+def load_shard_count(tokens: List[str]) -> int:
+    """沿用 plan.json 中的分片数；首次运行时取 SHARD_COUNT 或 token 数"""
+    plan_file = os.path.join(SHARD_DIR, "plan.json")
+    if os.path.exists(plan_file):
+        with open(plan_file, encoding="utf-8") as f:
+            return json.load(f)["shards"]
+    shards = SHARD_COUNT or len(tokens)
+    with open(plan_file, "w", encoding="utf-8") as f:
+        json.dump({"shards": shards, "start_date": vcc.START_DATE.strftime("%Y-%m-%d")}, f)
+    return shards
+
+
+def run_sharded(tokens: List[str], end_date: Optional[datetime] = None) -> Dict[str, Any]:
+    """协调器：分片、并行爬取、合并"""
+    os.makedirs(SHARD_DIR, exist_ok=True)
+    shards = load_shard_count(tokens)
+    days = date_range(vcc.START_DATE, end_date or datetime.now())
+    target = math.ceil(vcc.TARGET_TOTAL / shards)
+    settings = {name: getattr(vcc, name) for name in SHARED_SETTINGS}
+    settings["HTTP_CACHE_FILE"] = vcc.HTTP_CACHE_FILE
+    settings["README_STORE_FILE"] = vcc.README_STORE_FILE
+    settings["TELEMETRY_FILE"] = vcc.TELEMETRY_FILE
+
+    print("=" * 70)
+    print("[分片爬取]")
+    print("=" * 70)
+    print(f"时间范围: {days[0]:%Y-%m-%d} 至 {days[-1]:%Y-%m-%d}（{len(days)} 天）")
+    print(f"分片: {shards} 个进程 | token: {len(tokens)} 个 | 引擎: {SHARD_ENGINE} | 每分片目标: {target}")
+    print(f"分片目录: {SHARD_DIR}（各分片日志 shard_XX.log）")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    results = []
+    # spawn: 子进程重新导入模块，不继承父进程的线程与 SQLite 连接（Windows 也可用）
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=shards, mp_context=context) as pool:
+        futures = [pool.submit(run_shard, i, shard_day_list, shard_token_list, target, settings,
+                               shard_paths(i), SHARD_ENGINE)
+                   for i, (shard_day_list, shard_token_list)
+                   in enumerate(zip(shard_days(days, shards), shard_tokens(tokens, shards)))]
+        for future in as_completed(futures):
+            try:
+                r = future.result()
+            except Exception as e:
+                print(f"  [错误] 分片失败: {e}（重跑本脚本即可从断点续传）")
+                continue
+            results.append(r)
+            print(f"  分片 {r['index']:02d}: {r['days']} 天 | 扫描 {r['scanned']} | 保存 {r['saved']} | "
+                  f"请求 {r['http_calls']} | {r['elapsed']:.1f}s")
+    elapsed = time.perf_counter() - start
+
+    merge = merge_shards([shard_paths(i) for i in range(shards)],
+                         vcc.OUTPUT_FILE, vcc.CHECKPOINT_FILE, vcc.README_STORE_FILE)
+    print(f"\n合并: 新增 {merge['merged']} | 重复 {merge['duplicates']} | 无效行 {merge['invalid']} -> {vcc.OUTPUT_FILE}")
+    print(f"用时: {elapsed:.1f}s")
+    print("=" * 70)
+    return {"elapsed": elapsed, "shards": sorted(results, key=lambda r: r["index"]), "merge": merge}
+
+
+def main():
+    if not GITHUB_TOKENS:
+        print("[错误] 未设置 GITHUB_TOKENS / GITHUB_TOKEN 环境变量")
+        return
+    run_sharded(GITHUB_TOKENS)
+
+
+if __name__ == "__main__":
+    main()
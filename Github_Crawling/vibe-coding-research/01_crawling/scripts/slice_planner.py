@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+自适应搜索切片 - 突破 GitHub 搜索单个查询最多 1000 条结果的限制
+
+切片 = created 时间区间 + size 区间 + stars 区间。
+对每个切片先取第 1 页读 total_count：
+- total_count <= 1000：切片可完整覆盖，第 1 页结果直接复用
+- total_count > 1000：先按小时二分 created 区间，到 1 小时后再二分 size 区间，最后二分 stars 区间
+- 三个维度都无法再分：标记 capped，只能拿到前 1000 条
+
+切片树（每个切片的 total_count、状态、子切片）持久化到断点续传索引 (checkpoint_store)，
+续传时已完成的切片直接跳过，已拆分的切片无需重新探测。
+"""
+
+import math
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Tuple
+
+SEARCH_RESULT_CAP = 1000   # GitHub 搜索单个查询最多返回的结果数
+MIN_TIME_SPAN = timedelta(hours=1)
+
+
+def parse_range(text: str) -> Tuple[int, int]:
+    """'50..80000' -> (50, 80000)"""
+    lo, hi = text.split("..")
+    return int(lo), int(hi)
+
+
+def _geo_mid(lo: int, hi: int) -> int:
+    """几何中点（size/stars 都是长尾分布，按几何中点拆分两边更均衡）"""
+    mid = int(math.sqrt((lo + 1) * (hi + 1))) - 1
+    return max(lo, min(mid, hi - 1))
+
+
+def _ts(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@dataclass(frozen=True)
+class Slice:
+    """一个搜索切片（所有区间均为闭区间）"""
+    created_from: datetime
+    created_to: datetime
+    size: Tuple[int, int]
+    stars: Tuple[int, int]
+    pushed_after: str  # pushed:>YYYY-MM-DD，过滤创建后没有提交的仓库
+    exclusions: str = ""  # 下推到查询中的排除条件（见 query_pushdown），子切片原样继承
+
+    @property
+    def query(self) -> str:
+        query = (f"created:{_ts(self.created_from)}..{_ts(self.created_to)} "
+                 f"size:{self.size[0]}..{self.size[1]} "
+                 f"pushed:>{self.pushed_after} "
+                 f"stars:{self.stars[0]}..{self.stars[1]}")
+        return f"{query} {self.exclusions}" if self.exclusions else query
+
+    @property
+    def key(self) -> str:
+        return self.query
+
+    @property
+    def label(self) -> str:
+        return (f"{self.created_from:%m-%d %H:%M}~{self.created_to:%H:%M} "
+                f"size:{self.size[0]}..{self.size[1]} stars:{self.stars[0]}..{self.stars[1]}")
+
+    def split(self) -> List["Slice"]:
+        """二分切片：时间 -> size -> stars；无法再分时返回空列表"""
+        span = self.created_to - self.created_from + timedelta(seconds=1)
+        if span > MIN_TIME_SPAN:
+            hours = math.ceil(span / MIN_TIME_SPAN)
+            mid = self.created_from + MIN_TIME_SPAN * (hours // 2)
+            return [replace(self, created_to=mid - timedelta(seconds=1)),
+                    replace(self, created_from=mid)]
+
+        for field in ("size", "stars"):
+            lo, hi = getattr(self, field)
+            if lo < hi:
+                mid = _geo_mid(lo, hi)
+                return [replace(self, **{field: (lo, mid)}),
+                        replace(self, **{field: (mid + 1, hi)})]
+        return []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "created_from": self.created_from.isoformat(),
+            "created_to": self.created_to.isoformat(),
+            "size": list(self.size),
+            "stars": list(self.stars),
+            "pushed_after": self.pushed_after,
+            "exclusions": self.exclusions,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Slice":
+        return cls(
+            created_from=datetime.fromisoformat(data["created_from"]),
+            created_to=datetime.fromisoformat(data["created_to"]),
+            size=tuple(data["size"]),
+            stars=tuple(data["stars"]),
+            pushed_after=data["pushed_after"],
+            exclusions=data.get("exclusions", ""),
+        )
+
+
+def day_slice(date: datetime, size_range: str, stars_range: str) -> Slice:
+    """某一天的根切片，等价于 created:YYYY-MM-DD"""
+    day_start = datetime(date.year, date.month, date.day)
+    return Slice(
+        created_from=day_start,
+        created_to=day_start + timedelta(days=1) - timedelta(seconds=1),
+        size=parse_range(size_range),
+        stars=parse_range(stars_range),
+        pushed_after=(day_start + timedelta(days=1)).strftime("%Y-%m-%d"),
+    )
+
+
+class SliceTree:
+    """
+    切片树状态，按切片 key 存储在 CheckpointStore 中:
+        {"total": total_count, "status": "split" | "done", "capped": bool, "children": [slice_dict, ...]}
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def get(self, slice_: Slice) -> Optional[Dict[str, Any]]:
+        return self.store.get_slice(slice_.key)
+
+    def is_done(self, slice_: Slice) -> bool:
+        node = self.get(slice_)
+        return bool(node) and node["status"] == "done"
+
+    def children(self, slice_: Slice) -> List[Slice]:
+        node = self.get(slice_)
+        if not node or node["status"] != "split":
+            return []
+        return [Slice.from_dict(c) for c in node["children"]]
+
+    def split(self, slice_: Slice, total: int) -> List[Slice]:
+        """记录拆分结果并返回子切片；无法再拆分时返回空列表"""
+        children = slice_.split()
+        if children:
+            self.store.put_slice(slice_.key, {
+                "total": total,
+                "status": "split",
+                "children": [c.to_dict() for c in children],
+            })
+        return children
+
+    def mark_done(self, slice_: Slice, total: int, capped: bool = False) -> None:
+        """标记切片已完整爬取；capped 表示结果超过上限且无法再拆分"""
+        self.store.put_slice(slice_.key, {
+            "total": total,
+            "status": "done",
+            "capped": capped,
+        })
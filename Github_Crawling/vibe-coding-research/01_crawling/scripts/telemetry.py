@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+爬虫遥测 - 按接口的请求延迟直方图、配额曲线与各阶段吞吐，定时写出快照
+
+- 每个接口（search / readme / topics / graphql / repo / user / ...）：请求数、失败的尝试（网络错误、
+  5xx、403/429 限流）、重试次数、重试后仍失败的次数、状态码分布、延迟直方图（累计）与
+  最近 LATENCY_WINDOW 个请求的 p50 / p95 / p99
+- 配额：每次采样读取 TokenPool.summary()（各 token 各资源的剩余配额），保留最近 QUOTA_HISTORY 个采样点
+- 阶段吞吐：流水线爬虫用 Pipeline.report()（处理数、repos/s、忙碌率、队列深度）；
+  没有流水线的爬虫用 tick() 计数，按总时长和最近一个采样间隔分别计算每秒处理数
+- 后台线程每 interval 秒采样一次并写出快照（先写临时文件再替换，读取方不会读到半个文件）：
+  路径以 .prom 结尾时写 Prometheus 文本格式（可交给 node_exporter textfile collector），否则写 JSON
+
+用法：
+    telemetry = Telemetry()
+    client = GitHubClient(tokens, telemetry=telemetry)
+    telemetry.quota_source = client.pool.summary
+    telemetry.start("crawl_metrics.json", interval=15)
+    ...
+    telemetry.stop()   # 写出最终快照
+"""
+
+import bisect
+import json
+import os
+import time
+from collections import deque, Counter
+from datetime import datetime, timezone
+from threading import Event, Lock, Thread
+from typing import Optional, Dict, Any, List, Callable
+
+# 延迟直方图的桶上界(秒)，与 Prometheus histogram 的 le 标签一致
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LATENCY_WINDOW = 2048     # 计算分位数的最近请求数
+QUOTA_HISTORY = 720       # 保留的配额采样点数（15 秒一次约 3 小时）
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def endpoint_for(url: str) -> str:
+    """按 URL 路径归类接口（统计维度，不同于配额资源 resource_for）"""
+    path = url.split("?", 1)[0].rstrip("/")
+    if "/search/" in path:
+        return "search"
+    if path.endswith("/graphql"):
+        return "graphql"
+    if path.endswith("/readme"):
+        return "readme"
+    if path.endswith("/topics"):
+        return "topics"
+    if "/repos/" in path:
+        return "repo"
+    if "/users/" in path:
+        return "user"
+    if path.endswith("/rate_limit"):
+        return "rate_limit"
+    return "other"
+
+
+def quantile(sorted_values: List[float], q: float) -> float:
+    """已排序样本的分位数（线性插值）"""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+class EndpointMetrics:
+    """单个接口的计数与延迟"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0      # 失败的尝试：网络错误 / 5xx / 403、429 限流
+        self.retries = 0     # 重发次数
+        self.failed = 0      # 重试后仍失败，放弃的请求
+        self.status: Counter = Counter()
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # 最后一个为 +Inf
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.window: deque = deque(maxlen=LATENCY_WINDOW)
+
+    def observe(self, seconds: float, status: Optional[int]) -> None:
+        self.requests += 1
+        self.status["network_error" if status is None else str(status)] += 1
+        if status is None or status >= 500 or status in (403, 429):
+            self.errors += 1
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.latency_sum += seconds
+        self.latency_max = max(self.latency_max, seconds)
+        self.window.append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        recent = sorted(self.window)
+        latency = {f"p{int(q * 100)}": round(quantile(recent, q) * 1000, 1) for q in QUANTILES}
+        latency["mean"] = round(self.latency_sum / self.requests * 1000, 1) if self.requests else 0.0
+        latency["max"] = round(self.latency_max * 1000, 1)
+        cumulative, buckets = 0, {}
+        for bound, count in zip(list(LATENCY_BUCKETS) + ["+Inf"], self.buckets):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "failed": self.failed,
+            "status": dict(self.status),
+            "latency_ms": latency,
+            "latency_sum_s": round(self.latency_sum, 3),
+            "buckets": buckets,
+        }
+
+
+class Telemetry:
+    """线程安全的指标收集器（同步客户端、异步引擎与流水线共用）"""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.started = time.time()
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self.counters: Counter = Counter()
+        self.quota_history: deque = deque(maxlen=QUOTA_HISTORY)
+        self.quota_source: Optional[Callable[[], Dict[str, Dict[str, int]]]] = None  # 通常为 TokenPool.summary
+        self.stage_source: Optional[Callable[[], List[Dict[str, Any]]]] = None      # 通常为 Pipeline.report
+        self._last_sample = (self.started, Counter())
+        self._rates: Dict[str, float] = {}
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        self.path = ""
+
+    # ========== 记录 ==========
+
+    def _endpoint(self, endpoint: str) -> EndpointMetrics:
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def observe(self, endpoint: str, seconds: float, status: Optional[int]) -> None:
+        """一次 HTTP 尝试的耗时与状态码（网络错误时 status 为 None）"""
+        with self.lock:
+            self._endpoint(endpoint).observe(seconds, status)
+
+    def retry(self, endpoint: str) -> None:
+        with self.lock:
+            self._endpoint(endpoint).retries += 1
+
+    def fail(self, endpoint: str) -> None:
+        """重试次数用尽，放弃请求"""
+        with self.lock:
+            self._endpoint(endpoint).failed += 1
+
+    def tick(self, name: str, n: int = 1) -> None:
+        """计数（没有流水线的爬虫用来统计各阶段处理的仓库数）"""
+        with self.lock:
+            self.counters[name] += n
+
+    # ========== 采样与快照 ==========
+
+    def sample(self) -> None:
+        """记录一个配额采样点，并更新计数器最近一个间隔的速率"""
+        now = time.time()
+        if self.quota_source is not None:
+            quota = self.quota_source()
+            self.quota_history.append({"t": round(now - self.started, 1), "quota": quota})
+        with self.lock:
+            last_time, last_counts = self._last_sample
+            span = now - last_time
+            if span > 0:
+                self._rates = {k: (v - last_counts.get(k, 0)) / span for k, v in self.counters.items()}
+            self._last_sample = (now, Counter(self.counters))
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.time()
+        uptime = now - self.started
+        with self.lock:
+            endpoints = {name: m.snapshot() for name, m in sorted(self.endpoints.items())}
+            counters = {name: {"total": count,
+                               "per_sec": round(count / uptime, 2) if uptime > 0 else 0.0,
+                               "recent_per_sec": round(self._rates.get(name, 0.0), 2)}
+                        for name, count in sorted(self.counters.items())}
+        stages = self.stage_source() if self.stage_source is not None else []
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "uptime_s": round(uptime, 1),
+            "endpoints": endpoints,
+            "quota": self.quota_history[-1]["quota"] if self.quota_history else {},
+            "quota_history": list(self.quota_history),
+            "stages": [{k: round(v, 3) if isinstance(v, float) else v for k, v in row.items()} for row in stages],
+            "counters": counters,
+        }
+
+    def to_prometheus(self, snap: Optional[Dict[str, Any]] = None) -> str:
+        """Prometheus 文本格式（配额只输出当前值，历史曲线由 Prometheus 自己采集）"""
+        snap = snap or self.snapshot()
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples: List[tuple]) -> None:
+            if not samples:
+                return
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        endpoints = snap["endpoints"]
+        for field, help_text in (("requests", "HTTP 尝试次数"), ("errors", "失败的尝试（网络错误/5xx/限流）"),
+                                 ("retries", "重发次数"), ("failed", "重试后仍失败的请求")):
+            metric(f"github_{field}_total", "counter", help_text,
+                   [({"endpoint": ep}, m[field]) for ep, m in endpoints.items()])
+        histogram = []
+        for ep, m in endpoints.items():
+            histogram += [({"endpoint": ep, "le": le}, count) for le, count in m["buckets"].items()]
+        if histogram:
+            lines.append("# HELP github_request_duration_seconds 请求延迟")
+            lines.append("# TYPE github_request_duration_seconds histogram")
+            for labels, count in histogram:
+                lines.append(f'github_request_duration_seconds_bucket{{endpoint="{labels["endpoint"]}",'
+                             f'le="{labels["le"]}"}} {count}')
+            for ep, m in endpoints.items():
+                lines.append(f'github_request_duration_seconds_sum{{endpoint="{ep}"}} {m["latency_sum_s"]}')
+                lines.append(f'github_request_duration_seconds_count{{endpoint="{ep}"}} {m["requests"]}')
+        metric("github_request_latency_recent_seconds", "gauge", f"最近 {LATENCY_WINDOW} 个请求的延迟分位数",
+               [({"endpoint": ep, "quantile": str(q)}, m["latency_ms"][f"p{int(q * 100)}"] / 1000)
+                for ep, m in endpoints.items() for q in QUANTILES])
+        metric("github_quota_remaining", "gauge", "各 token 各资源的剩余配额",
+               [({"token": token, "resource": resource}, remaining)
+                for token, resources in snap["quota"].items() for resource, remaining in resources.items()])
+        stages = snap["stages"]
+        metric("crawl_stage_processed_total", "counter", "流水线阶段处理数",
+               [({"stage": s["stage"]}, s["processed"]) for s in stages])
+        metric("crawl_stage_throughput", "gauge", "流水线阶段每秒处理数",
+               [({"stage": s["stage"]}, s["throughput"]) for s in stages])
+        metric("crawl_stage_utilization", "gauge", "流水线阶段忙碌率",
+               [({"stage": s["stage"]}, s["utilization"]) for s in stages])
+        metric("crawl_stage_queue_depth", "gauge", "流水线阶段当前队列深度",
+               [({"stage": s["stage"]}, s.get("depth", 0)) for s in stages])
+        metric("crawl_processed_total", "counter", "计数器",
+               [({"name": name}, c["total"]) for name, c in snap["counters"].items()])
+        metric("crawl_recent_per_second", "gauge", "计数器最近一个采样间隔的每秒处理数",
+               [({"name": name}, c["recent_per_sec"]) for name, c in snap["counters"].items()])
+        metric("crawl_uptime_seconds", "gauge", "运行时长", [({}, snap["uptime_s"])])
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """写出快照：.prom 为 Prometheus 文本，其他为 JSON"""
+        snap = self.snapshot()
+        text = self.to_prometheus(snap) if path.endswith(".prom") else \
+            json.dumps(snap, ensure_ascii=False, indent=2)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    # ========== 定时写出 ==========
+
+    def start(self, path: str, interval: float) -> None:
+        """后台线程每 interval 秒采样并写出快照到 path"""
+        self.path = path
+        self.sample()
+
+        def loop():
+            while not self._stop.wait(interval):
+                self.sample()
+                try:
+                    self.write(path)
+                except OSError as e:
+                    print(f"  [telemetry] 写出快照失败: {e}")
+
+        self._thread = Thread(target=loop, name="telemetry", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止后台线程并写出最终快照"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.sample()
+        self.write(self.path)
+
+    def report(self) -> List[str]:
+        """每个接口一行：请求数、延迟分位数、失败与重试"""
+        rows = []
+        with self.lock:
+            snaps = {name: m.snapshot() for name, m in sorted(self.endpoints.items())}
+        for name, m in snaps.items():
+            lat = m["latency_ms"]
+            rows.append(f"{name:10} 请求 {m['requests']:6} | p50 {lat['p50']:7.1f}ms | p95 {lat['p95']:7.1f}ms | "
+                        f"p99 {lat['p99']:7.1f}ms | 失败尝试 {m['errors']} | 重试 {m['retries']} | 放弃 {m['failed']}")
+        return rows
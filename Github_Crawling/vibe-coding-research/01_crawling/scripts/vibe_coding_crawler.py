@@ -4,24 +4,39 @@
 Vibe Coding 项目爬虫 - 投资人研究版
 
 核心特性：
-- 按天切片爬取，确保时间覆盖均匀
+- 按天切片爬取，确保时间覆盖均匀；单个切片超过 1000 条时自适应拆分（小时 -> size -> stars）
 - 分层抽样：区分"沉默大多数"和"高价值信号"
-- 断点续传：支持中断后继续
+- 多 token 轮换：请求路由到配额余量最多的 token，只有全部耗尽时才等待重置
+- 断点续传：SQLite 索引记录已保存 id 与已完成切片，启动时无需重扫 JSONL
 - 全面的负向噪音过滤
-- 流式落盘，每处理完一个仓库立即保存
+- 批量落盘：记录进入常驻句柄的缓冲区，按条数/时间批量写入，切片完成时 fsync 后再提交索引
+- 分阶段流水线：搜索 -> 过滤/抽样 -> README 下载 -> 单线程落盘，阶段间为有界队列（背压），
+  各阶段线程数见 PIPELINE_WORKERS；切片内的仓库全部落盘后才标记切片完成；结束时报告各阶段吞吐、忙碌率与队列深度
+- 搜索结果解析后立即转成 RepoItem（__slots__，只含用到的字段），流水线中不传递整页 JSON，也没有懒加载请求
+- 遥测：每个接口的延迟分位数 / 失败 / 重试、各 token 配额曲线、各阶段吞吐，每 TELEMETRY_INTERVAL 秒写出快照
 """
 
 import os
-import json
-import re
-import random
-import time
+import math
 import sys
-from datetime import datetime, timedelta
-from typing import Optional, Set, Dict, Any
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from threading import Event, Lock
+from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
-from github import Github, GithubException, RateLimitExceededException
-from github.Repository import Repository
+from checkpoint_store import CheckpointStore
+from crawl_pipeline import Pipeline, Stage, Ticket
+from github_client import GitHubClient, load_tokens
+from http_cache import HttpCache
+from graphql_enricher import GraphQLEnricher, ENRICH_BATCH_SIZE
+from readme_store import ReadmeStore
+from record_sink import RecordSink
+from repo_item import RepoItem
+from noise_filter import NoiseFilter
+from query_pushdown import QueryPushdown
+from sampler import StratifiedSampler
+from telemetry import Telemetry
+from slice_planner import Slice, SliceTree, day_slice, SEARCH_RESULT_CAP
 
 load_dotenv()
 sys.stdout.reconfigure(encoding='utf-8')
@@ -30,16 +45,47 @@ sys.stdout.reconfigure(encoding='utf-8')
 TARGET_TOTAL = 5000  # 目标仓库总数
 START_DATE = datetime(2026, 1, 28)  # 从两周前开始
 OUTPUT_FILE = "vibe_coding_dataset_2w.jsonl"
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
+CHECKPOINT_FILE = "vibe_coding_checkpoint.sqlite"  # 断点续传索引（已保存 id + 搜索切片树）
+HTTP_CACHE_FILE = os.getenv("HTTP_CACHE_FILE", "github_http_cache.sqlite")  # 条件请求缓存，设为空关闭
+# README 内容寻址存储：记录中只存 readme_hash，相同 README 只存一份；设为空则 README 原文内嵌在记录中
+README_STORE_FILE = os.getenv("README_STORE_FILE", "vibe_coding_readmes.sqlite")
+GITHUB_TOKENS = load_tokens()  # GITHUB_TOKENS=tok1,tok2,...（或单个 GITHUB_TOKEN）
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")  # 可指向本地 mock 服务器
+# 遥测快照（见 telemetry）：.json 或 .prom（Prometheus 文本格式），设为空关闭
+TELEMETRY_FILE = os.getenv("TELEMETRY_FILE", "crawl_metrics.json")
+TELEMETRY_INTERVAL = float(os.getenv("TELEMETRY_INTERVAL", "15"))  # 写出间隔(秒)
 
 # 分层抽样配置
 TIER1_STAR_THRESHOLD = 20  # stars <= 20 视为沉默大多数
 TIER1_SAMPLE_RATE = 0.2    # 沉默大多数保留 20%
+# 抽样种子: 保留与否由 hash(种子, 仓库 id) 决定，同一种子下重跑 / 续传选中的仓库完全一致
+SAMPLE_SEED = os.getenv("SAMPLE_SEED", "vibe-coding-2026")  # 换种子即换一批样本
+# 每天每层最多保留的仓库数（None 不限）；设置后每天开始前多发 1 次 per_page=1 的搜索读取该层 total_count，
+# 例如 {"silent": 200, "signal": None} 让每天的沉默大多数数量大致相同，不会被前几天占满 TARGET_TOTAL
+DAY_TIER_QUOTA = {"silent": None, "signal": None}
 
 # 搜索参数
 SIZE_RANGE = "50..80000"   # 50KB - 80MB
 STARS_RANGE = "0..3000"    # 避免超大型机构项目
-RESULTS_PER_DAY = 1000     # 每天最多获取 1000 个结果
+SEARCH_PER_PAGE = 100      # 搜索每页条数（GitHub 上限）
+
+# 查询下推: fork/archived/黑名单 owner/部分噪音词直接写进搜索查询，服务端排除后不再占用分页
+QUERY_PUSHDOWN = os.getenv("QUERY_PUSHDOWN", "1") != "0"
+# 每天首次搜索时额外发 1 次 per_page=1 的请求读取未下推的 total_count，用于统计节省量
+PUSHDOWN_MEASURE = True
+# NOT 关键词: 只选同时在关键词列表和 topic 黑名单中的词，服务端排除的仓库本地也一定会被过滤
+PUSHDOWN_NOT_TERMS = ["homework", "leetcode", "dotfiles", "tutorial", "algorithm"]
+
+# README 获取方式: graphql = 攒批 GraphQL 补全（未命中回退 REST）; rest = 每个仓库一次 REST 请求
+README_FETCH_MODE = os.getenv("README_FETCH_MODE", "graphql")
+
+# 流水线各阶段线程数（落盘阶段固定单线程）
+PIPELINE_WORKERS = {
+    "search": 1,   # 搜索生产者，按天并行；search 配额 30 次/分钟，1 个通常已够
+    "filter": 1,   # 去重/过滤/抽样，纯本地计算
+    "readme": 8,   # README 下载（主要耗时）
+}
+README_BATCH_LINGER = 2.0  # graphql 模式下 README 阶段凑批的最长等待(秒)
 
 # ========== 负向噪音关键词（综合全面版）==========
 NOISE_FILTERS = {
@@ -113,6 +159,12 @@ NOISE_FILTERS = {
     ],
 }
 
+# 预编译的过滤引擎（每个字段一个合并正则）
+NOISE_ENGINE = NoiseFilter(NOISE_FILTERS)
+
+# PUSHDOWN_NOT_TERMS 必须是本地过滤的子集，否则下推会改变数据集
+assert all(t in NOISE_FILTERS["topic_blacklist"] for t in PUSHDOWN_NOT_TERMS)
+
 # 合并所有关键词用于快速检查
 ALL_NOISE_KEYWORDS = (
     NOISE_FILTERS["education_keywords"] +
@@ -124,12 +176,77 @@ ALL_NOISE_KEYWORDS = (
 )
 
 
+def iso_time(timestamp: Optional[str]) -> Optional[str]:
+    """GitHub 时间字符串 (2026-01-28T10:00:00Z) 转为 datetime.isoformat() 格式"""
+    if not timestamp:
+        return None
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).isoformat()
+
+
+def utc_timestamp(dt: Optional[datetime] = None) -> str:
+    """GitHub 搜索限定词用的 UTC 时间 (2026-02-10T08:00:00Z)，默认当前时间；无时区的 dt 按 UTC 处理"""
+    dt = dt or datetime.now(timezone.utc)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def date_range(start: datetime, end: datetime) -> List[datetime]:
+    """start 至 end（含）的每一天"""
+    days = []
+    current_date = start
+    while current_date <= end:
+        days.append(current_date)
+        current_date += timedelta(days=1)
+    return days
+
+
+def build_repo_record(item: RepoItem, tier: str, readme_content: Optional[str]) -> Dict[str, Any]:
+    """用搜索结果构造落盘记录，不触发任何额外请求"""
+    return {
+        "id": item.id,
+        "repo_name": item.full_name,
+        "repo_url": item.html_url,
+        "stars": item.stars,
+        "description": item.description,
+        "language": item.language,
+        "topics": item.topics,
+        "created_at": iso_time(item.created_at),
+        "pushed_at": iso_time(item.pushed_at),
+        "tier": tier,
+        "size_kb": item.size,
+        "forks_count": item.forks_count,
+        "open_issues": item.open_issues,
+        "owner_login": item.owner_login,
+        "owner_type": item.owner_type,
+        "readme_content": readme_content,
+    }
+
+
 class VibeCodingCrawler:
-    def __init__(self, token: str):
-        self.token = token
-        self.github = Github(token, per_page=100)
-        self.saved_ids: Set[int] = set()
+    def __init__(self, tokens):
+        self.tokens = [tokens] if isinstance(tokens, str) else list(tokens)
+        self.http_cache = HttpCache(HTTP_CACHE_FILE) if HTTP_CACHE_FILE else None
+        self.telemetry = Telemetry()
+        self.client = GitHubClient(self.tokens, GITHUB_API_URL, cache=self.http_cache, telemetry=self.telemetry)
+        self.telemetry.quota_source = self.client.pool.summary
+        self.checkpoint = CheckpointStore(CHECKPOINT_FILE)
+        self.sink = RecordSink(OUTPUT_FILE)
+        self.readme_store = ReadmeStore(README_STORE_FILE) if README_STORE_FILE else None
+        # 索引提交前先把 JSONL 缓冲 fsync 到磁盘，索引里的 id 一定已经落盘
+        self.checkpoint.before_commit = lambda: self.sink.flush(fsync=True)
         self.total_saved = 0
+        self.enricher = GraphQLEnricher(self.client)
+        self.seen_ids = set()      # 本次运行已扫描过的仓库（跨页 / 跨切片去重）
+        self.in_flight = 0         # 已通过抽样、尚未落盘的仓库数
+        self.stop = Event()        # 达到目标数量后通知各阶段停止派发
+        self.stats_lock = Lock()   # 多个阶段线程共同更新 self.stats
+        self.pipeline: Optional[Pipeline] = None
+        self.telemetry.stage_source = lambda: self.pipeline.report() if self.pipeline is not None else []
+        self.days: Optional[List[datetime]] = None  # 指定时只爬这些天（分片爬取，见 shard_crawl），默认 START_DATE 至今天
+        self.slices = SliceTree(self.checkpoint)
+        self.sampler = StratifiedSampler(SAMPLE_SEED, TIER1_STAR_THRESHOLD, TIER1_SAMPLE_RATE, DAY_TIER_QUOTA)
+        self.pushdown = QueryPushdown(NOISE_FILTERS["owner_blacklist"], PUSHDOWN_NOT_TERMS) if QUERY_PUSHDOWN else None
         self.stats = {
             "days_scanned": 0,
             "repos_scanned": 0,
@@ -152,214 +269,148 @@ class VibeCodingCrawler:
                 "fork": 0,
                 "empty_repo": 0,
                 "tier1_skip": 0,  # 分层抽样跳过的
-            }
+                "quota_skip": 0,  # 当天该层配额已满跳过的
+            },
+            # 搜索切片
+            "slices": {
+                "probed": 0,    # 发出第 1 页请求读取 total_count 的切片
+                "split": 0,     # 超过 1000 条被拆分的切片
+                "done": 0,      # 完整爬完的叶子切片
+                "skipped": 0,   # 续传时跳过的已完成切片
+                "capped": 0,    # 无法再拆分、只能取前 1000 条的切片
+            },
+            # 查询下推效果（仅统计本次运行中首次搜索的天）
+            "pushdown": {
+                "days_measured": 0,
+                "base_total": 0,    # 未下推时的 total_count 之和
+                "pushed_total": 0,  # 下推后的 total_count 之和
+            },
+            # 本次运行实际发出的 HTTP 请求数（按接口）
+            "http_calls": {
+                "search": 0,
+                "graphql": 0,
+                "readme": 0,
+            },
         }
         
     def load_existing_data(self) -> None:
-        """加载已存在的数据，用于断点续传"""
-        if not os.path.exists(OUTPUT_FILE):
-            return
+        """断点续传：索引只补扫 JSONL 中未建立索引的尾部（首次运行旧数据时全量建立一次）"""
+        if os.path.exists(OUTPUT_FILE):
+            print(f"[Resume] 发现已有数据文件: {OUTPUT_FILE}")
+            added = self.checkpoint.sync_with_jsonl(OUTPUT_FILE)
+            if added:
+                print(f"[Resume] 索引补录 {added} 条记录")
+            self.total_saved = self.checkpoint.repo_count()
             
-        print(f"[Resume] 发现已有数据文件: {OUTPUT_FILE}")
-        with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                    repo_id = data.get('id')
-                    if repo_id:
-                        self.saved_ids.add(repo_id)
-                        self.total_saved += 1
-                except json.JSONDecodeError:
-                    continue
-        
-        print(f"[Resume] 已加载 {self.total_saved} 个已有仓库ID，将继续爬取...")
-    
-    def is_noise(self, repo: Repository) -> tuple:
+            print(f"[Resume] 索引中已有 {self.total_saved} 个仓库ID，将继续爬取...")
+        
+        # 增量刷新（delta_crawl）的起点：首次运行记为现在；已有数据却没有记录时（旧版断点）
+        # 不知道数据是何时爬的，保守地取 START_DATE
+        if self.checkpoint.get_last_run() is None:
+            self.checkpoint.put_last_run(utc_timestamp(START_DATE) if self.total_saved else utc_timestamp())
+    
+    def is_noise(self, item: RepoItem) -> tuple:
+        """
+        判断仓库是否是噪音（topics/owner 已包含在搜索结果中）
+        返回: (是否噪音, 原因)
         """
-        判断仓库是否是噪音
+        return self.check_noise(
+            owner=item.owner_login,
+            name=item.name,
+            description=item.description,
+            topics=item.topics,
+            fork=item.fork,
+            size=item.size,
+        )
+    
+    def check_noise(self, owner: str, name: str, description: Optional[str],
+                    topics: list, fork: bool, size: int) -> tuple:
+        """
+        噪音判断的核心逻辑，只依赖基础字段
         返回: (是否噪音, 原因)
         """
-        owner = repo.owner.login.lower() if repo.owner else ""
-        name = repo.name.lower()
-        desc = (repo.description or "").lower()
-        topics = [t.lower() for t in repo.get_topics()]
-        
-        # 1. Fork 的项目
-        if repo.fork:
-            self.stats["filtered_by"]["fork"] += 1
-            return True, "fork"
-        
-        # 2. 空项目
-        if repo.size == 0:
-            self.stats["filtered_by"]["empty_repo"] += 1
-            return True, "empty_repo"
-        
-        # 3. 黑名单 owner
-        if owner in NOISE_FILTERS["owner_blacklist"]:
-            self.stats["filtered_by"]["owner_blacklist"] += 1
-            return True, f"owner_blacklist:{owner}"
-        
-        # 4. 项目名模式匹配
-        for pattern in NOISE_FILTERS["name_patterns"]:
-            if re.search(pattern, name, re.IGNORECASE):
-                self.stats["filtered_by"]["name_pattern"] += 1
-                return True, f"name_pattern:{pattern}"
-        
-        # 5. 教育/学习类关键词
-        for keyword in NOISE_FILTERS["education_keywords"]:
-            if keyword in desc or keyword in name:
-                self.stats["filtered_by"]["education"] += 1
-                return True, f"education:{keyword}"
-        
-        # 6. 算法/刷题类
-        for keyword in NOISE_FILTERS["algorithm_keywords"]:
-            if keyword in desc or keyword in name:
-                self.stats["filtered_by"]["algorithm"] += 1
-                return True, f"algorithm:{keyword}"
-        
-        # 7. 配置/备份类
-        for keyword in NOISE_FILTERS["config_keywords"]:
-            if keyword in desc or keyword in name:
-                self.stats["filtered_by"]["config"] += 1
-                return True, f"config:{keyword}"
-        
-        # 8. Awesome List 类
-        for keyword in NOISE_FILTERS["awesome_keywords"]:
-            if keyword in desc or keyword in name:
-                self.stats["filtered_by"]["awesome"] += 1
-                return True, f"awesome:{keyword}"
-        
-        # 9. 教程/示例类
-        for keyword in NOISE_FILTERS["tutorial_keywords"]:
-            if keyword in desc or keyword in name:
-                self.stats["filtered_by"]["tutorial"] += 1
-                return True, f"tutorial:{keyword}"
-        
-        # 10. 描述中的排除词
-        for keyword in NOISE_FILTERS["desc_keywords"]:
-            if keyword in desc:
-                self.stats["filtered_by"]["desc_keyword"] += 1
-                return True, f"desc:{keyword}"
-        
-        # 11. Topics 黑名单
-        for topic in topics:
-            if topic in NOISE_FILTERS["topic_blacklist"]:
-                self.stats["filtered_by"]["topic_blacklist"] += 1
-                return True, f"topic:{topic}"
-        
-        return False, ""
-    
-    def should_sample(self, stars: int) -> tuple:
+        owner = (owner or "").lower()
+        name = name.lower()
+        desc = (description or "").lower()
+        topics = [t.lower() for t in topics]
+        
+        # 预编译引擎一次扫描得到命中类别，顺序与原逐条判断一致
+        stat_key, reason = NOISE_ENGINE.match(owner, name, desc, topics, fork, size)
+        if stat_key is None:
+            return False, ""
+        self.stats["filtered_by"][stat_key] += 1
+        return True, reason
+    
+    def should_sample(self, item: RepoItem) -> tuple:
         """
-        分层抽样决策
+        分层抽样决策（按 id 哈希，结果可复现）
+        Tier 1 沉默大多数保留 TIER1_SAMPLE_RATE，Tier 2 高价值信号 100% 保留，两层都受 DAY_TIER_QUOTA 限制
         返回: (是否保留, tier级别)
         """
-        if stars <= TIER1_STAR_THRESHOLD:
-            # Tier 1: 沉默大多数，随机保留 20%
-            if random.random() > TIER1_SAMPLE_RATE:
-                self.stats["filtered_by"]["tier1_skip"] += 1
-                return False, "silent"
-            return True, "silent"
-        else:
-            # Tier 2: 高价值信号，100% 保留
-            return True, "signal"
+        keep, tier, reason = self.sampler.decide(item.id, item.stars, item.created_day)
+        if not keep:
+            self.stats["filtered_by"]["quota_skip" if reason == "quota" else "tier1_skip"] += 1
+        return keep, tier
     
-    def get_readme_content(self, repo: Repository) -> Optional[str]:
-        """获取 README 内容，失败返回 None"""
-        try:
-            readme = repo.get_readme()
-            content = readme.decoded_content.decode('utf-8', errors='ignore')
-            return content
-        except GithubException as e:
-            if e.status == 404:
-                return None  # 无 README
-            raise  # 其他错误向上抛，由外层处理 rate limit
-        except Exception:
-            return None
+    def get_readme_content(self, full_name: str) -> Optional[str]:
+        """获取 README 原文（1 次请求），无 README 或失败返回 None"""
+        with self.stats_lock:
+            self.stats["http_calls"]["readme"] += 1
+        return self.client.get_readme_text(full_name)
     
     def save_repo(self, repo_data: Dict[str, Any]) -> None:
-        """流式落盘：立即追加写入 JSONL"""
-        with open(OUTPUT_FILE, 'a', encoding='utf-8') as f:
-            json.dump(repo_data, f, ensure_ascii=False)
-            f.write('\n')
-        
-        self.saved_ids.add(repo_data['id'])
+        """写入落盘缓冲区，并登记到断点续传索引（随下一次断点一起提交）"""
+        if self.readme_store is not None and "readme_content" in repo_data:
+            # README 正文先写进内容寻址存储（立即提交），记录中只留哈希
+            repo_data["readme_hash"] = self.readme_store.put(repo_data.pop("readme_content"))
+        # 数据和索引在同一把锁内写入，其他线程的断点提交不会插在两者之间
+        with self.checkpoint.lock:
+            offset, end_offset = self.sink.write(repo_data)
+            self.checkpoint.add_repo(repo_data['id'], offset, end_offset)
         self.total_saved += 1
+        self.telemetry.tick("saved")
     
-    def handle_rate_limit(self, exception: RateLimitExceededException) -> None:
-        """处理速率限制，计算等待时间"""
-        try:
-            core_rate = self.github.get_rate_limit().core
-            reset_timestamp = core_rate.reset.timestamp()
-            now_timestamp = datetime.now().timestamp()
-            sleep_seconds = max(int(reset_timestamp - now_timestamp) + 5, 60)
-        except Exception:
-            sleep_seconds = 60  # 默认等待 60 秒
-        
-        reset_time = datetime.fromtimestamp(reset_timestamp).strftime('%H:%M:%S')
-        print(f"\n[Rate Limit] 触发速率限制！将在 {sleep_seconds} 秒后继续 (reset at {reset_time})")
-        time.sleep(sleep_seconds)
-    
-    def process_single_repo(self, repo: Repository) -> bool:
+    def _select(self, item: RepoItem) -> Optional[str]:
         """
-        处理单个仓库
-        返回: 是否成功保存
+        对搜索结果中的单个仓库做去重、过滤和抽样（纯本地计算）
+        返回: 需要下载 README 时返回 tier，否则返回 None
         """
-        # 检查是否已存在（断点续传）
-        if repo.id in self.saved_ids:
-            return False
+        repo_id = item.id
+        if repo_id in self.seen_ids:
+            return None
+        self.seen_ids.add(repo_id)
+        if self.checkpoint.has_repo(repo_id):
+            # 续传：已保存的仓库计入当天配额
+            self.sampler.restore(repo_id, item.stars, item.created_day)
+            return None
         
         self.stats["repos_scanned"] += 1
+        self.telemetry.tick("scanned")
         
         # 负向关键词过滤
-        is_noise, reason = self.is_noise(repo)
+        is_noise, reason = self.is_noise(item)
         if is_noise:
-            return False
+            return None
         
         self.stats["repos_passed_filter"] += 1
         
         # 分层抽样
-        should_keep, tier = self.should_sample(repo.stargazers_count)
+        should_keep, tier = self.should_sample(item)
         if not should_keep:
-            return False
+            return None
         
         self.stats["repos_sampled"] += 1
-        
-        # 获取 README
-        try:
-            readme_content = self.get_readme_content(repo)
-            if readme_content is not None:
-                self.stats["readme_success"] += 1
-            else:
-                self.stats["readme_failed"] += 1
-        except RateLimitExceededException as e:
-            raise  # 向上抛，让外层处理
-        except Exception:
-            readme_content = None
+        return tier
+    
+    def save_with_readme(self, item: RepoItem, tier: str, readme_content: Optional[str]) -> None:
+        """构造记录并流式落盘，同时更新 README / tier 统计"""
+        if readme_content is not None:
+            self.stats["readme_success"] += 1
+        else:
             self.stats["readme_failed"] += 1
         
         # 构造数据
-        repo_data = {
-            "id": repo.id,
-            "repo_name": repo.full_name,
-            "repo_url": repo.html_url,
-            "stars": repo.stargazers_count,
-            "description": repo.description,
-            "language": repo.language,
-            "topics": repo.get_topics(),
-            "created_at": repo.created_at.isoformat() if repo.created_at else None,
-            "pushed_at": repo.pushed_at.isoformat() if repo.pushed_at else None,
-            "tier": tier,
-            "size_kb": repo.size,
-            "forks_count": repo.forks_count,
-            "open_issues": repo.open_issues_count,
-            "owner_login": repo.owner.login if repo.owner else None,
-            "owner_type": repo.owner.type if repo.owner else None,
-            "readme_content": readme_content,
-        }
+        repo_data = build_repo_record(item, tier, readme_content)
         
         # 流式落盘
         self.save_repo(repo_data)
@@ -369,81 +420,331 @@ class VibeCodingCrawler:
             self.stats["tier1_silent"] += 1
         else:
             self.stats["tier2_signal"] += 1
-        
-        return True
     
-    def search_repos_for_day(self, date: datetime) -> int:
+    def root_slice(self, date: datetime) -> Slice:
+        """某一天的根切片: created:YYYY-MM-DD size:50..80000 pushed:>YYYY-MM-DD stars:0..3000 [+ 下推的排除条件]"""
+        root = day_slice(date, SIZE_RANGE, STARS_RANGE)
+        if self.pushdown is None:
+            return root
+        return replace(root, exclusions=self.pushdown.exclusions(root.query))
+    
+    def needs_pushdown_probe(self, root: Slice) -> bool:
+        """当天第一次搜索时才测量下推效果（续传的天已经有切片记录）"""
+        return self.pushdown is not None and PUSHDOWN_MEASURE and self.slices.get(root) is None
+    
+    def record_pushdown(self, base_total: int, pushed_total: int) -> None:
+        """根切片探测完成后，把未下推 / 下推后的 total_count 计入统计"""
+        with self.stats_lock:
+            pd = self.stats["pushdown"]
+            pd["days_measured"] += 1
+            pd["base_total"] += base_total
+            pd["pushed_total"] += pushed_total
+    
+    def tier_probe_queries(self, root: Slice) -> Dict[str, str]:
+        """设置了配额的各层当天的查询（只读 total_count）"""
+        ranges = self.sampler.tier_stars(root.stars)
+        return {tier: replace(root, stars=ranges[tier]).query
+                for tier in self.sampler.quota_tiers() if tier in ranges}
+    
+    def apply_sample_plan(self, date_str: str, totals: Dict[str, int]) -> None:
+        """记录并应用某天各层的 total_count"""
+        self.checkpoint.put_sample_plan(date_str, totals)
+        self.sampler.plan_day(date_str, totals)
+    
+    def plan_sampling(self, root: Slice, date_str: str) -> None:
+        """按天配额：搜索前读出各层 total_count（续传时沿用断点中的值）"""
+        if not self.sampler.quota_tiers():
+            return
+        totals = self.checkpoint.get_sample_plan(date_str)
+        if totals is not None:
+            self.sampler.plan_day(date_str, totals)
+            return
+        try:
+            totals = {tier: self.search_page(query, 1, per_page=1)["total_count"]
+                      for tier, query in self.tier_probe_queries(root).items()}
+        except RuntimeError as e:
+            # 读不到 total_count 时只按抽样率保留，由配额硬上限兜底
+            print(f"  [{date_str}] 抽样配额探测出错: {e}")
+            return
+        self.apply_sample_plan(date_str, totals)
+    
+    def search_page(self, query: str, page: int, per_page: int = SEARCH_PER_PAGE) -> Dict[str, Any]:
         """
-        搜索某一天的仓库
-        返回: 当天保存的数量
+        获取一页搜索结果的原始 JSON（每页 1 次请求，topics/owner 已包含在内）
+        重试后仍失败时抛出异常，避免把失败的切片当作 0 条结果标记完成
         """
-        date_str = date.strftime('%Y-%m-%d')
-        next_date_str = (date + timedelta(days=1)).strftime('%Y-%m-%d')
-        
-        # 构造查询
-        # created:YYYY-MM-DD size:50..80000 pushed:>YYYY-MM-DD stars:0..2000
-        query = f"created:{date_str} size:{SIZE_RANGE} pushed:>{next_date_str} stars:{STARS_RANGE}"
+        with self.stats_lock:
+            self.stats["http_calls"]["search"] += 1
+        data = self.client.get_json(
+            "/search/repositories",
+            params={
+                "q": query,
+                "sort": "updated",
+                "order": "desc",
+                "per_page": per_page,
+                "page": page,
+            },
+        )
+        if "total_count" not in data:
+            raise RuntimeError(f"搜索请求失败: {query} (page {page})")
+        return data
+    
+    # ========== 流水线: 搜索 -> 过滤/抽样 -> README 下载 -> 落盘 ==========
+    
+    def build_pipeline(self) -> Pipeline:
+        """各阶段线程数见 PIPELINE_WORKERS；graphql 模式下 README 阶段按批取输入，一批一次 GraphQL 查询"""
+        graphql = README_FETCH_MODE == "graphql"
+        return Pipeline([
+            Stage("search", self.search_day, workers=PIPELINE_WORKERS["search"]),
+            Stage("filter", self.filter_repo, workers=PIPELINE_WORKERS["filter"]),
+            Stage("readme", self.fetch_readmes, workers=PIPELINE_WORKERS["readme"],
+                  batch_size=ENRICH_BATCH_SIZE if graphql else 1,
+                  linger=README_BATCH_LINGER if graphql else 0.0),
+            Stage("writer", self.write_repo, workers=1),
+        ])
+    
+    def search_day(self, date: datetime, emit) -> None:
+        """阶段 1（生产者）：搜索某一天的切片树，逐条派发 (item, ticket)；下游队列满时在这里阻塞"""
+        if self.stop.is_set():
+            return
+        root = self.root_slice(date)
+        # 整天已完成（根切片 done）：不发请求
+        if self.slices.is_done(root):
+            with self.stats_lock:
+                self.stats["slices"]["skipped"] += 1
+            return
         
+        date_str = date.strftime('%Y-%m-%d')
         print(f"\n[{date_str}] 开始搜索...")
+        with self.stats_lock:
+            self.stats["days_scanned"] += 1
         
-        day_saved = 0
-        day_scanned = 0
-        
+        base_total = None
+        if self.needs_pushdown_probe(root):
+            try:
+                base_total = self.search_page(replace(root, exclusions="").query, 1, per_page=1)["total_count"]
+            except RuntimeError as e:
+                print(f"  [{date_str}] 下推测量出错: {e}")
+        self.plan_sampling(root, date_str)
+        
+        pushed_total = self.search_slice(root, None, date_str, emit)
+        if base_total is not None and pushed_total is not None:
+            self.record_pushdown(base_total, pushed_total)
+    
+    def search_slice(self, slice_: Slice, parent: Optional[Ticket], date_str: str, emit) -> Optional[int]:
+        """
+        搜索一个切片：total_count 超过 1000 时拆分为子切片递归处理，已完成的切片直接跳过
+        parent 为父切片的 Ticket（调用方已为本切片 hold 一次）
+        返回: 切片的 total_count；请求失败返回 None
+        """
+        node = self.slices.get(slice_)
+        if node and node["status"] == "done":
+            with self.stats_lock:
+                self.stats["slices"]["skipped"] += 1
+            if parent is not None:
+                parent.release()
+            return node["total"]
+        if node and node["status"] == "split":
+            self.search_children(slice_, node["total"], self.slices.children(slice_), parent, date_str, emit)
+            return node["total"]
+        
+        # 第 1 页既用来读 total_count，也是结果的第一页
+        try:
+            data = self.search_page(slice_.query, 1)
+        except RuntimeError as e:
+            print(f"  [{date_str}] 切片 {slice_.label} 搜索出错: {e}")
+            if parent is not None:
+                parent.release(False)
+            return None
+        with self.stats_lock:
+            self.stats["slices"]["probed"] += 1
+        total = data.get("total_count", 0)
+        
+        if total > SEARCH_RESULT_CAP:
+            children = self.slices.split(slice_, total)
+            if children:
+                with self.stats_lock:
+                    self.stats["slices"]["split"] += 1
+                print(f"  [{date_str}] 切片 {slice_.label} 共 {total} 条，拆分为 {len(children)} 个子切片")
+                self.search_children(slice_, total, children, parent, date_str, emit)
+                return total
+            with self.stats_lock:
+                self.stats["slices"]["capped"] += 1
+            print(f"  [{date_str}] 切片 {slice_.label} 无法再拆分，只能获取前 {SEARCH_RESULT_CAP}/{total} 条")
+        
+        ticket = self._slice_ticket(slice_, total, total > SEARCH_RESULT_CAP, parent, leaf=True)
+        ok = True
+        page = 1
+        try:
+            while True:
+                items = data.get("items", [])
+                for item in items:
+                    ticket.hold()
+                    emit((RepoItem.from_search(item), ticket))
+                
+                # 达到目标后不再翻页（切片未完成，不标记 done）
+                if self.stop.is_set():
+                    ok = False
+                    break
+                if not items or page * SEARCH_PER_PAGE >= min(total, SEARCH_RESULT_CAP):
+                    break
+                page += 1
+                data = self.search_page(slice_.query, page)
+        except RuntimeError as e:
+            print(f"  [{date_str}] 切片 {slice_.label} 搜索出错: {e}")
+            ok = False
+        finally:
+            ticket.release(ok)
+        return total
+    
+    def search_children(self, slice_: Slice, total: int, children: List[Slice],
+                        parent: Optional[Ticket], date_str: str, emit) -> None:
+        """依次搜索子切片；全部子切片完成（其中的仓库也已落盘）后把该切片标记为完成"""
+        ticket = self._slice_ticket(slice_, total, False, parent, leaf=False)
+        ok = True
+        for child in children:
+            if self.stop.is_set():
+                ok = False
+                break
+            ticket.hold()
+            self.search_slice(child, ticket, date_str, emit)
+        ticket.release(ok)
+    
+    def _slice_ticket(self, slice_: Slice, total: int, capped: bool,
+                      parent: Optional[Ticket], leaf: bool) -> Ticket:
+        """切片的完成计数：派发出去的仓库全部走完流水线且未中断时标记 done，再通知父切片"""
+        def on_done(ok: bool) -> None:
+            ok = ok and not self.target_reached()
+            if ok:
+                self.slices.mark_done(slice_, total, capped=capped)
+                if leaf:
+                    with self.stats_lock:
+                        self.stats["slices"]["done"] += 1
+            if parent is not None:
+                parent.release(ok)
+        return Ticket(on_done)
+    
+    def filter_repo(self, work: tuple, emit) -> None:
+        """阶段 2：去重、噪音过滤、分层抽样；入选的仓库派发 (item, tier, ticket)"""
+        item, ticket = work
+        if self.stop.is_set():
+            ticket.release(False)
+            return
+        try:
+            with self.stats_lock:
+                tier = self._select(item)
+                if tier is not None:
+                    # 总量熔断：已保存 + 处理中 达到目标后不再派发
+                    if self.total_saved + self.in_flight >= TARGET_TOTAL:
+                        self.stop.set()
+                        tier = None
+                    else:
+                        self.in_flight += 1
+        except Exception:
+            # 抽样出错：仓库没有派发，所属切片不标记完成
+            ticket.release(False)
+            raise
+        if tier is None:
+            ticket.release(not self.stop.is_set())
+            return
+        emit((item, tier, ticket))
+    
+    def fetch_readmes(self, batch: List[tuple], emit) -> None:
+        """
+        阶段 3：下载 README，batch 为 [(item, tier, ticket), ...]
+        graphql 模式整批一次查询（同时刷新 stars/topics/owner 类型），未命中的回退到 REST
+        """
+        emitted = 0
         try:
-            repos = self.github.search_repositories(
-                query=query,
-                sort='updated',
-                order='desc'
-            )
+            enriched = {}
+            if README_FETCH_MODE == "graphql":
+                with self.stats_lock:
+                    self.stats["http_calls"]["graphql"] += 1
+                enriched = self.enricher.fetch_batch([item.node_id for item, _, _ in batch])
             
-            # 遍历结果
-            for repo in repos:
-                # 检查总量熔断
-                if self.total_saved >= TARGET_TOTAL:
-                    print(f"\n[完成] 已达到目标数量 {TARGET_TOTAL}，停止爬取")
-                    return day_saved
+            for item, tier, ticket in batch:
+                info = enriched.get(item.node_id)
+                readme_content = None
+                if info:
+                    # 用 GraphQL 的最新值刷新元数据
+                    item.stars = info["stars"]
+                    item.topics = info["topics"]
+                    item.owner_type = info["owner_type"]
+                    readme_content = info["readme"]
                 
-                try:
-                    saved = self.process_single_repo(repo)
-                    if saved:
-                        day_saved += 1
-                    day_scanned += 1
-                    
-                    # 进度输出
-                    if day_scanned % 10 == 0:
-                        print(f"  [{date_str}] 扫描: {day_scanned} | 保存: {day_saved} | 总进度: {self.total_saved}/{TARGET_TOTAL}")
-                    
-                    # 每处理 50 个休息一小下，避免触发限制
-                    if day_scanned % 50 == 0:
-                        time.sleep(0.5)
-                        
-                except RateLimitExceededException as e:
-                    self.handle_rate_limit(e)
-                    continue
-                except Exception as e:
-                    # 网络错误等，跳过当前仓库
-                    continue
-                    
-        except RateLimitExceededException as e:
-            self.handle_rate_limit(e)
-        except Exception as e:
-            print(f"  [{date_str}] 搜索出错: {e}")
-        
-        return day_saved
+                if readme_content is None and not (info and info["no_readme"]):
+                    readme_content = self.get_readme_content(item.full_name)
+                
+                emit((item, tier, readme_content, ticket))
+                emitted += 1
+        finally:
+            # 出错时还没交给下游的仓库：不再计入处理中，所属切片不标记完成
+            for _, _, ticket in batch[emitted:]:
+                self._drop(ticket)
     
-    def run(self) -> None:
-        """主流程"""
+    def write_repo(self, work: tuple, emit) -> None:
+        """阶段 4（单线程）：构造记录并落盘；切片内仓库全部落盘后由 Ticket 标记切片完成"""
+        item, tier, readme_content, ticket = work
+        saved = False
+        try:
+            if not self.target_reached():
+                self.save_with_readme(item, tier, readme_content)
+                saved = True
+        finally:
+            # 落盘出错时 saved 为 False，切片不标记完成
+            with self.stats_lock:
+                self.in_flight -= 1
+            ticket.release(saved)
+    
+    def _drop(self, ticket: Ticket) -> None:
+        """已计入处理中的仓库在流水线中出错：处理中减一，所属切片不标记完成"""
+        with self.stats_lock:
+            self.in_flight -= 1
+        ticket.release(False)
+    
+    def target_reached(self) -> bool:
+        """已保存数量达到 TARGET_TOTAL"""
+        return self.total_saved >= TARGET_TOTAL
+    
+    def start_telemetry(self) -> None:
+        """开始定时写出遥测快照（close 时写出最终快照）"""
+        if TELEMETRY_FILE:
+            self.telemetry.start(TELEMETRY_FILE, TELEMETRY_INTERVAL)
+            print(f"遥测快照: {TELEMETRY_FILE}（每 {TELEMETRY_INTERVAL:.0f} 秒）")
+    
+    def crawl_days(self) -> List[datetime]:
+        """要爬取的天：self.days，或 START_DATE 至今天"""
+        if self.days is not None:
+            return list(self.days)
+        return date_range(START_DATE, datetime.now())
+    
+    def print_banner(self) -> None:
+        """打印启动信息"""
         print("="*70)
         print("[Vibe Coding 项目爬虫 - 投资人研究版]")
         print("="*70)
         print(f"目标数量: {TARGET_TOTAL} 个仓库")
-        print(f"时间范围: {START_DATE.strftime('%Y-%m-%d')} 至今天")
-        print(f"分层抽样: stars <= {TIER1_STAR_THRESHOLD} 保留 {TIER1_SAMPLE_RATE*100:.0f}%")
+        if self.days is None:
+            print(f"时间范围: {START_DATE.strftime('%Y-%m-%d')} 至今天")
+        else:
+            print(f"时间范围: {len(self.days)} 天（分片）")
+        print(f"分层抽样: stars <= {TIER1_STAR_THRESHOLD} 保留 {TIER1_SAMPLE_RATE*100:.0f}% | 种子 {SAMPLE_SEED}")
+        quotas = {tier: quota for tier, quota in DAY_TIER_QUOTA.items() if quota is not None}
+        if quotas:
+            print(f"每天配额: " + ", ".join(f"{tier} {quota}" for tier, quota in quotas.items()))
         print(f"输出文件: {OUTPUT_FILE}")
+        print(f"GitHub token: {len(self.tokens)} 个（按配额余量轮换）")
+        if self.pushdown is not None:
+            print(f"查询下推: {self.pushdown.describe(day_slice(START_DATE, SIZE_RANGE, STARS_RANGE).query)}")
+    
+    def run(self) -> None:
+        """主流程"""
+        self.print_banner()
+        print("流水线线程: " + " / ".join(f"{k} {v}" for k, v in PIPELINE_WORKERS.items()) + " / writer 1")
         print("="*70)
         
-        if not self.token:
-            print("[错误] 未设置 GITHUB_TOKEN 环境变量")
+        if not self.tokens:
+            print("[错误] 未设置 GITHUB_TOKENS / GITHUB_TOKEN 环境变量")
             return
         
         # 加载已有数据（断点续传）
@@ -455,27 +756,30 @@ class VibeCodingCrawler:
             self.print_final_stats()
             return
         
-        # 按天循环
-        current_date = START_DATE
-        end_date = datetime.now()
-        
-        while current_date <= end_date and self.total_saved < TARGET_TOTAL:
-            day_saved = self.search_repos_for_day(current_date)
-            self.stats["days_scanned"] += 1
-            
-            if day_saved > 0:
-                print(f"  [{current_date.strftime('%Y-%m-%d')}] 当日保存: {day_saved} 个")
-            
-            current_date += timedelta(days=1)
-            
-            # 每天搜索后休息一小下
-            time.sleep(1)
+        self.start_telemetry()
+        # 按天送入流水线
+        self.pipeline = self.build_pipeline()
+        self.pipeline.run(self.crawl_days(), progress=lambda: f"扫描 {self.stats['repos_scanned']} | "
+                                                 f"处理中 {self.in_flight} | 总进度 {self.total_saved}/{TARGET_TOTAL}")
+        if self.total_saved >= TARGET_TOTAL:
+            print(f"\n[完成] 已达到目标数量 {TARGET_TOTAL}，停止爬取")
         
+        self.checkpoint.commit()
         print("\n" + "="*70)
         print("[爬取完成]")
         print("="*70)
         self.print_final_stats()
     
+    def close(self) -> None:
+        """落盘缓冲区并提交索引（中断或出错时也要调用）"""
+        self.telemetry.stop()
+        self.checkpoint.close()
+        self.sink.close()
+        if self.readme_store is not None:
+            self.readme_store.close()
+        if self.http_cache is not None:
+            self.http_cache.close()
+    
     def print_final_stats(self) -> None:
         """打印最终统计"""
         print(f"\n总体统计:")
@@ -493,6 +797,76 @@ class VibeCodingCrawler:
         print(f"  - 成功: {self.stats['readme_success']}")
         print(f"  - 失败/无: {self.stats['readme_failed']}")
         
+        calls = self.stats["http_calls"]
+        total_calls = sum(calls.values())
+        run_saved = self.stats["tier1_silent"] + self.stats["tier2_signal"]
+        print(f"\nHTTP 调用:")
+        for endpoint, count in calls.items():
+            print(f"  - {endpoint}: {count}")
+        print(f"  - 合计: {total_calls}")
+        if calls["graphql"] > 0:
+            e = self.enricher.stats
+            print(f"  - GraphQL 补全: {e['nodes']} 个仓库, README 命中 {e['readme_hits']}, "
+                  f"确认无 README {e['no_readme']}, 失败查询 {e['failed_queries']}")
+        if run_saved > 0:
+            print(f"  - 每个保存仓库: {total_calls / run_saved:.2f} 次")
+        
+        latency_rows = self.telemetry.report()
+        if latency_rows:
+            print(f"\n请求延迟（按接口，含重试的每次尝试）:")
+            for row in latency_rows:
+                print(f"  - {row}")
+        
+        pool = self.client.pool.stats
+        print(f"\nToken 池 ({len(self.client.pool)} 个):")
+        print(f"  - 请求分布: " + ", ".join(f"{k}={v}" for k, v in pool["requests"].items()))
+        print(f"  - 单 token 限流后换用: {pool['exhausted']} 次 | 全部耗尽等待: {pool['pool_waits']} 次 ({pool['wait_seconds']:.0f}s)")
+        print(f"  - 配额不足匀速推迟: {pool['paced']} 次 ({pool['pace_seconds']:.0f}s) | 次级限流暂停 token: {pool['paused']} 次")
+        
+        if self.http_cache is not None:
+            print(f"\nHTTP 缓存:")
+            print(f"  - {self.http_cache.report()}")
+        
+        if self.readme_store is not None:
+            print(f"\nREADME 存储 ({README_STORE_FILE}):")
+            print(f"  - {self.readme_store.report()}")
+        
+        sl = self.stats["slices"]
+        sk = self.sink.stats
+        print(f"\n落盘:")
+        print(f"  - 记录: {sk['records']} | 批量写入: {sk['flushes']} 次 | fsync: {sk['fsyncs']} 次")
+        
+        print(f"\n搜索切片:")
+        print(f"  - 探测: {sl['probed']} | 拆分: {sl['split']} | 完成: {sl['done']} | 续传跳过: {sl['skipped']} | 超限: {sl['capped']}")
+        
+        if self.pipeline is not None:
+            rows = self.pipeline.report()
+            print(f"\n流水线 (用时 {self.pipeline.elapsed:.1f}s):")
+            print("  阶段     线程    处理   吞吐/s  忙碌率 平均队列 最大队列 下游阻塞(s)")
+            for r in rows:
+                print(f"  {r['stage']:8} {r['workers']:4} {r['processed']:7} {r['throughput']:8.1f} "
+                      f"{r['utilization']*100:6.1f}% {r['depth_avg']:8.1f} {r['depth_max']:8} {r['blocked']:11.1f}"
+                      + (f"  出错 {r['errors']}" if r['errors'] else ""))
+            bottleneck = max(rows, key=lambda r: r["utilization"])
+            print(f"  - 瓶颈: {bottleneck['stage']}（忙碌率 {bottleneck['utilization']*100:.0f}%）")
+        
+        pd = self.stats["pushdown"]
+        if pd["days_measured"] > 0:
+            excluded = pd["base_total"] - pd["pushed_total"]
+            ratio = excluded / pd["base_total"] * 100 if pd["base_total"] else 0.0
+            # 按 total_count / 每页条数粗略估算（超过 1000 条的天由切片拆分覆盖，同样按页计）
+            pages_saved = math.ceil(pd["base_total"] / SEARCH_PER_PAGE) - math.ceil(pd["pushed_total"] / SEARCH_PER_PAGE)
+            print(f"\n查询下推 ({pd['days_measured']} 天):")
+            print(f"  - total_count: {pd['base_total']} -> {pd['pushed_total']}，服务端排除 {excluded} 条 ({ratio:.1f}%)")
+            print(f"  - 约节省搜索请求: {pages_saved} 次（测量本身另用 {pd['days_measured']} 次）")
+        
+        sp = self.sampler.stats
+        print(f"\n抽样 (种子 {SAMPLE_SEED}):")
+        for tier in ("silent", "signal"):
+            print(f"  - {tier}: 保留 {sp['kept'][tier]} | 抽样率跳过 {sp['rate_skip'][tier]} | 配额跳过 {sp['quota_skip'][tier]}")
+        if sp["restored"]:
+            print(f"  - 续传计入配额: {sp['restored']}")
+        
         print(f"\n过滤原因统计:")
         for reason, count in sorted(self.stats["filtered_by"].items(), key=lambda x: -x[1]):
             if count > 0:
@@ -503,7 +877,7 @@ class VibeCodingCrawler:
 
 
 def main():
-    crawler = VibeCodingCrawler(GITHUB_TOKEN)
+    crawler = VibeCodingCrawler(GITHUB_TOKENS)
     try:
         crawler.run()
     except KeyboardInterrupt:
@@ -513,6 +887,8 @@ def main():
         print(f"\n[错误] {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        crawler.close()
 
 
 if __name__ == "__main__":
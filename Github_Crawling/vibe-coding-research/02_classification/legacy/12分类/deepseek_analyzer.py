@@ -8,7 +8,7 @@ Vibe Coding 深度分析器 - 基于 DeepSeek API
 - 稳健重试: 网络波动自动重试，指数退避
 - 并发控制: 支持并发请求提升速度，但有速率保护
 - 成本控制: 实时统计 token 使用，支持预算上限
-- 双重输出: JSON + CSV 两种格式
+- 双重输出: JSON + CSV 两种格式（同一次序列化，批量写入，保存进度前 fsync）
 - 实时统计: 终端显示进度、分类分布、成本估算
 - 严格遵循提示词: 完全使用 LLM提示词 文件的分类逻辑
 
@@ -23,7 +23,6 @@ Vibe Coding 深度分析器 - 基于 DeepSeek API
 
 import os
 import json
-import csv
 import time
 import signal
 import sys
@@ -36,6 +35,11 @@ from dataclasses import dataclass, asdict
 from dotenv import load_dotenv
 import requests
 
+# 共用的批量落盘、数据集读取组件位于 01_crawling/scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "01_crawling", "scripts"))
+from record_sink import RecordSink
+from dataset_store import iter_dataset
+
 load_dotenv()
 sys.stdout.reconfigure(encoding='utf-8')
 
@@ -45,6 +49,7 @@ OUTPUT_JSON = "vibe_coding_analysis.jsonl"
 OUTPUT_CSV = "vibe_coding_analysis.csv"
 PROGRESS_FILE = "analyzer_progress.json"
 FAILED_FILE = "analyzer_failed.jsonl"
+README_STORE_FILE = "vibe_coding_readmes.sqlite"  # 爬虫的 README 存储（记录只有 readme_hash 时从中取正文）
 
 # DeepSeek API 配置
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY", "")
@@ -135,6 +140,10 @@ class VibeCodingAnalyzer:
         self.lock = Lock()
         self.running = True
         
+        # 批量落盘（结果 JSONL + CSV，失败记录 JSONL）
+        self.result_sink = RecordSink(OUTPUT_JSON, OUTPUT_CSV)
+        self.failed_sink = RecordSink(FAILED_FILE)
+        
         # 加载系统提示词
         self.system_prompt = self._load_system_prompt()
     
@@ -214,7 +223,9 @@ class VibeCodingAnalyzer:
             print(f"⚠️ 加载进度失败: {e}")
     
     def save_progress(self) -> None:
-        """保存进度"""
+        """保存进度（先把已缓冲的结果 fsync 到磁盘，进度里的 id 一定已落盘）"""
+        self.result_sink.flush(fsync=True)
+        self.failed_sink.flush(fsync=True)
         data = {
             'processed_ids': list(self.processed_ids),
             'failed_ids': list(self.failed_ids),
@@ -228,6 +239,11 @@ class VibeCodingAnalyzer:
         except Exception as e:
             print(f"⚠️ 保存进度失败: {e}")
     
+    def close(self) -> None:
+        """落盘缓冲区中的结果和失败记录（正常结束、中断或出错时都要调用）"""
+        self.result_sink.close()
+        self.failed_sink.close()
+
     def load_repos(self) -> List[Dict]:
         """加载仓库数据，只返回 readme 不为 null 且未处理过的"""
         repos = []
@@ -235,29 +251,21 @@ class VibeCodingAnalyzer:
         already_processed = 0
         
         try:
-            with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        repo = json.loads(line)
-                        repo_id = repo.get('id')
-                        
-                        # 检查是否已处理
-                        if repo_id in self.processed_ids:
-                            already_processed += 1
-                            continue
-                        
-                        # 检查 README
-                        readme = repo.get('readme_content')
-                        if readme is None or readme == '':
-                            readme_null_count += 1
-                            continue
-                        
-                        repos.append(repo)
-                    except json.JSONDecodeError:
-                        continue
+            for repo in iter_dataset(INPUT_FILE, readme_store=README_STORE_FILE):
+                repo_id = repo.get('id')
+                
+                # 检查是否已处理
+                if repo_id in self.processed_ids:
+                    already_processed += 1
+                    continue
+                
+                # 检查 README（记录只有 readme_hash 时已从 README 存储取回正文）
+                readme = repo.get('readme_content')
+                if readme is None or readme == '':
+                    readme_null_count += 1
+                    continue
+                
+                repos.append(repo)
         except FileNotFoundError:
             print(f"❌ 错误: 输入文件 {INPUT_FILE} 不存在")
             return []
@@ -468,24 +476,12 @@ class VibeCodingAnalyzer:
             'error': error,
             'failed_at': datetime.now().isoformat()
         }
-        with open(FAILED_FILE, 'a', encoding='utf-8') as f:
-            json.dump(failed_data, f, ensure_ascii=False)
-            f.write('\n')
+        self.failed_sink.write(failed_data)
     
     def _save_result(self, result: AnalysisResult) -> None:
         """保存单个结果"""
-        # 保存到 JSONL
-        with open(OUTPUT_JSON, 'a', encoding='utf-8') as f:
-            json.dump(asdict(result), f, ensure_ascii=False)
-            f.write('\n')
-        
-        # 保存到 CSV (追加模式)
-        file_exists = os.path.exists(OUTPUT_CSV)
-        with open(OUTPUT_CSV, 'a', encoding='utf-8-sig', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=asdict(result).keys())
-            if not file_exists:
-                writer.writeheader()
-            writer.writerow(asdict(result))
+        # JSONL 与 CSV 共用同一个 dict，批量写入
+        self.result_sink.write(asdict(result))
         
         # 更新统计
         with self.lock:
@@ -671,6 +667,8 @@ def main():
         import traceback
         traceback.print_exc()
         analyzer.save_progress()
+    finally:
+        analyzer.close()
 
 
 if __name__ == "__main__":
@@ -9,10 +9,14 @@ import json
 import os
 import sys
 
+# Shared dataset reader lives in 01_crawling/scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "01_crawling", "scripts"))
+from dataset_store import iter_dataset
+
 # Fix encoding
 sys.stdout.reconfigure(encoding='utf-8')
 
-DATASET_FILE = "vibe_coding_dataset_2w.jsonl"
+DATASET_FILE = "vibe_coding_dataset_2w.jsonl"  # or the .parquet from dataset_store (reads only 2 columns)
 ANALYSIS_FILE = "vibe_coding_analysis.jsonl"
 OUTPUT_FILE = "vibe_coding_analysis_with_time.jsonl"
 
@@ -24,19 +28,11 @@ def load_created_at_mapping():
         print(f"Error: File not found: {DATASET_FILE}")
         return mapping
     
-    with open(DATASET_FILE, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                data = json.loads(line)
-                repo_id = data.get('id')
-                created_at = data.get('created_at')
-                if repo_id and created_at:
-                    mapping[repo_id] = created_at
-            except json.JSONDecodeError:
-                continue
+    for data in iter_dataset(DATASET_FILE, columns=['id', 'created_at']):
+        repo_id = data.get('id')
+        created_at = data.get('created_at')
+        if repo_id and created_at:
+            mapping[repo_id] = created_at
     
     print(f"Loaded {len(mapping)} created_at records from dataset")
     return mapping
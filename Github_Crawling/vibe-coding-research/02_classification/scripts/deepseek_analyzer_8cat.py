@@ -8,10 +8,11 @@ Vibe Coding 深度分析器 - 基于 DeepSeek API (8分类版本)
 - 稳健重试: 网络波动自动重试，指数退避
 - 并发控制: 支持并发请求提升速度，但有速率保护
 - 成本控制: 实时统计 token 使用，支持预算上限
-- 双重输出: JSON + CSV 两种格式
+- 双重输出: JSON + CSV 两种格式（同一次序列化，批量写入，保存进度前 fsync）
 - 实时统计: 终端显示进度、分类分布、成本估算
 - 严格遵循提示词: 完全使用 LLM提示词_8分类 文件的分类逻辑
 - 8分类体系: 企业商业应用/效率工具/技术基础设施/娱乐媒体/教育学习/社交社区/健康医疗/个人生活
+- README 去重: 模板克隆的相同 README 只调用一次 API，分类结果复用到其他仓库（结果中 reused_from 标记来源）
 
 数据说明:
 - 输入: vibe_coding_dataset_2w.jsonl (约 2103 个仓库)
@@ -24,7 +25,6 @@ Vibe Coding 深度分析器 - 基于 DeepSeek API (8分类版本)
 
 import os
 import json
-import csv
 import time
 import signal
 import sys
@@ -33,19 +33,27 @@ from datetime import datetime
 from typing import Optional, Dict, Any, List, Set
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields, replace
 from dotenv import load_dotenv
 import requests
 
+# 共用的批量落盘 / 数据集读取组件位于 01_crawling/scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "01_crawling", "scripts"))
+from record_sink import RecordSink
+from dataset_store import iter_dataset
+from readme_store import readme_hash
+
 load_dotenv()
 sys.stdout.reconfigure(encoding='utf-8')
 
 # ========== 配置常量 ==========
-INPUT_FILE = "vibe_coding_dataset_2w.jsonl"
+INPUT_FILE = "vibe_coding_dataset_2w.jsonl"  # 也可用 dataset_store 转换出的 .parquet
 OUTPUT_JSON = "vibe_coding_analysis_8cat.jsonl"
 OUTPUT_CSV = "vibe_coding_analysis_8cat.csv"
 PROGRESS_FILE = "analyzer_progress_8cat.json"
 FAILED_FILE = "analyzer_failed_8cat.jsonl"
+README_STORE_FILE = "vibe_coding_readmes.sqlite"  # 爬虫的 README 存储（记录只有 readme_hash 时从中取正文）
+REUSE_BY_README = True   # 相同 README（规范化后 SHA-256 相同）的仓库复用同一次分类结果
 
 # DeepSeek API 配置
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY", "")
@@ -96,6 +104,8 @@ class AnalysisResult:
     tokens_output: int = 0
     api_cost_cny: float = 0.0
     retry_count: int = 0
+    readme_hash: Optional[str] = None
+    reused_from: Optional[int] = None  # 复用了哪个仓库的分类结果（None 表示本仓库调用了 API）
 
 
 class VibeCodingAnalyzer:
@@ -116,6 +126,7 @@ class VibeCodingAnalyzer:
             "success": 0,            # 成功
             "failed": 0,             # 失败
             "skipped": 0,            # 跳过(已处理过)
+            "reused": 0,             # 复用相同 README 的分类结果（未调用 API）
             "tokens_input": 0,       # 总输入 token
             "tokens_output": 0,      # 总输出 token
             "total_cost_cny": 0.0,   # 总成本
@@ -134,9 +145,15 @@ class VibeCodingAnalyzer:
         # 进度跟踪
         self.processed_ids: Set[int] = set()
         self.failed_ids: Set[int] = set()
+        self.classified: Dict[str, AnalysisResult] = {}     # readme_hash -> 首个分类结果
+        self.followers: Dict[str, List[Dict]] = {}          # readme_hash -> 等待复用结果的仓库
         self.lock = Lock()
         self.running = True
         
+        # 批量落盘（结果 JSONL + CSV，失败记录 JSONL）
+        self.result_sink = RecordSink(OUTPUT_JSON, OUTPUT_CSV)
+        self.failed_sink = RecordSink(FAILED_FILE)
+        
         # 加载系统提示词
         self.system_prompt = self._load_system_prompt()
     
@@ -212,7 +229,9 @@ class VibeCodingAnalyzer:
             print(f"⚠️ 加载进度失败: {e}")
     
     def save_progress(self) -> None:
-        """保存进度"""
+        """保存进度（先把已缓冲的结果 fsync 到磁盘，进度里的 id 一定已落盘）"""
+        self.result_sink.flush(fsync=True)
+        self.failed_sink.flush(fsync=True)
         data = {
             'processed_ids': list(self.processed_ids),
             'failed_ids': list(self.failed_ids),
@@ -226,6 +245,23 @@ class VibeCodingAnalyzer:
         except Exception as e:
             print(f"⚠️ 保存进度失败: {e}")
     
+    def close(self) -> None:
+        """落盘缓冲区中的结果和失败记录（正常结束、中断或出错时都要调用）"""
+        self.result_sink.close()
+        self.failed_sink.close()
+
+    def load_classified(self) -> None:
+        """从已有结果中按 readme_hash 收集分类，续传时相同 README 的仓库直接复用"""
+        if not REUSE_BY_README or not os.path.exists(OUTPUT_JSON):
+            return
+        names = {f.name for f in fields(AnalysisResult)}
+        for row in iter_dataset(OUTPUT_JSON):
+            digest = row.get('readme_hash')
+            if digest and digest not in self.classified:
+                self.classified[digest] = AnalysisResult(**{k: v for k, v in row.items() if k in names})
+        if self.classified:
+            print(f"📂 已有分类可复用: {len(self.classified)} 份不同的 README")
+    
     def load_repos(self) -> List[Dict]:
         """加载仓库数据，只返回 readme 不为 null 且未处理过的"""
         repos = []
@@ -233,29 +269,22 @@ class VibeCodingAnalyzer:
         already_processed = 0
         
         try:
-            with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        repo = json.loads(line)
-                        repo_id = repo.get('id')
-                        
-                        # 检查是否已处理
-                        if repo_id in self.processed_ids:
-                            already_processed += 1
-                            continue
-                        
-                        # 检查 README
-                        readme = repo.get('readme_content')
-                        if readme is None or readme == '':
-                            readme_null_count += 1
-                            continue
-                        
-                        repos.append(repo)
-                    except json.JSONDecodeError:
-                        continue
+            for repo in iter_dataset(INPUT_FILE, readme_store=README_STORE_FILE):
+                repo_id = repo.get('id')
+                
+                # 检查是否已处理
+                if repo_id in self.processed_ids:
+                    already_processed += 1
+                    continue
+                
+                # 检查 README
+                readme = repo.get('readme_content')
+                if readme is None or readme == '':
+                    readme_null_count += 1
+                    continue
+                
+                repo['readme_hash'] = repo.get('readme_hash') or readme_hash(readme)
+                repos.append(repo)
         except FileNotFoundError:
             print(f"❌ 错误: 输入文件 {INPUT_FILE} 不存在")
             return []
@@ -446,7 +475,8 @@ class VibeCodingAnalyzer:
                     tokens_input=tokens_input,
                     tokens_output=tokens_output,
                     api_cost_cny=cost,
-                    retry_count=retry_count
+                    retry_count=retry_count,
+                    readme_hash=repo.get('readme_hash'),
                 )
                 
                 return analysis
@@ -482,28 +512,78 @@ class VibeCodingAnalyzer:
             'error': error,
             'failed_at': datetime.now().isoformat()
         }
-        with open(FAILED_FILE, 'a', encoding='utf-8') as f:
-            json.dump(failed_data, f, ensure_ascii=False)
-            f.write('\n')
+        self.failed_sink.write(failed_data)
+    
+    def _fail_group(self, repo: Dict, error: str) -> int:
+        """
+        调用 API 的仓库失败：同 README 等待复用的仓库一并记为失败（不在 processed_ids 中，下次运行重新处理）
+        返回: 失败的仓库数（含 repo 本身）
+        """
+        with self.lock:
+            followers = self.followers.pop(repo.get('readme_hash'), [])
+        for follower in followers:
+            self._save_failed(follower, f"同 README 的仓库 {repo.get('repo_name')} 分析失败: {error}")
+        return 1 + len(followers)
+    
+    def _reuse(self, repo: Dict, source: AnalysisResult) -> AnalysisResult:
+        """相同 README 的仓库：沿用 source 的分类字段，仓库字段取自本仓库，不计 token 和成本"""
+        return replace(
+            source,
+            repo_id=repo.get('id'),
+            repo_name=repo.get('repo_name', 'unknown'),
+            repo_url=repo.get('repo_url', ''),
+            stars=repo.get('stars', 0),
+            description=repo.get('description'),
+            language=repo.get('language'),
+            topics=repo.get('topics', []),
+            tier=repo.get('tier', ''),
+            size_kb=repo.get('size_kb', 0),
+            created_at=repo.get('created_at'),
+            analyzed_at=datetime.now().isoformat(),
+            tokens_input=0,
+            tokens_output=0,
+            api_cost_cny=0.0,
+            retry_count=0,
+            reused_from=source.reused_from or source.repo_id,
+        )
+    
+    def plan_requests(self, repos: List[Dict]) -> List[Dict]:
+        """
+        按 readme_hash 分组：已有分类的直接复用落盘，其余每组只把第一个仓库交给 API，
+        同组其他仓库在它完成后复用结果
+        返回: 需要调用 API 的仓库
+        """
+        if not REUSE_BY_README:
+            return repos
+        pending = []
+        for repo in repos:
+            digest = repo['readme_hash']
+            if digest in self.classified:
+                self._save_result(self._reuse(repo, self.classified[digest]))
+            elif digest in self.followers:
+                self.followers[digest].append(repo)
+            else:
+                self.followers[digest] = []
+                pending.append(repo)
+        reused_now = self.stats['reused']
+        waiting = sum(len(group) for group in self.followers.values())
+        print(f"♻️ README 去重: {len(repos)} 个仓库 -> {len(pending)} 次 API 调用 "
+              f"（直接复用已有分类 {reused_now} 个，等待复用 {waiting} 个）")
+        return pending
     
     def _save_result(self, result: AnalysisResult) -> None:
-        """保存单个结果"""
-        # 保存到 JSONL
-        with open(OUTPUT_JSON, 'a', encoding='utf-8') as f:
-            json.dump(asdict(result), f, ensure_ascii=False)
-            f.write('\n')
-        
-        # 保存到 CSV (追加模式)
-        file_exists = os.path.exists(OUTPUT_CSV)
-        with open(OUTPUT_CSV, 'a', encoding='utf-8-sig', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=asdict(result).keys())
-            if not file_exists:
-                writer.writeheader()
-            writer.writerow(asdict(result))
+        """保存单个结果；调用了 API 的结果再复用到同 README 的其他仓库"""
+        # JSONL 与 CSV 共用同一个 dict，批量写入
+        self.result_sink.write(asdict(result))
         
         # 更新统计
         with self.lock:
             self.processed_ids.add(result.repo_id)
+            if result.reused_from is not None:
+                self.stats['reused'] += 1
+            elif result.readme_hash:
+                self.classified.setdefault(result.readme_hash, result)
+            followers = self.followers.pop(result.readme_hash, []) if result.reused_from is None else []
             self.stats['success'] += 1
             self.stats['tokens_input'] += result.tokens_input
             self.stats['tokens_output'] += result.tokens_output
@@ -516,6 +596,9 @@ class VibeCodingAnalyzer:
                 self.category_stats['micro_scenario'].get(result.micro_scenario, 0) + 1
             self.category_stats['ai_generation_score'][result.ai_generation_score] += 1
             self.category_stats['complexity_level'][result.complexity_level] += 1
+        
+        for repo in followers:
+            self._save_result(self._reuse(repo, result))
     
     def _print_progress(self) -> None:
         """打印进度信息"""
@@ -594,9 +677,11 @@ class VibeCodingAnalyzer:
         
         # 加载进度和数据
         self.load_progress()
-        repos = self.load_repos()
+        self.load_classified()
+        repos = self.plan_requests(self.load_repos())
         
         if not repos:
+            self.save_progress()
             print("✅ 没有待处理的数据")
             return
         
@@ -637,11 +722,12 @@ class VibeCodingAnalyzer:
                             self.running = False
                             break
                     else:
-                        self.stats['failed'] += 1
+                        self.stats['failed'] += self._fail_group(repo, "API 调用失败")
                         
                 except Exception as e:
                     print(f"    ❌ 处理异常: {e}")
-                    self.stats['failed'] += 1
+                    self._save_failed(repo, str(e))
+                    self.stats['failed'] += self._fail_group(repo, str(e))
                 
                 # 每 10 个更新一次进度显示
                 if self.stats['processed'] % 10 == 0:
@@ -666,6 +752,11 @@ class VibeCodingAnalyzer:
         print("=" * 70)
         print(f"📊 处理统计:")
         print(f"   总计: {s['success'] + s['failed']} | 成功: {s['success']} | 失败: {s['failed']}")
+        print(f"   复用相同 README 的分类: {s['reused']}（未调用 API）")
+        waiting = sum(len(group) for group in self.followers.values())
+        if waiting:
+            # 预算用完或中断时，同 README 的首个仓库还没有结果
+            print(f"   等待复用但未处理: {waiting} 个（下次运行继续）")
         print(f"⏱️  用时: {elapsed/60:.1f} 分钟 | 平均: {s['success']/(elapsed/60):.1f} 个/分钟")
         print(f"💰 总成本: ¥{s['total_cost_cny']:.4f}")
         print(f"📝 Token: 输入 {s['tokens_input']:,} | 输出 {s['tokens_output']:,}")
@@ -693,6 +784,8 @@ def main():
         import traceback
         traceback.print_exc()
         analyzer.save_progress()
+    finally:
+        analyzer.close()
 
 
 if __name__ == "__main__":
@@ -28,15 +28,20 @@ from threading import Lock
 from dotenv import load_dotenv
 import requests
 
+# 共用的数据集读取组件位于 01_crawling/scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "01_crawling", "scripts"))
+from dataset_store import load_dataset
+
 load_dotenv()
 sys.stdout.reconfigure(encoding='utf-8')
 
 # ========== 配置常量 ==========
-INPUT_FILE = "vibe_coding_dataset_2w.jsonl"
+INPUT_FILE = "vibe_coding_dataset_2w.jsonl"  # 也可用 dataset_store 转换出的 .parquet
 OUTPUT_JSON = "vibe_coding_analysis_8categories.jsonl"
 OUTPUT_CSV = "vibe_coding_analysis_8categories.csv"
 PROGRESS_FILE = "analyzer_progress_8cat.json"
 FAILED_FILE = "analyzer_failed_8cat.jsonl"
+README_STORE_FILE = "vibe_coding_readmes.sqlite"  # 爬虫的 README 存储（记录只有 readme_hash 时从中取正文）
 
 # DeepSeek API 配置
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY", "")
@@ -339,14 +344,7 @@ Stars: {repo.get("stars", 0)}
         
         # 加载待处理数据
         print(f"\n📂 加载数据: {INPUT_FILE}")
-        repos = []
-        with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-            for line in f:
-                try:
-                    repo = json.loads(line)
-                    repos.append(repo)
-                except:
-                    pass
+        repos = load_dataset(INPUT_FILE, readme_store=README_STORE_FILE)
         
         self.stats["total"] = len(repos)
         print(f"   总共 {len(repos)} 个仓库")
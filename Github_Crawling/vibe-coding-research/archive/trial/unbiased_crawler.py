@@ -10,7 +10,6 @@
 - 保留完整README给DeepSeek做最终判断
 """
 
-import requests
 import json
 import os
 import csv
@@ -22,10 +21,16 @@ from dotenv import load_dotenv
 import time
 from collections import Counter
 
+# 共用的 GitHub 客户端（多 token 轮换、条件请求缓存）位于 01_crawling/scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "01_crawling", "scripts"))
+from github_client import GitHubClient, load_tokens
+from http_cache import HttpCache
+
 load_dotenv()
 sys.stdout.reconfigure(encoding='utf-8')
 
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
+GITHUB_TOKENS = load_tokens()  # GITHUB_TOKENS=tok1,tok2,...（或单个 GITHUB_TOKEN）
+HTTP_CACHE_FILE = os.getenv("HTTP_CACHE_FILE", "github_http_cache.sqlite")  # 条件请求缓存，设为空关闭
 DAYS_BACK = 14
 MAX_README_LENGTH = 20000  # 20KB，足够完整README
 
@@ -91,13 +96,11 @@ MAX_STARS = 200  # 超过这个数基本不是草根项目
 
 
 class UnbiasedVibeCrawler:
-    def __init__(self, token: str = ""):
-        self.token = token
-        self.headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+    def __init__(self, tokens=()):
+        self.tokens = [tokens] if isinstance(tokens, str) else list(tokens)
         self.base_url = "https://api.github.com"
+        self.http_cache = HttpCache(HTTP_CACHE_FILE) if HTTP_CACHE_FILE else None
+        self.client = GitHubClient(self.tokens, self.base_url, cache=self.http_cache)
         self.stats = {
             "total_fetched": 0,
             "filtered": {
@@ -112,24 +115,13 @@ class UnbiasedVibeCrawler:
         }
         
     def _request(self, url: str, params: dict = None) -> dict:
-        """带重试的请求，更短超时"""
-        for attempt in range(2):  # 减少重试次数
-            try:
-                resp = requests.get(url, headers=self.headers, params=params, timeout=15)
-                if resp.status_code == 403:
-                    print(" [rate limit!]", end="")
-                    time.sleep(3)
-                    continue
-                if resp.status_code == 422:
-                    return {}
-                resp.raise_for_status()
-                return resp.json()
-            except Exception as e:
-                if attempt < 1:
-                    time.sleep(1)
-                else:
-                    print(f" [ERR:{str(e)[:20]}]", end="")
-        return {}
+        """经共用客户端发送请求（token 轮换、限流、重试与缓存由 GitHubClient 处理），失败返回 {}"""
+        return self.client.get_json(url, params)
+    
+    def close(self):
+        """提交 HTTP 缓存（中断时也要调用）"""
+        if self.http_cache is not None:
+            self.http_cache.close()
     
     def is_noise(self, repo: dict) -> tuple:
         """
@@ -358,8 +350,8 @@ class UnbiasedVibeCrawler:
         print("Philosophy: Exclude noise, keep everything else")
         print("="*70)
         
-        if not self.token:
-            print("[ERROR] No GITHUB_TOKEN")
+        if not self.tokens:
+            print("[ERROR] No GITHUB_TOKENS / GITHUB_TOKEN")
             return
         
         start_date = (datetime.now() - timedelta(days=DAYS_BACK)).strftime("%Y-%m-%d")
@@ -441,6 +433,12 @@ class UnbiasedVibeCrawler:
         
         print(f"\n  With README: {len([r for r in enriched if r['readme_raw']])}/{len(enriched)}")
         
+        if self.http_cache is not None:
+            c = self.http_cache.summary()
+            print(f"\n  HTTP cache: {c['hits']} hits (304) / {c['misses']} misses "
+                  f"({c['hit_rate']*100:.1f}%), {c['entries']} entries {c['size_mb']:.1f}/{c['max_mb']:.0f}MB, "
+                  f"{c['evicted']} evicted")
+        
         print("\n" + "="*70)
         print("[DONE] Results ready for DeepSeek classification")
         print("="*70)
@@ -449,7 +447,7 @@ class UnbiasedVibeCrawler:
 
 
 def main():
-    crawler = UnbiasedVibeCrawler(GITHUB_TOKEN)
+    crawler = UnbiasedVibeCrawler(GITHUB_TOKENS)
     try:
         crawler.run()
     except KeyboardInterrupt:
@@ -458,8 +456,9 @@ def main():
         print(f"\n[ERROR] {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        crawler.close()
 
 
 if __name__ == "__main__":
-    GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
     main()
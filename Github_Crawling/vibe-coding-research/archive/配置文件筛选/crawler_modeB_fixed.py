@@ -4,25 +4,29 @@
 方案 B 单独运行版本 - 修复时间筛选问题
 """
 
-import requests
 import json
 import os
 import csv
 import base64
-import re
 import sys
 from datetime import datetime, timedelta
 from urllib.parse import quote
 from dotenv import load_dotenv
 import time
 
+# 共用的 GitHub 客户端（多 token 轮换）位于 01_crawling/scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "01_crawling", "scripts"))
+from github_client import GitHubClient, load_tokens
+from readme_cleaner import ReadmeCleaner
+
 load_dotenv()
 
 sys.stdout.reconfigure(encoding='utf-8')
 
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
+GITHUB_TOKENS = load_tokens()  # GITHUB_TOKENS=tok1,tok2,...（或单个 GITHUB_TOKEN）
 DAYS_BACK = 14
 MAX_README_LENGTH = 3000
+README_CLEANER = ReadmeCleaner(" [code] ", " [code] ", strip_headings=True)  # 代码标记为 [code]，去掉标题 #
 
 VIBE_CONFIG_FILES = [
     "CLAUDE.md", "claude.md",
@@ -48,37 +52,15 @@ NOISE_KEYWORDS = [
 
 
 class ModeBCrawler:
-    def __init__(self, token: str = ""):
-        self.token = token
-        self.headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "VibeCodingModeB/1.0"
-        }
-        if token:
-            self.headers["Authorization"] = f"token {token}"
-        
+    def __init__(self, tokens=()):
+        self.tokens = [tokens] if isinstance(tokens, str) else list(tokens)
         self.base_url = "https://api.github.com"
+        self.client = GitHubClient(self.tokens, self.base_url)
+        self.client.session.headers["User-Agent"] = "VibeCodingModeB/1.0"
         
     def _make_request(self, url: str, params: dict = None) -> dict:
-        for attempt in range(3):
-            try:
-                response = requests.get(url, headers=self.headers, params=params, timeout=30)
-                
-                if response.status_code == 403:
-                    reset_time = int(response.headers.get("X-RateLimit-Reset", time.time() + 60))
-                    wait_time = max(reset_time - int(time.time()), 0) + 5
-                    print(f"    [Rate Limit] Wait {wait_time}s...")
-                    time.sleep(wait_time)
-                    continue
-                    
-                response.raise_for_status()
-                return response.json()
-                
-            except Exception as e:
-                if attempt < 2:
-                    time.sleep((attempt + 1) * 2)
-                else:
-                    return {}
+        """经共用客户端发送请求（token 轮换、限流与重试由 GitHubClient 处理），失败返回 {}"""
+        return self.client.get_json(url, params)
         return {}
     
     def get_date_range(self) -> str:
@@ -109,16 +91,7 @@ class ModeBCrawler:
         
         try:
             content = base64.b64decode(data["content"]).decode("utf-8", errors="ignore")
-            content = re.sub(r'```[\s\S]*?```', ' [code] ', content)
-            content = re.sub(r'`[^`]+`', ' [code] ', content)
-            content = re.sub(r'!\[([^\]]*)\]\([^)]+\)', '', content)
-            content = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', content)
-            content = re.sub(r'<[^>]+>', '', content)
-            content = re.sub(r'^#+\s*', '', content, flags=re.MULTILINE)
-            content = re.sub(r'\*\*([^*]+)\*\*', r'\1', content)
-            content = re.sub(r'\*([^*]+)\*', r'\1', content)
-            content = re.sub(r'\s+', ' ', content)
-            return content.strip()[:MAX_README_LENGTH]
+            return README_CLEANER.clean(content)[:MAX_README_LENGTH]
         except:
             return ""
     
@@ -266,7 +239,7 @@ class ModeBCrawler:
         print("[Mode B] Vibe Coding High Confidence Projects")
         print("="*70)
         
-        if not self.token:
+        if not self.tokens:
             print("\n[ERROR] GITHUB_TOKEN not found")
             return None
         
@@ -334,7 +307,7 @@ class ModeBCrawler:
 
 
 def main():
-    crawler = ModeBCrawler(GITHUB_TOKEN)
+    crawler = ModeBCrawler(GITHUB_TOKENS)
     try:
         result = crawler.run()
         if result:
@@ -4,24 +4,28 @@
 快速方案 B - 只搜索几个主要配置文件
 """
 
-import requests
 import json
 import os
 import csv
 import base64
-import re
 import sys
 from datetime import datetime, timedelta
 from urllib.parse import quote
 from dotenv import load_dotenv
 import time
 
+# 共用的 GitHub 客户端（多 token 轮换）位于 01_crawling/scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "01_crawling", "scripts"))
+from github_client import GitHubClient, load_tokens
+from readme_cleaner import ReadmeCleaner
+
 load_dotenv()
 sys.stdout.reconfigure(encoding='utf-8')
 
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
+GITHUB_TOKENS = load_tokens()  # GITHUB_TOKENS=tok1,tok2,...（或单个 GITHUB_TOKEN）
 DAYS_BACK = 14
 MAX_README_LENGTH = 3000
+README_CLEANER = ReadmeCleaner(" [code] ", " [code] ", strip_headings=True, strip_italic=False)  # 代码标记为 [code]，去掉标题 #，保留 *斜体* 标记
 
 # 只搜索最重要的配置文件
 VIBE_CONFIG_FILES = [
@@ -38,37 +42,19 @@ NOISE_KEYWORDS = [
 ]
 
 
-def make_request(url, headers, params=None):
-    for attempt in range(3):
-        try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            if response.status_code == 403:
-                time.sleep(10)
-                continue
-            response.raise_for_status()
-            return response.json()
-        except:
-            if attempt < 2:
-                time.sleep(2)
-    return {}
+def make_request(url, client, params=None):
+    """经共用客户端发送请求（token 轮换、限流与重试由 GitHubClient 处理），失败返回 {}"""
+    return client.get_json(url, params)
 
 
-def get_readme(full_name, headers):
+def get_readme(full_name, client):
     url = f"https://api.github.com/repos/{full_name}/readme"
-    data = make_request(url, headers)
+    data = make_request(url, client)
     if not data or "content" not in data:
         return ""
     try:
         content = base64.b64decode(data["content"]).decode("utf-8", errors="ignore")
-        content = re.sub(r'```[\s\S]*?```', ' [code] ', content)
-        content = re.sub(r'`[^`]+`', ' [code] ', content)
-        content = re.sub(r'!\[([^\]]*)\]\([^)]+\)', '', content)
-        content = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', content)
-        content = re.sub(r'<[^>]+>', '', content)
-        content = re.sub(r'^#+\s*', '', content, flags=re.MULTILINE)
-        content = re.sub(r'\*\*([^*]+)\*\*', r'\1', content)
-        content = re.sub(r'\s+', ' ', content)
-        return content.strip()[:MAX_README_LENGTH]
+        return README_CLEANER.clean(content)[:MAX_README_LENGTH]
     except:
         return ""
 
@@ -78,14 +64,11 @@ def main():
     print("[Quick Mode B] Top 5 Config Files")
     print("="*70)
     
-    if not GITHUB_TOKEN:
-        print("[ERROR] No GITHUB_TOKEN")
+    if not GITHUB_TOKENS:
+        print("[ERROR] No GITHUB_TOKENS / GITHUB_TOKEN")
         return
     
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    client = GitHubClient(GITHUB_TOKENS)
     
     start_date = (datetime.now() - timedelta(days=DAYS_BACK)).strftime("%Y-%m-%d")
     print(f"\nDate filter: {start_date} onwards\n")
@@ -103,7 +86,7 @@ def main():
             "per_page": 30  # 限制数量
         }
         
-        data = make_request(url, headers, params)
+        data = make_request(url, client, params)
         items = data.get("items", [])
         
         found = 0
@@ -156,7 +139,7 @@ def main():
     print("\n[Fetching READMEs...]")
     for idx, repo in enumerate(unique_repos, 1):
         print(f"  [{idx}/{len(unique_repos)}] {repo['full_name'][:40]}...", end=" ")
-        repo["readme_preview"] = get_readme(repo["full_name"], headers)
+        repo["readme_preview"] = get_readme(repo["full_name"], client)
         print("[OK]" if repo["readme_preview"] else "[--]")
         time.sleep(0.5)
     